@@ -0,0 +1,74 @@
+"""
+🧪 Wspólne fixture testów wymiarów
+
+Atrapa silnika astralnego (logger i brak callback_flow) oraz fabryki wymiarów -
+każda łączy utworzony wymiar i rozłącza go po teście, jeśli test nie zrobił tego sam.
+"""
+
+import logging
+
+import pytest
+
+from luxdb_v2.realms.intention_realm import IntentionRealm
+from luxdb_v2.realms.memory_realm import MemoryRealm
+from luxdb_v2.realms.sharded_realm import ShardedRealm
+from luxdb_v2.realms.soul_realm import SoulRealm
+from luxdb_v2.realms.sqlite_realm import SQLiteRealm
+from luxdb_v2.realms.tiered_realm import TieredRealm
+
+
+class EngineStub:
+    """Minimalny silnik dla wymiarów testowanych bez AstralEngine"""
+    logger = logging.getLogger('luxdb_tests')
+    callback_flow = None
+
+
+@pytest.fixture
+def engine():
+    return EngineStub()
+
+
+def _realm_factory(realm_class, engine):
+    created = []
+
+    def make(connection_string: str, name: str = 'test'):
+        realm = realm_class(name, connection_string, engine)
+        assert realm.connect()
+        created.append(realm)
+        return realm
+
+    yield make
+
+    for realm in reversed(created):
+        if realm.is_connected:
+            realm.disconnect()
+
+
+@pytest.fixture
+def memory_realm(engine):
+    yield from _realm_factory(MemoryRealm, engine)
+
+
+@pytest.fixture
+def sqlite_realm(engine):
+    yield from _realm_factory(SQLiteRealm, engine)
+
+
+@pytest.fixture
+def soul_realm(engine):
+    yield from _realm_factory(SoulRealm, engine)
+
+
+@pytest.fixture
+def intention_realm(engine):
+    yield from _realm_factory(IntentionRealm, engine)
+
+
+@pytest.fixture
+def sharded_realm(engine):
+    yield from _realm_factory(ShardedRealm, engine)
+
+
+@pytest.fixture
+def tiered_realm(engine):
+    yield from _realm_factory(TieredRealm, engine)
@@ -143,6 +143,7 @@ class IntentionBeing(BaseBeing):
         self.state = IntentionState.CONCEIVED
         self.priority = IntentionPriority(intention_data.get('priority', 2))
         self.communication_channel: Optional[str] = None
+        self._harmony: Optional[float] = None  # Cache harmonii, None = nieaktualna
         self.callbacks: List[Dict[str, Any]] = []
         self.interactions: List[Dict[str, Any]] = []
         
@@ -233,6 +234,7 @@ class IntentionBeing(BaseBeing):
         }
         
         self.remember('contemplation', contemplation_result)
+        self._notify_updated()
         return contemplation_result
     
     def _calculate_harmony(self) -> float:
@@ -343,6 +345,7 @@ class IntentionBeing(BaseBeing):
             opiekun_id = data.get('opiekun_id')
             if opiekun_id:
                 self.metainfo.opiekun = opiekun_id
+                self._notify_recategorized()
                 
                 result = {
                     'success': True,
@@ -357,6 +360,7 @@ class IntentionBeing(BaseBeing):
         
         # Aktualizuj wskaźnik sukcesu
         self._update_success_indicator()
+        self._notify_updated()
         
         return result
     
@@ -477,15 +481,112 @@ class IntentionBeing(BaseBeing):
         # Aktywuj transcendencję jeśli wskaźnik sukcesu wysoki
         if self.metainfo.wskaznik_sukcesu > 0.9:
             self.essence.consciousness_level = "transcendent"
-            
+        
+        self._notify_updated()
         return completion_result
     
+    def to_record(self) -> Dict[str, Any]:
+        """Pełny zapis intencji do trwałego magazynu (odwrotność from_record)"""
+        return {
+            'essence': self.essence.to_dict(),
+            'attributes': self.attributes,
+            'memories': self.memories,
+            'state': self.state.value,
+            'priority': self.priority.value,
+            'duchowa': self.duchowa.to_dict(),
+            'materialna': self.materialna.to_dict(),
+            'metainfo': self.metainfo.to_dict(),
+            'communication_channel': self.communication_channel,
+            'callbacks': self.callbacks,
+            'interactions': self.interactions
+        }
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], realm=None) -> 'IntentionBeing':
+        """
+        Odtwarza intencję z zapisu to_record - bez efektów ubocznych konstruktora
+        (nowego soul_id i wspomnienia 'intention_created')
+        """
+        intention = cls.__new__(cls)
+        BaseBeing.__init__(intention, realm=realm)
+        
+        essence = record['essence']
+        intention.essence.soul_id = essence['soul_id']
+        intention.essence.name = essence.get('name')
+        intention.essence.energy_level = essence.get('energy_level', 100.0)
+        intention.essence.consciousness_level = essence.get('consciousness_level', 'intention_aware')
+        intention.essence.created_at = datetime.fromisoformat(essence['created_at'])
+        if essence.get('last_meditation'):
+            intention.essence.last_meditation = datetime.fromisoformat(essence['last_meditation'])
+        
+        intention.attributes = record.get('attributes', {})
+        intention.memories = record.get('memories', [])
+        
+        materialna = dict(record['materialna'])
+        if materialna.get('deadline'):
+            materialna['deadline'] = datetime.fromisoformat(materialna['deadline'])
+        
+        metainfo = dict(record['metainfo'])
+        metainfo['data_utworzenia'] = datetime.fromisoformat(metainfo['data_utworzenia'])
+        
+        intention.duchowa = DuchowaWarstwa(**record['duchowa'])
+        intention.materialna = MaterialnaWarstwa(**materialna)
+        intention.metainfo = MetaInfo(**metainfo)
+        
+        intention.state = IntentionState(record['state'])
+        intention.priority = IntentionPriority(record['priority'])
+        intention.communication_channel = record.get('communication_channel')
+        intention.callbacks = record.get('callbacks', [])
+        intention.interactions = record.get('interactions', [])
+        intention._harmony = None
+        
+        return intention
+    
     def get_communication_channel(self) -> str:
         """Zwraca lub tworzy kanał komunikacji dla intencji"""
         if not self.communication_channel:
             self.communication_channel = f"intention_channel_{self.essence.soul_id[:8]}"
         return self.communication_channel
     
+    @property
+    def state(self) -> IntentionState:
+        return self._state
+    
+    @state.setter
+    def state(self, value: IntentionState):
+        previous = getattr(self, '_state', None)
+        self._state = value
+        if previous is not None and previous != value:
+            self._notify_recategorized()
+    
+    @property
+    def priority(self) -> IntentionPriority:
+        return self._priority
+    
+    @priority.setter
+    def priority(self, value: IntentionPriority):
+        previous = getattr(self, '_priority', None)
+        self._priority = value
+        if previous is not None and previous != value:
+            self._notify_recategorized()
+    
+    def get_harmony(self) -> float:
+        """Harmonia z cache - przeliczana dopiero po zmianie intencji (_notify_updated)"""
+        if self._harmony is None:
+            self._harmony = self._calculate_harmony()
+        return self._harmony
+    
+    def _notify_updated(self):
+        """Oznacza harmonię jako nieaktualną i powiadamia wymiar (aktualizacja agregatów)"""
+        self._harmony = None
+        if self.realm is not None and hasattr(self.realm, 'on_intention_updated'):
+            self.realm.on_intention_updated(self)
+    
+    def _notify_recategorized(self):
+        """Powiadamia wymiar o zmianie stanu, priorytetu lub opiekuna (aktualizacja indeksów)"""
+        if self.realm is not None and hasattr(self.realm, 'on_intention_recategorized'):
+            self.realm.on_intention_recategorized(self)
+    
     def get_status(self) -> Dict[str, Any]:
         """Zwraca pełny status intencji"""
         base_status = super().get_status()
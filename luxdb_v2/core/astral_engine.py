@@ -210,6 +210,12 @@ class AstralEngine:
         elif config.startswith('intention://'):
             from ..realms.intention_realm import IntentionRealm
             return IntentionRealm(name, config, self)
+        elif config.startswith('sharded://'):
+            from ..realms.sharded_realm import ShardedRealm
+            return ShardedRealm(name, config, self)
+        elif config.startswith('tiered://'):
+            from ..realms.tiered_realm import TieredRealm
+            return TieredRealm(name, config, self)
         else:
             raise ValueError(f"Nieznany typ wymiaru: {config}")
 
@@ -15,6 +15,7 @@ from .luxbus_core import LuxBusCore, LuxPacket, PacketType, get_luxbus_core
 from .consciousness import Consciousness
 from .harmony import HarmonyV3
 from ..config import AstralConfig
+from ..realms.async_realm import AsyncRealm
 from ..wisdom.astral_logging import AstralLogger
 
 
@@ -44,6 +45,9 @@ class AstralEngineV3:
         # Realms jako moduły LuxBus
         self.realms: Dict[str, Any] = {}
 
+        # Asynchroniczne fasady realms - tworzone przy pierwszym użyciu
+        self.async_realms: Dict[str, AsyncRealm] = {}
+
         # Flows jako moduły LuxBus
         self.flows: Dict[str, Any] = {}
 
@@ -239,6 +243,12 @@ class AstralEngineV3:
             elif config.startswith('intention://'):
                 from ..realms.intention_realm import IntentionRealm
                 realm = IntentionRealm(name, config, self)
+            elif config.startswith('sharded://'):
+                from ..realms.sharded_realm import ShardedRealm
+                realm = ShardedRealm(name, config, self)
+            elif config.startswith('tiered://'):
+                from ..realms.tiered_realm import TieredRealm
+                realm = TieredRealm(name, config, self)
             else:
                 raise ValueError(f"Nieznany typ realm: {config}")
 
@@ -408,13 +418,19 @@ class AstralEngineV3:
 
         self.logger.info("🔄 Główne taski uruchomione")
 
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """Wykonuje blokującą funkcję w domyślnej puli wątków pętli (asyncio.to_thread wymaga 3.9)"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
     async def _meditation_cycle(self):
         """Cykl medytacyjny systemu"""
         while self.running:
             try:
                 await asyncio.sleep(getattr(self.config, 'meditation_interval', 60))
                 if self.running:
-                    meditation_result = self.meditate()
+                    # Medytacja odpytuje realms (count_beings) - poza pętlą, by nie blokować połączeń
+                    meditation_result = await self._run_blocking(self.meditate)
 
                     # Wyślij event medytacji
                     self.luxbus.send_event("meditation_completed", meditation_result)
@@ -430,7 +446,8 @@ class AstralEngineV3:
                 await asyncio.sleep(getattr(self.config, 'harmony_check_interval', 30))
                 print("🎵 Sprawdzanie harmonii...")
                 if self.running and self.harmony:
-                    self.harmony.balance()
+                    # Harmonizacja wywołuje realm.optimize() - poza pętlą
+                    await self._run_blocking(self.harmony.balance)
 
             except Exception as e:
                 self.logger.error(f"❌ Błąd w cyklu harmonii: {e}")
@@ -443,8 +460,8 @@ class AstralEngineV3:
                 await asyncio.sleep(getattr(self.config, 'consciousness_observation_interval', 15))
                 print("🧠 Obserwacja świadomości...")
                 if self.running and self.consciousness:
-                    # Wykonaj refleksję świadomości
-                    reflection = self.consciousness.reflect()
+                    # Wykonaj refleksję świadomości (odpytuje realms) - poza pętlą
+                    reflection = await self._run_blocking(self.consciousness.reflect)
 
                     # Sprawdź czy są krytyczne insights
                     critical_insights = [
@@ -630,6 +647,11 @@ class AstralEngineV3:
                 except Exception as e:
                     self.logger.error(f"❌ Błąd zatrzymywania flow '{flow_id}': {e}")
 
+        # Zamknij wykonawców asynchronicznych realms
+        for async_realm in self.async_realms.values():
+            async_realm.close(wait=False)
+        self.async_realms.clear()
+
         # Zatrzymaj consciousness
         if hasattr(self, 'consciousness') and self.consciousness:
             self.consciousness.rest()
@@ -685,6 +707,14 @@ class AstralEngineV3:
             raise ValueError(f"Wymiar '{name}' nie istnieje")
         return self.realms[name]
 
+    def get_async_realm(self, name: str) -> AsyncRealm:
+        """Pobiera asynchroniczną fasadę wymiaru (amanifest/acontemplate/aevolve/atranscend)"""
+        async_realm = self.async_realms.get(name)
+        if async_realm is None or async_realm.realm is not self.get_realm(name):
+            async_realm = AsyncRealm(self.get_realm(name))
+            self.async_realms[name] = async_realm
+        return async_realm
+
     def create_realm(self, name: str, config: str):
         """Tworzy nowy wymiar danych"""
         if name in self.realms:
@@ -743,6 +773,25 @@ class AstralEngineV3:
             self.logger.error(f"❌ Błąd manifestacji intencji: {e}")
             return None
 
+    async def amanifest_intention(self, intention_data: Dict[str, Any], realm_name: str = "intentions") -> Any:
+        """
+        Manifestuje intencję bez blokowania pętli asyncio - wersja async manifest_intention
+
+        API dla wywołujących z pętli asyncio; synchroniczne manifest_intention
+        (intention_helpers) wykonuje się w wątku wywołującego.
+        """
+        if realm_name not in self.realms:
+            return self.manifest_intention(intention_data, realm_name)
+
+        try:
+            intention = await self.get_async_realm(realm_name).amanifest(intention_data)
+            self.logger.info(f"🎯 Intencja zmanifestowana w wymiarze '{realm_name}'")
+            return intention
+
+        except Exception as e:
+            self.logger.error(f"❌ Błąd manifestacji intencji: {e}")
+            return None
+
     def get_astral_container(self, container_id: str) -> Any:
         """Pobiera kontener astralny po ID"""
         if self.container_manager:
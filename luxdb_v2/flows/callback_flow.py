@@ -46,15 +46,19 @@ class CallbackNamespace:
         if event_type not in self.callbacks:
             self.callbacks[event_type] = []
 
-        self.callbacks[event_type].append({
+        callbacks = self.callbacks[event_type]
+
+        # Wstaw za callbackami o priorytecie >= (lista pozostaje posortowana malejąco, bez sortowania)
+        position = len(callbacks)
+        while position and callbacks[position - 1]['priority'].value < priority.value:
+            position -= 1
+
+        callbacks.insert(position, {
             'callback': callback,
             'priority': priority,
             'registered_at': datetime.now()
         })
 
-        # Sortuj po priorytecie
-        self.callbacks[event_type].sort(key=lambda x: x['priority'].value, reverse=True)
-
     def off(self, event_type: str, callback: Callable):
         """Usuwa callback"""
         if event_type in self.callbacks:
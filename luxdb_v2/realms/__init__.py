@@ -7,10 +7,16 @@ Różne typy wymiarów astralnych:
 - SQLiteRealm: Lekki wymiar SQLite
 - PostgresRealm: Potężny wymiar PostgreSQL
 - MemoryRealm: Szybki wymiar pamięci
+- ShardedRealm: Wymiar podzielony na wiele plików SQLite
+- TieredRealm: Pamięć podręczna write-back przed SQLite
+- AsyncRealm: Asynchroniczna fasada dowolnego wymiaru
 """
 
 from .base_realm import BaseRealm
 from .sqlite_realm import SQLiteRealm
 from .memory_realm import MemoryRealm
+from .sharded_realm import ShardedRealm
+from .tiered_realm import TieredRealm
+from .async_realm import AsyncRealm
 
-__all__ = ['BaseRealm', 'SQLiteRealm', 'MemoryRealm']
+__all__ = ['BaseRealm', 'SQLiteRealm', 'MemoryRealm', 'ShardedRealm', 'TieredRealm', 'AsyncRealm']
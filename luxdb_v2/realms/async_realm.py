@@ -0,0 +1,111 @@
+"""
+⚡ AsyncRealm - Asynchroniczna Fasada Wymiaru
+
+Wymiary są synchroniczne - wywołane z pętli asyncio (AstralEngineV3, portal Oriom)
+blokowałyby wszystkie połączenia na czas zapytania. AsyncRealm przenosi wywołania
+do wykonawcy wymiaru i oddaje pętli sterowanie do czasu wyniku:
+- ASYNC_WORKERS = 0 (MemoryRealm): wywołanie inline - szybsze niż przełączenie wątku
+- ASYNC_WORKERS = 1 (SQLiteRealm): dedykowany wątek połączenia
+- ASYNC_WORKERS > 1: ograniczona pula wątków
+
+Liczba oczekujących wywołań jest ograniczona (max_pending) - nadmiar czeka w pętli,
+zamiast rosnąć w kolejce wykonawcy.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .base_realm import BaseRealm
+
+
+class AsyncRealm:
+    """
+    Asynchroniczna fasada wymiaru - amanifest/acontemplate/aevolve/atranscend
+
+    Pozostałe atrybuty przekazywane są do opakowanego wymiaru.
+    """
+
+    def __init__(self, realm: BaseRealm, max_workers: Optional[int] = None, max_pending: int = 64):
+        if max_pending < 1:
+            raise ValueError("max_pending musi być dodatni")
+
+        self.realm = realm
+        self.max_workers = realm.ASYNC_WORKERS if max_workers is None else max_workers
+        self.max_pending = max_pending
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.max_workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix=f"luxdb-realm-{realm.name}")
+
+        # Semafor tworzony leniwie - musi należeć do pętli, w której się go używa
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._closed = False
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Wykonuje synchroniczną funkcję wymiaru bez blokowania pętli"""
+        if self._closed:
+            raise RuntimeError(f"Asynchroniczny wymiar {self.realm.name} jest zamknięty")
+
+        if self._executor is None:
+            return function(*args, **kwargs)
+
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self.max_pending)
+
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def amanifest(self, being_data: Dict[str, Any]) -> Any:
+        return await self.run(self.realm.manifest, being_data)
+
+    async def amanifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[Any]:
+        # Generator materializowany w pętli - nie jest bezpieczny do czytania z innego wątku
+        return await self.run(self.realm.manifest_many, list(beings), batch_size)
+
+    async def acontemplate(self, intention: str, **conditions) -> List[Any]:
+        return await self.run(self.realm.contemplate, intention, **conditions)
+
+    async def aevolve(self, being_id: Any, new_data: Dict[str, Any], **options) -> Any:
+        return await self.run(self.realm.evolve, being_id, new_data, **options)
+
+    async def atranscend(self, being_id: Any) -> bool:
+        return await self.run(self.realm.transcend, being_id)
+
+    async def acount_beings(self) -> int:
+        return await self.run(self.realm.count_beings)
+
+    async def aget_status(self) -> Dict[str, Any]:
+        return await self.run(self.realm.get_status)
+
+    def close(self, wait: bool = True) -> None:
+        """Zamyka wykonawcę - oczekujące wywołania kończą się przy wait=True"""
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    async def aclose(self) -> None:
+        """Zamyka wykonawcę bez blokowania pętli"""
+        if self._executor is not None and not self._closed:
+            await asyncio.get_running_loop().run_in_executor(None, self.close)
+        self._closed = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'realm': self.realm.name,
+            'mode': 'inline' if self._executor is None else 'executor',
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'closed': self._closed
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'realm':
+            raise AttributeError(name)
+        return getattr(self.realm, name)
+
+    def __repr__(self):
+        return f"<AsyncRealm({self.realm!r}, workers={self.max_workers})>"
@@ -5,16 +5,23 @@ Abstrakcyjna klasa bazowa dla wszystkich wymiarów przechowujących dane w LuxDB
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
 from datetime import datetime
+from urllib.parse import parse_qs
 import threading
 
+from .essence_codec import EssenceCodec, Payload, decode_payload, get_codec
+
 
 class BaseRealm(ABC):
     """
     Bazowy wymiar astralny - abstrakcyjna klasa dla wszystkich wymiarów
     """
 
+    # Wątki wykonawcy AsyncRealm (0 = wywołania inline w pętli asyncio)
+    ASYNC_WORKERS = 4
+
     def __init__(self, name: str, connection_string: str, astral_engine):
         self.name = name
         self.connection_string = connection_string
@@ -23,6 +30,11 @@ class BaseRealm(ABC):
         self.is_connected = False
         self._lock = threading.Lock()
         self._being_count = 0
+        self.options: Dict[str, str] = self._parse_connection_options()
+
+        # Kodek esencji (?codec=json|msgpack|marshal|pickle) - marshal i pickle tylko dla zaufanych danych
+        self.codec: EssenceCodec = get_codec(self.options.get('codec', 'json'))
+        self.trusted = self.codec.unsafe or self.options.get('trusted', '').lower() in ('1', 'true', 'yes', 'on')
 
     @abstractmethod
     def connect(self) -> bool:
@@ -88,6 +100,61 @@ class BaseRealm(ABC):
         """
         pass
 
+    def manifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[Any]:
+        """
+        Manifestuje wiele bytów
+
+        Domyślnie pojedynczo - wymiary nadpisują to zapisem partiami.
+
+        Args:
+            beings: Dane bytów (dowolny iterowalny, także generator)
+            batch_size: Liczba bytów zapisywanych w jednej partii
+
+        Returns:
+            Lista zmanifestowanych bytów
+        """
+        manifested = []
+        for batch in self._batches(beings, batch_size):
+            manifested.extend(self.manifest(being_data) for being_data in batch)
+        return manifested
+
+    def contemplate_iter(self, intention: str, batch_size: int = 500, **conditions) -> Iterator[Any]:
+        """
+        Iteruje wyniki kontemplacji
+
+        Domyślnie przez contemplate() - wymiary nadpisują to odczytem strumieniowym.
+
+        Args:
+            intention: Intencja zapytania
+            batch_size: Liczba wierszy pobieranych naraz
+            **conditions: Warunki wyszukiwania
+
+        Returns:
+            Iterator znalezionych bytów
+        """
+        yield from self.contemplate(intention, **conditions)
+
+    @staticmethod
+    def _batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+        """Dzieli iterowalny na listy po batch_size elementów"""
+        if batch_size < 1:
+            raise ValueError("batch_size musi być dodatni")
+
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def encode_essence(self, data: Any) -> Payload:
+        """Serializuje esencję kodekiem wymiaru"""
+        return self.codec.encode(data)
+
+    def decode_essence(self, payload: Payload) -> Any:
+        """Deserializuje esencję zapisaną dowolnym kodekiem (ValueError przy błędzie)"""
+        return decode_payload(payload, self.trusted)
+
     def is_healthy(self) -> bool:
         """Sprawdza zdrowie wymiaru"""
         return self.is_connected
@@ -109,10 +176,19 @@ class BaseRealm(ABC):
             'healthy': self.is_healthy(),
             'active': self.is_active(),
             'being_count': self.count_beings(),
+            'codec': self.codec.name,
             'created_at': self.created_at.isoformat(),
             'connection_string': self._mask_connection_string()
         }
 
+    def _parse_connection_options(self) -> Dict[str, str]:
+        """Parsuje opcje z części zapytania connection string (np. memory://?layout=columnar)"""
+        if '?' not in self.connection_string:
+            return {}
+
+        query = self.connection_string.split('?', 1)[1]
+        return {key: values[-1] for key, values in parse_qs(query).items()}
+
     def _mask_connection_string(self) -> str:
         """Maskuje wrażliwe dane w connection string"""
         if '://' in self.connection_string:
@@ -0,0 +1,191 @@
+"""
+🧬 EssenceCodec - Kodeki Esencji Bytów
+
+Serializacja esencji wybierana per wymiar w connection string (?codec=...):
+- json: tekst JSON (domyślny) - czytelny i dostępny dla funkcji JSON w SQL
+- msgpack: zwarty format binarny (wymaga pakietu msgpack)
+- marshal: najszybszy format binarny - tylko dla zaufanych danych
+- pickle: dowolne obiekty Pythona - tylko dla zaufanych danych
+
+Formaty binarne zaczynają się bajtem znacznika kodeka, JSON jest tekstem bez znacznika,
+więc wymiar odczyta dane zapisane wcześniej innym kodekiem.
+"""
+
+import json
+import marshal
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+Payload = Union[str, bytes]
+
+
+class EssenceCodec:
+    """Kodek JSON - tekst bez znacznika"""
+
+    name = 'json'
+    # Bajt znacznika formatu binarnego (None = tekst JSON)
+    tag: Optional[int] = None
+    # Dane dostępne dla json_extract / json_patch w SQL
+    sql_json = True
+    # Dekodowanie może wykonać kod - tylko dla zaufanych danych
+    unsafe = False
+
+    def encode(self, data: Any) -> Payload:
+        return json.dumps(data)
+
+    def decode(self, payload: Payload) -> Any:
+        return json.loads(payload)
+
+
+class BinaryCodec(EssenceCodec, ABC):
+    """Abstrakcyjny kodek binarny - bajt znacznika + dane"""
+
+    sql_json = False
+
+    def encode(self, data: Any) -> bytes:
+        return bytes((self.tag,)) + self._dumps(data)
+
+    def decode(self, payload: Payload) -> Any:
+        return self._loads(memoryview(payload)[1:])
+
+    @abstractmethod
+    def _dumps(self, data: Any) -> bytes:
+        """Serializuje dane (bez bajtu znacznika)"""
+        pass
+
+    @abstractmethod
+    def _loads(self, body: memoryview) -> Any:
+        """Deserializuje dane (bez bajtu znacznika)"""
+        pass
+
+
+class MsgpackCodec(BinaryCodec):
+    name = 'msgpack'
+    tag = 1
+
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("Kodek msgpack wymaga pakietu msgpack (pip install msgpack)")
+
+    def _dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def _loads(self, body: memoryview) -> Any:
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+class MarshalCodec(BinaryCodec):
+    name = 'marshal'
+    tag = 2
+    unsafe = True
+
+    # Wersja 4 formatu marshal jest stała od Pythona 3.4
+    VERSION = 4
+
+    def _dumps(self, data: Any) -> bytes:
+        return marshal.dumps(data, self.VERSION)
+
+    def _loads(self, body: memoryview) -> Any:
+        return marshal.loads(body)
+
+
+class PickleCodec(BinaryCodec):
+    name = 'pickle'
+    tag = 3
+    unsafe = True
+
+    def _dumps(self, data: Any) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _loads(self, body: memoryview) -> Any:
+        return pickle.loads(body)
+
+
+CODECS: Dict[str, Type[EssenceCodec]] = {
+    codec.name: codec for codec in (EssenceCodec, MsgpackCodec, MarshalCodec, PickleCodec)
+}
+
+CODECS_BY_TAG: Dict[int, Type[EssenceCodec]] = {
+    codec.tag: codec for codec in CODECS.values() if codec.tag is not None
+}
+
+# Pierwsze bajty tekstu JSON zapisanego jako BLOB
+JSON_LEADING_BYTES = frozenset(b'{["-0123456789tfn \t\r\n')
+
+_instances: Dict[Type[EssenceCodec], EssenceCodec] = {}
+
+
+def _instance(codec_class: Type[EssenceCodec]) -> EssenceCodec:
+    codec = _instances.get(codec_class)
+    if codec is None:
+        codec = _instances[codec_class] = codec_class()
+    return codec
+
+
+def get_codec(name: str) -> EssenceCodec:
+    """Zwraca kodek o danej nazwie"""
+    codec_class = CODECS.get(name.lower())
+    if codec_class is None:
+        raise ValueError(f"Nieznany kodek esencji: {name} (dostępne: {', '.join(CODECS)})")
+    return _instance(codec_class)
+
+
+def decode_payload(payload: Payload, trusted: bool = False) -> Any:
+    """
+    Dekoduje esencję zapisaną dowolnym kodekiem
+
+    Args:
+        payload: Tekst JSON lub bajty ze znacznikiem kodeka
+        trusted: Zezwala na kodeki wykonujące kod (marshal, pickle)
+
+    Raises:
+        ValueError: Nieznany znacznik, niedozwolony kodek lub uszkodzone dane
+    """
+    if isinstance(payload, str):
+        return json.loads(payload)
+
+    if not payload:
+        raise ValueError("Pusta esencja")
+
+    tag = payload[0]
+    codec_class = CODECS_BY_TAG.get(tag)
+    if codec_class is None:
+        if tag in JSON_LEADING_BYTES:
+            return json.loads(payload)
+        raise ValueError(f"Nieznany znacznik kodeka esencji: {tag}")
+
+    if codec_class.unsafe and not trusted:
+        raise ValueError(f"Kodek {codec_class.name} wymaga zaufanego wymiaru (codec={codec_class.name} lub trusted=1)")
+
+    try:
+        return _instance(codec_class).decode(payload)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Uszkodzona esencja ({codec_class.name}): {e}") from e
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Scala dane według JSON Merge Patch (RFC 7396) - jak json_patch w SQLite
+
+    Zagnieżdżone słowniki są scalane, None usuwa pole, pozostałe wartości zastępują stare.
+    """
+    if not isinstance(patch, dict):
+        return patch
+
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
@@ -0,0 +1,177 @@
+"""
+🗄️ IntentionArchive - Zimne Archiwum Intencji
+
+Transcendowane intencje trafiają do osobnego pliku SQLite (intention://memory?archive=ścieżka):
+- tylko dopisywanie - wpis nie jest nigdy zmieniany ani usuwany
+- pełny zapis intencji (historia, interakcje, wspomnienia) skompresowany zlib
+- indeksy po id i czasie transcendencji - odczyt po id i skany zakresu czasu
+
+Zbiór aktywnych intencji pozostaje mały, a raporty o zakończonej pracy czytają archiwum.
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+from .essence_codec import EssenceCodec, Payload
+from .intention_store import encode_record
+
+TimeBound = Union[datetime, str, None]
+
+
+class IntentionArchive:
+    """
+    Archiwum transcendowanych intencji w pliku SQLite
+
+    Wpisy zwracane jako słowniki: intention_id, name, final_state, success_score,
+    transcended_at (ISO) oraz record (zapis IntentionBeing.to_record).
+    """
+
+    def __init__(self, path: str, codec: EssenceCodec, decode: Callable[[Payload], Any],
+                 compression_level: int = 6):
+        self.path = path
+        self.codec = codec
+        self._decode = decode
+        self.compression_level = compression_level
+        self.connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.archived = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection is not None
+
+    def open(self) -> None:
+        """Otwiera plik archiwum i tworzy schemat"""
+        if self.connection is not None:
+            return
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS archived_intentions (
+                intention_id TEXT NOT NULL,
+                name TEXT,
+                final_state TEXT NOT NULL,
+                success_score REAL NOT NULL,
+                transcended_at TEXT NOT NULL,
+                record BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_archived_intentions_id ON archived_intentions(intention_id);
+            CREATE INDEX IF NOT EXISTS idx_archived_intentions_time ON archived_intentions(transcended_at);
+        """)
+        self.connection.commit()
+
+        # Tylko dopisywanie - największy rowid to liczba wpisów
+        self.archived = self.connection.execute("SELECT COALESCE(MAX(rowid), 0) FROM archived_intentions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def append(self, record: Dict[str, Any], transcended_at: Optional[datetime] = None) -> None:
+        """Dopisuje zapis transcendowanej intencji"""
+        payload = encode_record(self.codec, record)
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        row = (
+            record['essence']['soul_id'],
+            record['essence'].get('name'),
+            record['state'],
+            record['metainfo'].get('wskaznik_sukcesu', 0.0),
+            (transcended_at or datetime.now()).isoformat(),
+            zlib.compress(payload, self.compression_level)
+        )
+
+        with self._lock:
+            try:
+                self.connection.execute(
+                    "INSERT INTO archived_intentions "
+                    "(intention_id, name, final_state, success_score, transcended_at, record) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", row
+                )
+                self.connection.commit()
+                self.archived += 1
+            except Exception:
+                self.connection.rollback()
+                raise
+
+    def get(self, intention_id: str) -> Optional[Dict[str, Any]]:
+        """Zwraca najnowszy wpis archiwum dla intencji lub None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT intention_id, name, final_state, success_score, transcended_at, record "
+                "FROM archived_intentions WHERE intention_id = ? ORDER BY rowid DESC LIMIT 1",
+                (intention_id,)
+            ).fetchone()
+
+        return self._entry(row) if row else None
+
+    def scan(self, since: TimeBound = None, until: TimeBound = None, final_state: Optional[str] = None,
+             batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Iteruje wpisy z zakresu czasu transcendencji [since, until) w kolejności czasu
+
+        Pobiera partiami (keyset po czasie i rowid) - blokada nie jest trzymana między partiami.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size musi być dodatni")
+
+        where, params = [], []
+        if since is not None:
+            where.append("transcended_at >= ?")
+            params.append(self._bound(since))
+        if until is not None:
+            where.append("transcended_at < ?")
+            params.append(self._bound(until))
+        if final_state is not None:
+            where.append("final_state = ?")
+            params.append(final_state)
+
+        last_key = None
+        while True:
+            conditions = list(where)
+            page_params = list(params)
+            if last_key is not None:
+                conditions.append("(transcended_at, rowid) > (?, ?)")
+                page_params.extend(last_key)
+
+            sql = ("SELECT intention_id, name, final_state, success_score, transcended_at, record, rowid "
+                   "FROM archived_intentions")
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY transcended_at, rowid LIMIT ?"
+
+            with self._lock:
+                rows = self.connection.execute(sql, page_params + [batch_size]).fetchall()
+
+            for row in rows:
+                yield self._entry(row[:6])
+
+            if len(rows) < batch_size:
+                return
+            last_key = (rows[-1][4], rows[-1][6])
+
+    @staticmethod
+    def _bound(value: Union[datetime, str]) -> str:
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    def _entry(self, row) -> Dict[str, Any]:
+        intention_id, name, final_state, success_score, transcended_at, record = row
+        return {
+            'intention_id': intention_id,
+            'name': name,
+            'final_state': final_state,
+            'success_score': success_score,
+            'transcended_at': transcended_at,
+            'record': self._decode(zlib.decompress(record))
+        }
@@ -3,13 +3,40 @@
 🎯 IntentionRealm - Wymiar Intencji Duchowo-Materialnych
 
 Specjalizowany wymiar przechowujący i zarządzający intencjami
+
+Intencje są indeksowane według stanu, priorytetu, opiekuna i tagów. Indeksy to
+słowniki id -> None (zbiór zachowujący kolejność wstawiania), więc dodanie i usunięcie
+to O(1), a contemplate przegląda najmniejszy pasujący indeks zamiast wszystkich intencji.
+Zmiany stanu, priorytetu i opiekuna wykonane przez samą intencję trafiają do indeksów
+przez on_intention_recategorized. Tagi zmieniane bezpośrednio na liście metainfo.tags
+wymagają reindex_intention().
+
+Średni wskaźnik sukcesu i średnia harmonia w get_status to sumy bieżące, aktualizowane
+przy manifestacji, ewolucji, interakcji i transcendencji (on_intention_updated) - status
+jest O(1) niezależnie od liczby intencji.
+
+Trwałość (opcjonalna): intention://memory?store=ścieżka.db&max_resident=10000
+- manifestacja, evolve, interakcja przez wymiar i transcendencja zapisywane od razu
+  do pliku SQLite (IntentionStore); zmiany zgłoszone przez samą intencję oznaczają ją
+  jako brudną - zapis partią przy wywłaszczeniu lub flush()
+- w pamięci zostają indeksy i agregaty wszystkich intencji oraz najwyżej max_resident
+  zmaterializowanych intencji (LRU); pozostałe odtwarzane leniwie przy odczycie
+- restart wczytuje lekkie kolumny magazynu zamiast ponownej manifestacji
+
+Archiwum (opcjonalne): &archive=ścieżka.db - transcendowane intencje z pełną historią
+trafiają do skompresowanego archiwum tylko do dopisywania (IntentionArchive), dostępnego
+przez get_archived_intention i iter_archived_intentions.
 """
 
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import json
+import weakref
 
 from .base_realm import BaseRealm
+from .intention_archive import IntentionArchive, TimeBound
+from .intention_store import IntentionStore
 from ..beings.intention_being import IntentionBeing, IntentionState, IntentionPriority
 from ..beings.manifestation import Manifestation
 
@@ -19,28 +46,76 @@ class IntentionRealm(BaseRealm):
     Wymiar Intencji - specjalizowany realm dla bytów IntentionBeing
     """
     
+    # Intencje trzymane w pamięci - AsyncRealm wywołuje operacje inline
+    # (z magazynem lub archiwum: dedykowany wątek, bo operacje zapisują do SQLite)
+    ASYNC_WORKERS = 0
+    
     def __init__(self, name: str, connection_string: str, astral_engine):
         super().__init__(name, connection_string, astral_engine)
         
-        # Słownik aktywnych intencji
-        self.active_intentions: Dict[str, IntentionBeing] = {}
+        # Zmaterializowane intencje - z magazynem to cache LRU, bez niego wszystkie intencje
+        self.active_intentions: "OrderedDict[str, IntentionBeing]" = OrderedDict()
         
-        # Kategoryzacja intencji
-        self.intentions_by_state: Dict[IntentionState, List[str]] = {
-            state: [] for state in IntentionState
+        # Kategoryzacja intencji - id -> None, czyli zbiór z kolejnością wstawiania
+        self.intentions_by_state: Dict[IntentionState, Dict[str, None]] = {
+            state: {} for state in IntentionState
         }
         
-        self.intentions_by_priority: Dict[IntentionPriority, List[str]] = {
-            priority: [] for priority in IntentionPriority
+        self.intentions_by_priority: Dict[IntentionPriority, Dict[str, None]] = {
+            priority: {} for priority in IntentionPriority
         }
         
+        self.intentions_by_opiekun: Dict[str, Dict[str, None]] = {}
+        self.intentions_by_tag: Dict[str, Dict[str, None]] = {}
+        
+        # Klucze, pod którymi intencja jest zaindeksowana - usuwanie nie zależy od bieżącego stanu bytu
+        self._categorized: Dict[str, Tuple[IntentionState, IntentionPriority, Optional[str], Tuple[str, ...]]] = {}
+        
+        # Jeden handler interakcji na namespace, routowany po intention_id
+        self._interaction_handler_registered = False
+        
         # Statystyki
         self.total_intentions_created = 0
         self.total_intentions_completed = 0
         
+        # Sumy bieżące dla średnich w get_status i wkład każdej intencji (sukces, harmonia)
+        self._success_sum = 0.0
+        self._harmony_sum = 0.0
+        self._aggregate_contributions: Dict[str, Tuple[float, float]] = {}
+        
         # System manifestacji
         self.manifestation = Manifestation(self, IntentionBeing)
         
+        # Trwały magazyn (?store=ścieżka) i budżet zmaterializowanych intencji
+        self._store: Optional[IntentionStore] = None
+        if 'store' in self.options:
+            self._store = IntentionStore(
+                self.options['store'], self.codec, self.decode_essence,
+                synchronous=self.options.get('synchronous', 'NORMAL')
+            )
+        
+        # Archiwum transcendowanych intencji (?archive=ścieżka)
+        self._archive: Optional[IntentionArchive] = None
+        if 'archive' in self.options:
+            self._archive = IntentionArchive(
+                self.options['archive'], self.codec, self.decode_essence,
+                compression_level=int(self.options.get('archive_compression', 6))
+            )
+        
+        if self._store is not None or self._archive is not None:
+            self.ASYNC_WORKERS = 1
+        
+        self.max_resident = int(self.options.get('max_resident', 10000))
+        if self.max_resident < 1:
+            raise ValueError("max_resident musi być dodatni")
+        
+        # Wywłaszczone intencje wciąż trzymane przez wywołujących - odczyt zwraca ten sam obiekt
+        self._evicted: "weakref.WeakValueDictionary[str, IntentionBeing]" = weakref.WeakValueDictionary()
+        # Zmaterializowane intencje zmienione od ostatniego zapisu do magazynu
+        self._dirty: Dict[str, None] = {}
+        self.hydrations = 0
+        self.evictions = 0
+        
         # Auto-connect dla intention realm
         self.connect()
     
@@ -48,6 +123,13 @@ class IntentionRealm(BaseRealm):
         """Nawiązuje połączenie z wymiarem intencji"""
         try:
             # Intention realm zawsze działa w pamięci + opcjonalnie persystencja
+            if self._store is not None and not self._store.is_open:
+                self._store.open()
+                self._load_store()
+            
+            if self._archive is not None:
+                self._archive.open()
+            
             self.is_connected = True
             
             if self.engine:
@@ -62,6 +144,13 @@ class IntentionRealm(BaseRealm):
     def disconnect(self) -> bool:
         """Rozłącza z wymiarem intencji"""
         try:
+            if self._store is not None and self._store.is_open:
+                self.flush()
+                self._store.close()
+            
+            if self._archive is not None:
+                self._archive.close()
+            
             self.is_connected = False
             if self.engine:
                 self.engine.logger.info(f"🎯 Wymiar Intencji '{self.name}' deaktywowany")
@@ -81,15 +170,60 @@ class IntentionRealm(BaseRealm):
         Returns:
             Nowa intencja
         """
+        intention = self._manifest_intention(intention_data)
+        
+        if self.engine:
+            self.engine.logger.info(f"🎯 Intencja '{intention.essence.name}' zmanifestowana")
+        
+        return intention
+    
+    def manifest_many(self, intentions: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[IntentionBeing]:
+        """
+        Manifestuje wiele intencji - jeden wpis w logu na partię zamiast na intencję
+        
+        Args:
+            intentions: Dane intencji (dowolny iterowalny, także generator)
+            batch_size: Liczba intencji w jednej partii
+            
+        Returns:
+            Lista nowych intencji
+        """
+        manifested = []
+        for batch in self._batches(intentions, batch_size):
+            # Z magazynem cała partia trafia do pliku w jednej transakcji
+            pending = [] if self._store is not None else None
+            intentions_batch = [self._manifest_intention(intention_data, pending) for intention_data in batch]
+            
+            if pending:
+                self._store.save_many(pending, self._counters())
+            
+            manifested.extend(intentions_batch)
+            self._evict_over_budget()
+            
+            if self.engine:
+                self.engine.logger.info(f"🎯 Zmanifestowano partię {len(batch)} intencji")
+        
+        return manifested
+    
+    def _manifest_intention(self, intention_data: Dict[str, Any], pending: Optional[List[tuple]] = None) -> IntentionBeing:
+        """
+        Manifestuje, kategoryzuje i ogłasza intencję (bez wpisu w logu)
+        
+        pending: lista, do której trafia wiersz magazynu zamiast natychmiastowego zapisu
+        """
         try:
             # Użyj systemu manifestacji
             intention = self.manifestation.manifest(intention_data, IntentionBeing)
             
             # Dodaj do aktywnych intencji
             self.active_intentions[intention.essence.soul_id] = intention
+            if self._store is not None:
+                # Z magazynem wymiar sam wywłaszcza intencje - rejestr manifestacji nie może ich trzymać
+                self.manifestation.active_beings.pop(intention.essence.soul_id, None)
             
             # Kategoryzuj
             self._categorize_intention(intention)
+            self._update_aggregates(intention)
             
             # Aktualizuj statystyki
             self.total_intentions_created += 1
@@ -98,6 +232,13 @@ class IntentionRealm(BaseRealm):
             # Utwórz kanał komunikacji
             self._create_communication_channel(intention)
             
+            if pending is not None:
+                pending.append(self._store_row(intention))
+            elif self._store is not None:
+                self._store.save_many([self._store_row(intention)], self._counters())
+                self._evict_over_budget()
+            self._dirty.pop(intention.essence.soul_id, None)
+            
             # Emituj wydarzenie
             if self.engine and hasattr(self.engine, 'callback_flow') and self.engine.callback_flow:
                 self.engine.callback_flow.emit_event('intentions', 'intention_manifested', {
@@ -108,9 +249,6 @@ class IntentionRealm(BaseRealm):
                     'realm': self.name
                 })
             
-            if self.engine:
-                self.engine.logger.info(f"🎯 Intencja '{intention.essence.name}' zmanifestowana")
-            
             return intention
             
         except Exception as e:
@@ -118,38 +256,221 @@ class IntentionRealm(BaseRealm):
                 self.engine.logger.error(f"❌ Błąd manifestacji intencji: {e}")
             raise
     
+    @staticmethod
+    def _category_keys(intention: IntentionBeing) -> Tuple[IntentionState, IntentionPriority, Optional[str], Tuple[str, ...]]:
+        """Zwraca klucze indeksów intencji: stan, priorytet, opiekun, tagi"""
+        return (intention.state, intention.priority, intention.metainfo.opiekun, tuple(intention.metainfo.tags))
+    
     def _categorize_intention(self, intention: IntentionBeing):
-        """Kategoryzuje intencję według stanu i priorytetu"""
-        # Według stanu
-        self.intentions_by_state[intention.state].append(intention.essence.soul_id)
+        """Kategoryzuje intencję według stanu, priorytetu, opiekuna i tagów"""
+        self._categorize(intention.essence.soul_id, self._category_keys(intention))
+    
+    def _categorize(self, intention_id: str, keys: Tuple[IntentionState, IntentionPriority, Optional[str], Tuple[str, ...]]):
+        """Wstawia id intencji do indeksów pod podanymi kluczami"""
+        state, priority, opiekun, tags = keys
+        
+        self.intentions_by_state[state][intention_id] = None
+        self.intentions_by_priority[priority][intention_id] = None
+        
+        if opiekun is not None:
+            self.intentions_by_opiekun.setdefault(opiekun, {})[intention_id] = None
+        
+        for tag in tags:
+            self.intentions_by_tag.setdefault(tag, {})[intention_id] = None
+        
+        self._categorized[intention_id] = keys
+    
+    def on_intention_recategorized(self, intention: IntentionBeing):
+        """Wywoływane przez IntentionBeing po zmianie stanu, priorytetu lub opiekuna"""
+        if intention.essence.soul_id in self._categorized:
+            self._remove_from_categories(intention)
+            self._categorize_intention(intention)
+            self._mark_dirty(intention)
+    
+    def reindex_intention(self, intention_id: str) -> bool:
+        """Odświeża indeksy i agregaty intencji - np. po bezpośredniej zmianie jej pól"""
+        intention = self._get_intention(intention_id)
+        if intention is None:
+            return False
+        
+        self.on_intention_recategorized(intention)
+        intention._notify_updated()
+        return True
+    
+    def on_intention_updated(self, intention: IntentionBeing):
+        """Wywoływane przez IntentionBeing po zmianie wpływającej na sukces lub harmonię"""
+        if intention.essence.soul_id in self._aggregate_contributions:
+            self._update_aggregates(intention)
+            self._mark_dirty(intention)
+    
+    def _update_aggregates(self, intention: IntentionBeing):
+        """Zastępuje wkład intencji w sumy bieżące aktualnymi wartościami"""
+        self._set_contribution(intention.essence.soul_id, intention.metainfo.wskaznik_sukcesu, intention.get_harmony())
+    
+    def _set_contribution(self, intention_id: str, success: float, harmony: float):
+        """Zastępuje wkład intencji w sumy bieżące podanymi wartościami"""
+        previous_success, previous_harmony = self._aggregate_contributions.get(intention_id, (0.0, 0.0))
+        self._success_sum += success - previous_success
+        self._harmony_sum += harmony - previous_harmony
+        self._aggregate_contributions[intention_id] = (success, harmony)
+    
+    def _remove_from_aggregates(self, intention_id: str):
+        """Odejmuje wkład intencji od sum bieżących"""
+        success, harmony = self._aggregate_contributions.pop(intention_id, (0.0, 0.0))
+        
+        if self._aggregate_contributions:
+            self._success_sum -= success
+            self._harmony_sum -= harmony
+        else:
+            # Brak intencji - wyzeruj, żeby nie kumulować błędu zaokrągleń
+            self._success_sum = 0.0
+            self._harmony_sum = 0.0
+    
+    def _get_intention(self, intention_id: str) -> Optional[IntentionBeing]:
+        """Zwraca intencję - z pamięci albo odtworzoną z magazynu"""
+        intention = self.active_intentions.get(intention_id)
+        if intention is not None:
+            if self._store is not None:
+                self.active_intentions.move_to_end(intention_id)
+            return intention
+        
+        if self._store is None or intention_id not in self._categorized:
+            return None
+        
+        intention = self._evicted.pop(intention_id, None)
+        if intention is None:
+            record = self._store.load(intention_id)
+            if record is None:
+                return None
+            intention = IntentionBeing.from_record(record, realm=self)
+            self.hydrations += 1
+        
+        self.active_intentions[intention_id] = intention
+        self._evict_over_budget()
+        return intention
+    
+    def _mark_dirty(self, intention: IntentionBeing):
+        """Oznacza intencję jako zmienioną - trafi do magazynu przy wywłaszczeniu lub flush()"""
+        if self._store is None:
+            return
+        
+        intention_id = intention.essence.soul_id
+        self._dirty[intention_id] = None
+        if intention_id not in self.active_intentions:
+            # Zmiana wywłaszczonej intencji trzymanej przez wywołującego - wraca do pamięci
+            self._evicted.pop(intention_id, None)
+            self.active_intentions[intention_id] = intention
+            self._evict_over_budget()
+    
+    def _persist(self, intention: IntentionBeing):
+        """Zapisuje zmienioną intencję do magazynu od razu (jeśli skonfigurowany)"""
+        if self._store is None:
+            return
         
-        # Według priorytetu
-        self.intentions_by_priority[intention.priority].append(intention.essence.soul_id)
+        self._mark_dirty(intention)
+        if self._dirty.pop(intention.essence.soul_id, False) is None:
+            self._store.save_many([self._store_row(intention)])
+    
+    def flush(self) -> int:
+        """
+        Zapisuje wszystkie brudne intencje do magazynu w jednej transakcji
+        
+        Returns:
+            Liczba zapisanych intencji
+        """
+        if self._store is None or not self._dirty:
+            return 0
+        
+        intentions = [self.active_intentions[intention_id] for intention_id in self._dirty]
+        self._store.save_many([self._store_row(intention) for intention in intentions], self._counters())
+        self._dirty.clear()
+        return len(intentions)
+    
+    def _evict_over_budget(self):
+        """Wywłaszcza najdawniej używane intencje ponad max_resident - brudne zapisuje jedną partią"""
+        if self._store is None or len(self.active_intentions) <= self.max_resident:
+            return
+        
+        dirty = []
+        evicted = 0
+        while len(self.active_intentions) > self.max_resident:
+            intention_id, intention = self.active_intentions.popitem(last=False)
+            self._evicted[intention_id] = intention
+            evicted += 1
+            if self._dirty.pop(intention_id, False) is None:
+                dirty.append(intention)
+        
+        # Czyste intencje są w magazynie w aktualnej postaci - odczyt nie zapisuje niczego
+        if dirty:
+            self._store.save_many([self._store_row(intention) for intention in dirty])
+        self.evictions += evicted
+    
+    def _store_row(self, intention: IntentionBeing) -> tuple:
+        """Wiersz magazynu: lekkie kolumny indeksów i agregatów + pełny zapis"""
+        return (
+            intention.essence.soul_id,
+            intention.state.value,
+            intention.priority.value,
+            intention.metainfo.opiekun,
+            list(intention.metainfo.tags),
+            intention.metainfo.wskaznik_sukcesu,
+            intention.get_harmony(),
+            intention.to_record()
+        )
+    
+    def _counters(self) -> Dict[str, int]:
+        return {
+            'total_intentions_created': self.total_intentions_created,
+            'total_intentions_completed': self.total_intentions_completed
+        }
+    
+    def _load_store(self):
+        """Odbudowuje indeksy, agregaty i liczniki z lekkich kolumn magazynu"""
+        for intention_id, state, priority, opiekun, tags, success, harmony in self._store.iter_summaries():
+            if intention_id in self._categorized:
+                continue
+            
+            self._categorize(intention_id, (IntentionState(state), IntentionPriority(priority), opiekun, tuple(tags)))
+            self._set_contribution(intention_id, success, harmony)
+        
+        counters = self._store.load_counters()
+        self.total_intentions_created = counters.get('total_intentions_created', self.total_intentions_created)
+        self.total_intentions_completed = counters.get('total_intentions_completed', self.total_intentions_completed)
+        self._being_count = len(self._categorized)
+        
+        if self._categorized:
+            self._register_interaction_handler()
     
     def _create_communication_channel(self, intention: IntentionBeing):
         """Tworzy kanał komunikacji dla intencji"""
-        channel_name = intention.get_communication_channel()
+        intention.get_communication_channel()
+        self._register_interaction_handler()
+    
+    def _register_interaction_handler(self):
+        """Rejestruje jeden handler interakcji - zdarzenie 'interact' niesie intention_id"""
+        if self._interaction_handler_registered:
+            return
         
-        # Jeśli callback_flow istnieje, utwórz namespace
         if self.engine and hasattr(self.engine, 'callback_flow') and self.engine.callback_flow:
             intentions_ns = self.engine.callback_flow.create_namespace('intentions')
-            
-            # Callback dla interakcji z intencją
-            def handle_intention_interaction(event):
-                interaction_data = event.data
-                intention_id = interaction_data.get('intention_id')
-                
-                if intention_id in self.active_intentions:
-                    intention = self.active_intentions[intention_id]
-                    return intention.add_interaction(
-                        interaction_data.get('type'),
-                        interaction_data.get('data', {}),
-                        interaction_data.get('user_id', 'system')
-                    )
-                
-                return {'success': False, 'message': 'Intencja nie znaleziona'}
-            
-            intentions_ns.on(f'interact_{intention.essence.soul_id}', handle_intention_interaction)
+            intentions_ns.on('interact', self._handle_intention_interaction)
+            self._interaction_handler_registered = True
+    
+    def _handle_intention_interaction(self, event):
+        """Kieruje zdarzenie interakcji do intencji wskazanej przez intention_id"""
+        interaction_data = event.data or {}
+        intention = self._get_intention(interaction_data.get('intention_id'))
+        
+        if intention is None:
+            return {'success': False, 'message': 'Intencja nie znaleziona'}
+        
+        result = intention.add_interaction(
+            interaction_data.get('type'),
+            interaction_data.get('data', {}),
+            interaction_data.get('user_id', 'system')
+        )
+        self._persist(intention)
+        return result
     
     def contemplate(self, intention: str, **conditions) -> List[IntentionBeing]:
         """
@@ -165,9 +486,28 @@ class IntentionRealm(BaseRealm):
         try:
             results = []
             
+            # Bez sortowania limit kończy przeglądanie wcześniej
+            stop_at = conditions.get('limit') if 'sort_by' not in conditions else None
+            
+            # Przeglądaj najmniejszy pasujący indeks, pozostałe służą do szybkiego odrzucania
+            candidates = self._plan_candidates(conditions)
+            if candidates is None:
+                scan = self._categorized.keys()
+                filters = []
+            else:
+                candidates.sort(key=len)
+                scan, filters = candidates[0], candidates[1:]
+            
             # Filtrowanie według warunków
-            for intention_being in self.active_intentions.values():
-                if self._matches_conditions(intention_being, conditions):
+            for intention_id in scan:
+                if stop_at is not None and len(results) >= stop_at:
+                    break
+                
+                if any(intention_id not in index for index in filters):
+                    continue
+                
+                intention_being = self._get_intention(intention_id)
+                if intention_being is not None and self._matches_conditions(intention_being, conditions):
                     results.append(intention_being)
             
             # Sortowanie jeśli określono
@@ -185,6 +525,46 @@ class IntentionRealm(BaseRealm):
                 self.engine.logger.error(f"❌ Błąd kontemplacji intencji: {e}")
             return []
     
+    def _plan_candidates(self, conditions: Dict[str, Any]) -> Optional[List[Dict[str, None]]]:
+        """
+        Zwraca indeksy pasujące do warunków state/priority/opiekun/tag
+        
+        None oznacza brak warunku indeksowanego (pełny przegląd). Pusty indeks
+        w wyniku oznacza, że żadna intencja nie spełni warunków.
+        """
+        candidates = []
+        
+        if 'state' in conditions:
+            state = conditions['state']
+            if isinstance(state, str):
+                state = next((s for s in IntentionState if s.value == state), None)
+                candidates.append(self.intentions_by_state[state] if state else {})
+            elif isinstance(state, IntentionState):
+                candidates.append(self.intentions_by_state[state])
+        
+        if 'priority' in conditions:
+            priority = conditions['priority']
+            if isinstance(priority, IntentionPriority):
+                candidates.append(self.intentions_by_priority[priority])
+            elif isinstance(priority, str):
+                priority = IntentionPriority.__members__.get(priority)
+                candidates.append(self.intentions_by_priority[priority] if priority else {})
+            elif isinstance(priority, int):
+                priority = next((p for p in IntentionPriority if p.value == priority), None)
+                candidates.append(self.intentions_by_priority[priority] if priority else {})
+        
+        if 'opiekun' in conditions and conditions['opiekun'] is not None:
+            candidates.append(self.intentions_by_opiekun.get(conditions['opiekun'], {}))
+        
+        if 'tag' in conditions:
+            try:
+                candidates.append(self.intentions_by_tag.get(conditions['tag'], {}))
+            except TypeError:
+                # Niehaszowalny tag - zostaw pełny przegląd
+                pass
+        
+        return candidates or None
+    
     def _matches_conditions(self, intention: IntentionBeing, conditions: Dict[str, Any]) -> bool:
         """Sprawdza czy intencja spełnia warunki"""
         for key, value in conditions.items():
@@ -256,22 +636,30 @@ class IntentionRealm(BaseRealm):
             True jeśli sukces
         """
         try:
-            if intention_id not in self.active_intentions:
+            intention = self._get_intention(intention_id)
+            if intention is None:
                 return False
             
-            intention = self.active_intentions[intention_id]
+            # Najpierw archiwum - błąd zapisu zostawia intencję aktywną
+            if self._archive is not None:
+                self._archive.append(intention.to_record())
             
-            # Usuń z kategorii
+            # Usuń z kategorii i agregatów
             self._remove_from_categories(intention)
+            self._remove_from_aggregates(intention_id)
             
             # Usuń z aktywnych
             del self.active_intentions[intention_id]
+            self._dirty.pop(intention_id, None)
             self._being_count -= 1
             
             # Jeśli zakończona - zwiększ licznik
             if intention.state == IntentionState.COMPLETED:
                 self.total_intentions_completed += 1
             
+            if self._store is not None:
+                self._store.delete(intention_id, self._counters())
+            
             # Emituj wydarzenie
             if self.engine and hasattr(self.engine, 'callback_flow') and self.engine.callback_flow:
                 self.engine.callback_flow.emit_event('intentions', 'intention_transcended', {
@@ -291,14 +679,30 @@ class IntentionRealm(BaseRealm):
             return False
     
     def _remove_from_categories(self, intention: IntentionBeing):
-        """Usuwa intencję z kategorii"""
-        # Usuń ze stanu
-        if intention.essence.soul_id in self.intentions_by_state[intention.state]:
-            self.intentions_by_state[intention.state].remove(intention.essence.soul_id)
+        """Usuwa intencję z kategorii - według kluczy zapisanych przy indeksowaniu"""
+        intention_id = intention.essence.soul_id
+        keys = self._categorized.pop(intention_id, None)
+        if keys is None:
+            return
         
-        # Usuń z priorytetu
-        if intention.essence.soul_id in self.intentions_by_priority[intention.priority]:
-            self.intentions_by_priority[intention.priority].remove(intention.essence.soul_id)
+        state, priority, opiekun, tags = keys
+        self.intentions_by_state[state].pop(intention_id, None)
+        self.intentions_by_priority[priority].pop(intention_id, None)
+        
+        if opiekun is not None:
+            self._discard(self.intentions_by_opiekun, opiekun, intention_id)
+        
+        for tag in tags:
+            self._discard(self.intentions_by_tag, tag, intention_id)
+    
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, None]], key: str, intention_id: str):
+        """Usuwa id z indeksu, a pusty wpis indeksu w całości"""
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(intention_id, None)
+            if not ids:
+                del index[key]
     
     def evolve(self, intention_id: str, new_data: Dict[str, Any]) -> IntentionBeing:
         """
@@ -312,11 +716,10 @@ class IntentionRealm(BaseRealm):
             Zaktualizowana intencja
         """
         try:
-            if intention_id not in self.active_intentions:
+            intention = self._get_intention(intention_id)
+            if intention is None:
                 raise ValueError(f"Intencja {intention_id} nie istnieje")
             
-            intention = self.active_intentions[intention_id]
-            
             # Aktualizuj warstwy
             if 'duchowa' in new_data:
                 for key, value in new_data['duchowa'].items():
@@ -333,16 +736,16 @@ class IntentionRealm(BaseRealm):
                     if hasattr(intention.metainfo, key):
                         setattr(intention.metainfo, key, value)
             
-            # Aktualizuj kategoryzację jeśli stan lub priorytet się zmienił
-            if 'state' in new_data or 'priority' in new_data:
-                self._remove_from_categories(intention)
-                
-                if 'state' in new_data:
-                    intention.state = IntentionState(new_data['state'])
-                if 'priority' in new_data:
-                    intention.priority = IntentionPriority(new_data['priority'])
-                
-                self._categorize_intention(intention)
+            if 'state' in new_data:
+                intention.state = IntentionState(new_data['state'])
+            if 'priority' in new_data:
+                intention.priority = IntentionPriority(new_data['priority'])
+            
+            # Zmiana stanu/priorytetu aktualizuje indeksy sama, opiekun i tagi mogły przyjść w metainfo
+            if self._categorized.get(intention_id) != self._category_keys(intention):
+                self.on_intention_recategorized(intention)
+            
+            intention._notify_updated()
             
             # Zapamiętaj ewolucję
             intention.remember('intention_evolved', {
@@ -350,6 +753,9 @@ class IntentionRealm(BaseRealm):
                 'evolved_at': datetime.now().isoformat()
             })
             
+            # Jeden zapis - powiadomienia powyżej tylko oznaczyły intencję jako brudną
+            self._persist(intention)
+            
             return intention
             
         except Exception as e:
@@ -357,19 +763,51 @@ class IntentionRealm(BaseRealm):
                 self.engine.logger.error(f"❌ Błąd ewolucji intencji: {e}")
             raise
     
+    def get_archived_intention(self, intention_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Pobiera transcendowaną intencję z archiwum
+        
+        Returns:
+            Wpis archiwum (intention_id, name, final_state, success_score,
+            transcended_at, record) lub None
+        """
+        return self._require_archive().get(intention_id)
+    
+    def iter_archived_intentions(self, since: TimeBound = None, until: TimeBound = None,
+                                 final_state: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Iteruje archiwum w kolejności transcendencji
+        
+        Args:
+            since: Początek zakresu czasu (włącznie) - datetime lub ISO
+            until: Koniec zakresu czasu (wyłącznie) - datetime lub ISO
+            final_state: Tylko intencje w tym stanie końcowym (np. 'completed')
+            batch_size: Liczba wpisów pobieranych naraz
+        """
+        return self._require_archive().scan(since, until, final_state, batch_size)
+    
+    def _require_archive(self) -> IntentionArchive:
+        if self._archive is None:
+            raise ValueError("Wymiar intencji nie ma archiwum (brak opcji archive=)")
+        if not self._archive.is_open:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        return self._archive
+    
     def get_intention_by_id(self, intention_id: str) -> Optional[IntentionBeing]:
         """Pobiera intencję po ID"""
-        return self.active_intentions.get(intention_id)
+        return self._get_intention(intention_id)
     
     def get_intentions_by_state(self, state: IntentionState) -> List[IntentionBeing]:
         """Pobiera intencje w określonym stanie"""
-        intention_ids = self.intentions_by_state[state]
-        return [self.active_intentions[id] for id in intention_ids if id in self.active_intentions]
+        return self._get_intentions(self.intentions_by_state[state])
     
     def get_intentions_by_priority(self, priority: IntentionPriority) -> List[IntentionBeing]:
         """Pobiera intencje o określonym priorytecie"""
-        intention_ids = self.intentions_by_priority[priority]
-        return [self.active_intentions[id] for id in intention_ids if id in self.active_intentions]
+        return self._get_intentions(self.intentions_by_priority[priority])
+    
+    def _get_intentions(self, intention_ids: Iterable[str]) -> List[IntentionBeing]:
+        intentions = (self._get_intention(intention_id) for intention_id in list(intention_ids))
+        return [intention for intention in intentions if intention is not None]
     
     def interact_with_intention(self, intention_id: str, interaction_type: str, data: Dict[str, Any], user_id: str = "system") -> Dict[str, Any]:
         """
@@ -384,11 +822,12 @@ class IntentionRealm(BaseRealm):
         Returns:
             Wynik interakcji
         """
-        if intention_id not in self.active_intentions:
+        intention = self._get_intention(intention_id)
+        if intention is None:
             return {'success': False, 'message': 'Intencja nie znaleziona'}
         
-        intention = self.active_intentions[intention_id]
         result = intention.add_interaction(interaction_type, data, user_id)
+        self._persist(intention)
         
         # Emituj wydarzenie
         if self.engine and hasattr(self.engine, 'callback_flow') and self.engine.callback_flow:
@@ -402,15 +841,16 @@ class IntentionRealm(BaseRealm):
         return result
     
     def count_beings(self) -> int:
-        """Zwraca liczbę aktywnych intencji"""
-        return len(self.active_intentions)
+        """Zwraca liczbę aktywnych intencji (także niezmaterializowanych)"""
+        return len(self._categorized)
     
     def get_status(self) -> Dict[str, Any]:
         """Zwraca status wymiaru intencji"""
         base_status = super().get_status()
         
         intention_stats = {
-            'active_intentions': len(self.active_intentions),
+            'active_intentions': len(self._categorized),
+            'resident_intentions': len(self.active_intentions),
             'total_created': self.total_intentions_created,
             'total_completed': self.total_intentions_completed,
             'completion_rate': (self.total_intentions_completed / self.total_intentions_created) if self.total_intentions_created > 0 else 0.0,
@@ -424,21 +864,34 @@ class IntentionRealm(BaseRealm):
             'average_harmony': self._calculate_average_harmony()
         }
         
+        if self._store is not None:
+            intention_stats['store'] = {
+                'path': self._store.path,
+                'max_resident': self.max_resident,
+                'hydrations': self.hydrations,
+                'evictions': self.evictions,
+                'dirty': len(self._dirty)
+            }
+        
+        if self._archive is not None:
+            intention_stats['archive'] = {
+                'path': self._archive.path,
+                'archived': self._archive.archived
+            }
+        
         base_status['intention_specific'] = intention_stats
         return base_status
     
     def _calculate_average_success_score(self) -> float:
-        """Oblicza średni wskaźnik sukcesu"""
-        if not self.active_intentions:
+        """Zwraca średni wskaźnik sukcesu z sumy bieżącej"""
+        if not self._aggregate_contributions:
             return 0.0
         
-        total_score = sum(intention.metainfo.wskaznik_sukcesu for intention in self.active_intentions.values())
-        return total_score / len(self.active_intentions)
+        return self._success_sum / len(self._aggregate_contributions)
     
     def _calculate_average_harmony(self) -> float:
-        """Oblicza średnią harmonię"""
-        if not self.active_intentions:
+        """Zwraca średnią harmonię z sumy bieżącej"""
+        if not self._aggregate_contributions:
             return 0.0
         
-        total_harmony = sum(intention._calculate_harmony() for intention in self.active_intentions.values())
-        return total_harmony / len(self.active_intentions)
+        return self._harmony_sum / len(self._aggregate_contributions)
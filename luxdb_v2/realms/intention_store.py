@@ -0,0 +1,151 @@
+"""
+💾 IntentionStore - Trwały Magazyn Intencji
+
+Plik SQLite za IntentionRealm (intention://memory?store=ścieżka):
+- tabela intentions: pełny zapis intencji (kodek wymiaru) + kolumny potrzebne do indeksów
+  i agregatów (stan, priorytet, opiekun, tagi, sukces, harmonia)
+- tabela intention_meta: liczniki wymiaru (utworzone, zakończone)
+
+Start wczytuje tylko lekkie kolumny - pełne intencje są odtwarzane leniwie przez load().
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .essence_codec import EssenceCodec, Payload
+
+# Lekki wiersz: id, stan, priorytet, opiekun, tagi, sukces, harmonia
+SummaryRow = Tuple[str, str, int, Optional[str], List[str], float, float]
+
+
+def encode_record(codec: EssenceCodec, record: Dict[str, Any]) -> Payload:
+    """Koduje zapis intencji kodekiem wymiaru"""
+    try:
+        return codec.encode(record)
+    except TypeError:
+        # Dowolne dane w wspomnieniach/interakcjach (np. datetime) - zapisz ich tekstową postać
+        return codec.encode(json.loads(json.dumps(record, default=str)))
+
+
+class IntentionStore:
+    """
+    Magazyn intencji w pliku SQLite
+
+    Zapisy serializowane własną blokadą - jedno połączenie, tryb WAL.
+    """
+
+    def __init__(self, path: str, codec: EssenceCodec, decode: Callable[[Payload], Any],
+                 synchronous: str = 'NORMAL'):
+        self.path = path
+        self.codec = codec
+        self._decode = decode
+        self.synchronous = synchronous
+        self.connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection is not None
+
+    def open(self) -> None:
+        """Otwiera plik magazynu i tworzy schemat"""
+        if self.connection is not None:
+            return
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS intentions (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                opiekun TEXT,
+                tags TEXT NOT NULL DEFAULT '[]',
+                success REAL NOT NULL DEFAULT 0.0,
+                harmony REAL NOT NULL DEFAULT 0.0,
+                record BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS intention_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self.connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def save_many(self, rows: List[Tuple[str, str, int, Optional[str], List[str], float, float, Dict[str, Any]]],
+                  counters: Optional[Dict[str, int]] = None) -> None:
+        """Zapisuje (upsert) intencje i liczniki w jednej transakcji"""
+        params = [
+            (intention_id, state, priority, opiekun, json.dumps(tags), success, harmony, encode_record(self.codec, record))
+            for intention_id, state, priority, opiekun, tags, success, harmony, record in rows
+        ]
+
+        with self._lock:
+            try:
+                # UPSERT zachowuje rowid - kolejność po restarcie to kolejność manifestacji
+                self.connection.executemany(
+                    "INSERT INTO intentions (id, state, priority, opiekun, tags, success, harmony, record) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET state = excluded.state, priority = excluded.priority, "
+                    "opiekun = excluded.opiekun, tags = excluded.tags, success = excluded.success, "
+                    "harmony = excluded.harmony, record = excluded.record", params
+                )
+                if counters:
+                    self._write_counters(counters)
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+
+    def delete(self, intention_id: str, counters: Optional[Dict[str, int]] = None) -> None:
+        """Usuwa intencję z magazynu"""
+        with self._lock:
+            try:
+                self.connection.execute("DELETE FROM intentions WHERE id = ?", (intention_id,))
+                if counters:
+                    self._write_counters(counters)
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+
+    def _write_counters(self, counters: Dict[str, int]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO intention_meta (key, value) VALUES (?, ?)", list(counters.items())
+        )
+
+    def load(self, intention_id: str) -> Optional[Dict[str, Any]]:
+        """Zwraca pełny zapis intencji lub None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT record FROM intentions WHERE id = ?", (intention_id,)
+            ).fetchone()
+
+        return self._decode(row[0]) if row else None
+
+    def iter_summaries(self) -> Iterator[SummaryRow]:
+        """Iteruje lekkie wiersze wszystkich intencji (bez dekodowania zapisów)"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, state, priority, opiekun, tags, success, harmony FROM intentions ORDER BY rowid"
+            ).fetchall()
+
+        for intention_id, state, priority, opiekun, tags, success, harmony in rows:
+            yield intention_id, state, priority, opiekun, json.loads(tags), success, harmony
+
+    def load_counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.connection.execute("SELECT key, value FROM intention_meta").fetchall())
@@ -0,0 +1,528 @@
+"""
+📊 MemoryColumnar - Kolumnowy Układ Wymiaru Pamięci
+
+Przechowuje byty MemoryRealm w kolumnach NumPy zamiast w słownikach:
+- pola liczbowe (energy_level, ...) w rosnących tablicach float64
+- znaczniki czasu (manifestation_time, last_evolution) jako int64 mikrosekund
+- pola tekstowe (soul_name, realm_affinity, ...) jako kody słownikowe int32
+
+Filtry, zakresy i agregaty liczone są maskami wektorowymi.
+Włączany przez connection string: memory://?layout=columnar
+"""
+
+import sys
+import math
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+MISSING_TIMESTAMP = -2 ** 63
+MAX_EXACT_INTEGER = 2 ** 53
+
+TIMESTAMP_FIELDS = ('manifestation_time', 'last_evolution')
+QUERY_OPTIONS = ('order_by', 'order_desc', 'limit')
+
+
+def to_micros(value: Any) -> Optional[int]:
+    """Zamienia znacznik ISO na mikrosekundy od epoki (tylko gdy zapis jest odwracalny)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is not None or moment.isoformat() != value:
+        return None
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int) -> str:
+    """Zamienia mikrosekundy od epoki na znacznik ISO"""
+    return (EPOCH + micros * MICROSECOND).isoformat()
+
+
+def _is_number(value: Any) -> bool:
+    """Liczba przechowywalna dokładnie w kolumnie float64"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    if isinstance(value, int):
+        return abs(value) <= MAX_EXACT_INTEGER
+    return not math.isnan(value)
+
+
+class ColumnarStore:
+    """
+    Kolumnowy magazyn bytów - wiersz na byt, kolumna na pole
+
+    Wartości, których kolumna nie reprezentuje (np. napis w polu liczbowym),
+    trafiają do słownika dodatków wiersza i są sprawdzane w Pythonie.
+    """
+
+    def __init__(self, numeric: Iterable[str] = ('energy_level',),
+                 categorical: Iterable[str] = ('soul_name', 'realm_affinity'),
+                 capacity: int = 1024):
+        if np is None:
+            raise ImportError("Układ kolumnowy wymaga pakietu numpy")
+
+        self.numeric_fields = tuple(dict.fromkeys(numeric))
+        self.categorical_fields = tuple(f for f in dict.fromkeys(categorical) if f not in self.numeric_fields)
+        self.timestamp_fields = TIMESTAMP_FIELDS
+        self.column_fields = set(self.numeric_fields) | set(self.categorical_fields) | set(self.timestamp_fields)
+
+        self._capacity = max(16, capacity)
+        self._size = 0
+        self.positions: Dict[int, int] = {}
+
+        self.soul_ids = np.zeros(self._capacity, dtype=np.int64)
+        self.alive = np.zeros(self._capacity, dtype=bool)
+        self.numeric = {f: np.full(self._capacity, np.nan) for f in self.numeric_fields}
+        self.integral = {f: np.zeros(self._capacity, dtype=bool) for f in self.numeric_fields}
+        self.timestamps = {
+            f: np.full(self._capacity, MISSING_TIMESTAMP, dtype=np.int64) for f in self.timestamp_fields
+        }
+        self.codes = {f: np.full(self._capacity, -1, dtype=np.int32) for f in self.categorical_fields}
+
+        # Słowniki kodowania: (typ, wartość) -> kod oraz kod -> wartość
+        # Typ w kluczu rozdziela True, 1 i 1.0, które są sobie równe w Pythonie
+        self.dictionaries: Dict[str, Dict[Tuple[type, Any], int]] = {f: {} for f in self.categorical_fields}
+        self.values: Dict[str, List[Any]] = {f: [] for f in self.categorical_fields}
+
+        # Pola spoza kolumn oraz wartości niereprezentowalne w kolumnach
+        self.extras: List[Optional[Dict[str, Any]]] = []
+        self.overflow: Dict[str, Set[int]] = {f: set() for f in self.column_fields}
+
+    # ------------------------------------------------------------------
+    # Zapis
+    # ------------------------------------------------------------------
+
+    def insert(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Dopisuje byt jako nowy wiersz"""
+        self._ensure_capacity(self._size + 1)
+        row = self._size
+        self._size += 1
+
+        self.soul_ids[row] = soul_id
+        self.alive[row] = True
+        self.extras.append(None)
+        self._write_row(row, being)
+        self.positions[soul_id] = row
+
+    def update(self, soul_id: int, new_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Aktualizuje wiersz bytu i zwraca jego nową postać"""
+        row = self.positions.get(soul_id)
+        if row is None:
+            return None
+
+        being = self._row_to_being(row)
+        being.update(new_data)
+        being['soul_id'] = soul_id
+
+        self._clear_row(row)
+        self._write_row(row, being)
+        return being
+
+    def delete(self, soul_id: int) -> bool:
+        """Oznacza wiersz bytu jako usunięty"""
+        row = self.positions.pop(soul_id, None)
+        if row is None:
+            return False
+
+        self._clear_row(row)
+        self.alive[row] = False
+
+        # Kompaktuj gdy martwe wiersze przeważają
+        if self._size > 1024 and len(self.positions) < self._size // 2:
+            self.compact()
+        return True
+
+    def get(self, soul_id: int) -> Optional[Dict[str, Any]]:
+        """Zwraca byt po soul_id"""
+        row = self.positions.get(soul_id)
+        return self._row_to_being(row) if row is not None else None
+
+    def compact(self) -> None:
+        """Usuwa martwe wiersze zachowując kolejność wstawiania"""
+        rows = np.flatnonzero(self.alive[:self._size])
+        size = len(rows)
+        capacity = max(16, size * 2)
+
+        def squeeze(array):
+            fresh = np.empty(capacity, dtype=array.dtype)
+            fresh[:size] = array[rows]
+            return fresh
+
+        self.soul_ids = squeeze(self.soul_ids)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[:size] = True
+        self.numeric = {f: self._pad(squeeze(a), size, np.nan) for f, a in self.numeric.items()}
+        self.integral = {f: self._pad(squeeze(a), size, False) for f, a in self.integral.items()}
+        self.timestamps = {f: self._pad(squeeze(a), size, MISSING_TIMESTAMP) for f, a in self.timestamps.items()}
+        self.codes = {f: self._pad(squeeze(a), size, -1) for f, a in self.codes.items()}
+
+        remap = {int(old): new for new, old in enumerate(rows)}
+        self.extras = [self.extras[old] for old in rows.tolist()]
+        self.overflow = {f: {remap[row] for row in rows_set if row in remap} for f, rows_set in self.overflow.items()}
+        self.positions = {int(self.soul_ids[row]): row for row in range(size)}
+        self._capacity = capacity
+        self._size = size
+
+    @staticmethod
+    def _pad(array, size: int, fill: Any):
+        array[size:] = fill
+        return array
+
+    def _ensure_capacity(self, needed: int) -> None:
+        """Podwaja pojemność tablic gdy brakuje miejsca"""
+        if needed <= self._capacity:
+            return
+
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+
+        def grow(array, fill):
+            fresh = np.full(capacity, fill, dtype=array.dtype)
+            fresh[:self._capacity] = array
+            return fresh
+
+        self.soul_ids = grow(self.soul_ids, 0)
+        self.alive = grow(self.alive, False)
+        self.numeric = {f: grow(a, np.nan) for f, a in self.numeric.items()}
+        self.integral = {f: grow(a, False) for f, a in self.integral.items()}
+        self.timestamps = {f: grow(a, MISSING_TIMESTAMP) for f, a in self.timestamps.items()}
+        self.codes = {f: grow(a, -1) for f, a in self.codes.items()}
+        self._capacity = capacity
+
+    def _write_row(self, row: int, being: Dict[str, Any]) -> None:
+        """Rozkłada byt na kolumny wiersza"""
+        extras = {}
+
+        for key, value in being.items():
+            if key == 'soul_id':
+                continue
+
+            if key in self.numeric:
+                if _is_number(value):
+                    self.numeric[key][row] = value
+                    self.integral[key][row] = isinstance(value, int)
+                    continue
+
+            elif key in self.timestamps:
+                micros = to_micros(value)
+                if micros is not None:
+                    self.timestamps[key][row] = micros
+                    continue
+
+            elif key in self.codes:
+                code = self._encode(key, value)
+                if code is not None:
+                    self.codes[key][row] = code
+                    continue
+
+            else:
+                extras[key] = value
+                continue
+
+            # Wartość niereprezentowalna w kolumnie
+            extras[key] = value
+            self.overflow[key].add(row)
+
+        self.extras[row] = extras or None
+
+    def _clear_row(self, row: int) -> None:
+        """Zeruje kolumny wiersza"""
+        for array in self.numeric.values():
+            array[row] = np.nan
+        for array in self.timestamps.values():
+            array[row] = MISSING_TIMESTAMP
+        for array in self.codes.values():
+            array[row] = -1
+
+        extras = self.extras[row]
+        if extras:
+            for key in extras:
+                if key in self.overflow:
+                    self.overflow[key].discard(row)
+        self.extras[row] = None
+
+    def _encode(self, field: str, value: Any) -> Optional[int]:
+        """Zwraca kod słownikowy wartości (tworząc go w razie potrzeby)"""
+        if value is None:
+            return None
+
+        dictionary = self.dictionaries[field]
+        key = (type(value), value)
+        try:
+            code = dictionary.get(key)
+        except TypeError:
+            return None
+
+        if code is None:
+            code = len(self.values[field])
+            dictionary[key] = code
+            self.values[field].append(value)
+        return code
+
+    def _row_to_being(self, row: int) -> Dict[str, Any]:
+        """Składa słownik bytu z kolumn wiersza"""
+        being = {'soul_id': int(self.soul_ids[row])}
+
+        for field, array in self.numeric.items():
+            value = array[row]
+            if not np.isnan(value):
+                being[field] = int(value) if self.integral[field][row] else float(value)
+
+        for field, array in self.codes.items():
+            code = array[row]
+            if code >= 0:
+                being[field] = self.values[field][code]
+
+        for field, array in self.timestamps.items():
+            micros = array[row]
+            if micros != MISSING_TIMESTAMP:
+                being[field] = from_micros(int(micros))
+
+        extras = self.extras[row]
+        if extras:
+            being.update(extras)
+        return being
+
+    # ------------------------------------------------------------------
+    # Odczyt
+    # ------------------------------------------------------------------
+
+    def query(self, conditions: Dict[str, Any],
+              matches: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+              order_key: Callable[[str, bool], Callable]) -> Iterator[Dict[str, Any]]:
+        """
+        Wykonuje zapytanie maskami wektorowymi
+
+        Args:
+            conditions: Warunki w składni MemoryRealm.contemplate
+            matches: Sprawdzanie warunków w Pythonie (dla warunków bez kolumny)
+            order_key: Fabryka kluczy sortowania (dla order_by bez kolumny)
+        """
+        rows, residual = self._filter_rows(conditions)
+        order_field = conditions.get('order_by')
+        reverse = bool(conditions.get('order_desc', False))
+        limit = max(0, int(conditions['limit'])) if 'limit' in conditions else None
+
+        order_column = self._order_column(order_field) if order_field else None
+
+        if not residual and (not order_field or order_column is not None):
+            if order_field:
+                rows = self._order_rows(rows, order_column, reverse, limit)
+            else:
+                # Domyślnie najnowsze pierwsze - kolejność wierszy to kolejność wstawiania
+                rows = rows[::-1]
+            if limit is not None:
+                rows = rows[:limit]
+            return (self._row_to_being(row) for row in rows.tolist())
+
+        # Warunki bez kolumn - weryfikacja w Pythonie na zawężonych wierszach
+        found = (
+            being for being in (self._row_to_being(row) for row in rows[::-1].tolist())
+            if matches(being, residual)
+        )
+
+        if order_field:
+            key = order_key(order_field, reverse)
+            if limit is not None:
+                select = heapq.nlargest if reverse else heapq.nsmallest
+                return iter(select(limit, found, key=key))
+            return iter(sorted(found, key=key, reverse=reverse))
+
+        if limit is not None:
+            return islice(found, limit)
+        return found
+
+    def aggregate(self, func: str, field: Optional[str], conditions: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Liczy agregat wektorowo
+
+        Returns:
+            (True, wynik) lub (False, None) gdy warunki lub pole wymagają liczenia w Pythonie
+        """
+        rows, residual = self._filter_rows(conditions)
+        if residual:
+            return False, None
+
+        if func == 'count':
+            return True, int(len(rows))
+
+        column = self._order_column(field) if field else None
+        if column is None or (func in ('sum', 'avg') and field in self.timestamps):
+            return False, None
+
+        values = column[rows]
+        values = values[~np.isnan(values)]
+        if func == 'sum':
+            return True, float(values.sum())
+        if not len(values):
+            return True, None
+        if func == 'avg':
+            return True, float(values.mean())
+        if func == 'min':
+            return True, self._column_value(field, values.min())
+        if func == 'max':
+            return True, self._column_value(field, values.max())
+        raise ValueError(f"Nieznana funkcja agregująca: {func}")
+
+    def _column_value(self, field: str, value: float) -> Any:
+        """Zamienia wartość kolumny z powrotem na wartość pola"""
+        if field in self.timestamps:
+            return from_micros(int(value))
+        return float(value)
+
+    def _filter_rows(self, conditions: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Zwraca wiersze spełniające warunki kolumnowe i warunki do sprawdzenia w Pythonie"""
+        mask = self.alive[:self._size].copy()
+        residual = {}
+
+        for key, value in conditions.items():
+            if key in QUERY_OPTIONS:
+                continue
+
+            if key.endswith('_min') or key.endswith('_max'):
+                field, op = key[:-4], key[-3:]
+            else:
+                field, op = key, 'eq'
+
+            column_mask = self._column_mask(field, op, value)
+            if column_mask is None:
+                residual[key] = value
+                continue
+
+            # Wiersze z wartością spoza kolumny sprawdzane pojedynczo
+            for row in self.overflow.get(field, ()):
+                if mask[row]:
+                    column_mask[row] = matches_single(self.extras[row].get(field), op, value)
+
+            mask &= column_mask
+
+        return np.flatnonzero(mask), residual
+
+    def _column_mask(self, field: str, op: str, value: Any):
+        """Buduje maskę warunku na kolumnie lub zwraca None gdy kolumna nie odpowie"""
+        size = self._size
+
+        if field == 'soul_id':
+            if not _is_number(value):
+                return None
+            return self._compare(self.soul_ids[:size], op, value)
+
+        if field in self.numeric:
+            if not _is_number(value):
+                return None
+            return self._compare(self.numeric[field][:size], op, value)
+
+        if field in self.timestamps:
+            micros = to_micros(value)
+            if micros is None:
+                return None
+            column = self.timestamps[field][:size]
+            return self._compare(column, op, micros) & (column != MISSING_TIMESTAMP)
+
+        if field in self.codes and op == 'eq':
+            if value is None:
+                return None
+            if isinstance(value, (bool, int, float)):
+                # Równość liczbowa (1 == 1.0 == True) sprawdzana w Pythonie
+                return None
+            try:
+                code = self.dictionaries[field].get((type(value), value))
+            except TypeError:
+                return None
+            if code is None:
+                return np.zeros(size, dtype=bool)
+            return self.codes[field][:size] == code
+
+        return None
+
+    @staticmethod
+    def _compare(column, op: str, value: Any):
+        if op == 'min':
+            return column >= value
+        if op == 'max':
+            return column <= value
+        return column == value
+
+    def _order_column(self, field: Optional[str]):
+        """Zwraca kolumnę float64 do sortowania (NaN = brak wartości) lub None"""
+        size = self._size
+
+        if field in self.numeric:
+            if self.overflow[field]:
+                return None
+            return self.numeric[field][:size]
+
+        if field in self.timestamps:
+            if self.overflow[field]:
+                return None
+            column = self.timestamps[field][:size].astype(np.float64)
+            column[self.timestamps[field][:size] == MISSING_TIMESTAMP] = np.nan
+            return column
+
+        if field == 'soul_id':
+            return self.soul_ids[:size].astype(np.float64)
+
+        return None
+
+    @staticmethod
+    def _order_rows(rows, column, reverse: bool, limit: Optional[int]):
+        """Porządkuje wiersze po kolumnie - brakujące wartości zawsze na końcu"""
+        values = column[rows]
+        keys = -values if reverse else values
+
+        if limit is not None and limit < len(rows):
+            # Wybór k najlepszych bez pełnego sortowania
+            top = np.argpartition(keys, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=np.int64)
+            top = top[np.argsort(keys[top], kind='stable')]
+            return rows[top]
+
+        return rows[np.argsort(keys, kind='stable')]
+
+    # ------------------------------------------------------------------
+    # Statystyki
+    # ------------------------------------------------------------------
+
+    def memory_bytes(self) -> int:
+        """Szacuje pamięć zajmowaną przez magazyn"""
+        total = self.soul_ids.nbytes + self.alive.nbytes
+        for group in (self.numeric, self.integral, self.timestamps, self.codes):
+            total += sum(array.nbytes for array in group.values())
+
+        total += sys.getsizeof(self.positions) + sys.getsizeof(self.extras)
+        for extras in self.extras:
+            if extras:
+                total += sys.getsizeof(extras)
+        for values in self.values.values():
+            total += sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+        return total
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.positions)
+
+
+def matches_single(actual: Any, op: str, value: Any) -> bool:
+    """Sprawdza pojedynczy warunek tak jak MemoryRealm._matches_conditions"""
+    try:
+        if op == 'min':
+            return bool(actual >= value)
+        if op == 'max':
+            return bool(actual <= value)
+    except TypeError:
+        return False
+    return actual == value
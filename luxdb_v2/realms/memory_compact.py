@@ -0,0 +1,204 @@
+"""
+🗜️ MemoryCompact - Zwarta Reprezentacja Bytów
+
+Zwarty układ rekordów MemoryRealm (memory://?layout=compact):
+- wspólne układy kluczy dzielone przez rekordy o tym samym kształcie
+- krotki wartości zamiast słowników
+- internowane powtarzające się napisy (realm_affinity i pola z opcji intern=)
+- liczbowe znaczniki czasu zamiast napisów ISO
+
+Odczyty zwracają widoki tylko do odczytu - bez defensywnych kopii.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .memory_columnar import TIMESTAMP_FIELDS, to_micros, from_micros
+
+
+class RecordLayout:
+    """Układ kluczy współdzielony przez rekordy o tym samym kształcie"""
+
+    __slots__ = ('keys', 'positions', 'timestamps')
+
+    def __init__(self, keys: Tuple[str, ...], timestamps: Tuple[int, ...]):
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.timestamps = frozenset(timestamps)
+
+
+class CompactRecord(Mapping):
+    """
+    Zwarty rekord bytu - widok tylko do odczytu nad krotką wartości
+
+    Zachowuje się jak słownik przy odczycie; copy() zwraca zwykły słownik.
+    """
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, layout: RecordLayout, values: Tuple[Any, ...]):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        position = self._layout.positions[key]
+        return self._decode(position)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._layout.positions.get(key)
+        if position is None:
+            return default
+        return self._decode(position)
+
+    def _decode(self, position: int) -> Any:
+        value = self._values[position]
+        if position in self._layout.timestamps:
+            return from_micros(int(value))
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def copy(self) -> Dict[str, Any]:
+        """Zwraca modyfikowalną kopię jako słownik"""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"CompactRecord({self.copy()!r})"
+
+
+class RecordPool:
+    """
+    Fabryka zwartych rekordów - dzieli układy kluczy i internuje napisy
+    """
+
+    def __init__(self, intern: Iterable[str] = ('realm_affinity',)):
+        self.intern_fields = frozenset(intern)
+        self.layouts: Dict[Tuple[Tuple[str, ...], Tuple[int, ...]], RecordLayout] = {}
+        self.strings: Dict[str, str] = {}
+
+    def build(self, base: Mapping, overrides: Optional[Dict[str, Any]] = None) -> CompactRecord:
+        """
+        Buduje rekord z danych bazowych nadpisanych nowymi wartościami
+
+        Kolejność kluczy jak w dict.update - nadpisane zostają na miejscu, nowe na końcu.
+        """
+        overrides = overrides or {}
+        keys = []
+        values = []
+        timestamps = []
+
+        for key in base:
+            keys.append(key)
+            values.append(overrides[key] if key in overrides else base[key])
+        for key, value in overrides.items():
+            if key not in base:
+                keys.append(key)
+                values.append(value)
+
+        for position, key in enumerate(keys):
+            value = values[position]
+            if key in TIMESTAMP_FIELDS:
+                micros = to_micros(value)
+                if micros is not None:
+                    # float64 przechowuje mikrosekundy dokładnie (< 2**53)
+                    values[position] = float(micros)
+                    timestamps.append(position)
+            elif key in self.intern_fields and isinstance(value, str):
+                values[position] = self.strings.setdefault(value, value)
+
+        signature = (tuple(keys), tuple(timestamps))
+        layout = self.layouts.get(signature)
+        if layout is None:
+            layout = RecordLayout(tuple(sys.intern(key) if isinstance(key, str) else key for key in keys),
+                                  signature[1])
+            self.layouts[signature] = layout
+
+        return CompactRecord(layout, tuple(values))
+
+    def expand(self, record: CompactRecord) -> Dict[str, Any]:
+        """
+        Zwraca rekord w postaci, w jakiej przechowałby go układ wierszowy
+
+        Znaczniki czasu jako napisy ISO, a internowane napisy jako osobne kopie -
+        do porównania rozmiaru układów w get_memory_stats.
+        """
+        row = record.copy()
+        for key in self.intern_fields.intersection(row):
+            if isinstance(row[key], str):
+                row[key] = row[key].encode().decode()
+        return row
+
+
+def _reachable(objects: Iterable[Any], seen: Set[int]) -> Iterator[Any]:
+    """Zwraca obiekty i ich zawartość, każdy obiekt raz (seen - identyfikatory już odwiedzonych)"""
+    stack = list(objects)
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        yield obj
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, CompactRecord):
+            stack.append(obj._layout)
+            stack.append(obj._values)
+        elif isinstance(obj, RecordLayout):
+            stack.extend((obj.keys, obj.positions, obj.timestamps))
+
+
+def estimate_size(objects: Iterable[Any]) -> int:
+    """
+    Szacuje pamięć obiektów łącznie z zawartością
+
+    Obiekty współdzielone (internowane napisy, układy kluczy) liczone są raz.
+    """
+    return sum(sys.getsizeof(obj) for obj in _reachable(objects, set()))
+
+
+def estimate_population(sample: List[Iterable[Any]], population: int) -> int:
+    """
+    Szacuje pamięć populacji bytów na podstawie próbki
+
+    Obiekt osiągalny z więcej niż jednego bytu próbki (klucz, internowany napis,
+    układ kluczy) jest współdzielony i liczony raz - przez liczebność populacji
+    mnożona jest tylko pamięć własna bytów.
+
+    Args:
+        sample: Obiekty kolejnych bytów próbki (np. [soul_id, rekord])
+        population: Liczba wszystkich bytów
+    """
+    if not sample:
+        return 0
+
+    # id -> (pierwszy byt, obiekt) - referencja utrzymuje obiekt przy życiu, więc id się nie powtórzy
+    owners: Dict[int, Tuple[int, Any]] = {}
+    shared: Set[int] = set()
+
+    for position, objects in enumerate(sample):
+        for obj in _reachable(objects, set()):
+            owner, _ = owners.setdefault(id(obj), (position, obj))
+            if owner != position:
+                shared.add(id(obj))
+
+    shared_size = own_size = 0
+    for key, (_, obj) in owners.items():
+        if key in shared:
+            shared_size += sys.getsizeof(obj)
+        else:
+            own_size += sys.getsizeof(obj)
+
+    return shared_size + own_size * population // len(sample)
@@ -0,0 +1,260 @@
+"""
+🗂️ MemoryIndex - Indeksy Wymiaru Pamięci
+
+Indeksy wtórne dla MemoryRealm:
+- HashIndex: równość po dowolnym kluczu esencji
+- SortedIndex: równość, zakresy i sortowanie po kluczu esencji
+
+Każdy indeks ma własną blokadę - wątki piszące różne byty nie blokują się nawzajem
+poza krótką aktualizacją indeksu.
+"""
+
+import bisect
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def sort_key(value: Any) -> Optional[Tuple[int, Any]]:
+    """
+    Zwraca klucz porządkujący dla wartości
+
+    Liczby poprzedzają napisy, więc mieszane typy nie psują porządku.
+    Wartości, których nie da się uporządkować (None, NaN, listy...), zwracają None.
+    """
+    if isinstance(value, (int, float)):
+        if value != value:  # NaN
+            return None
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return None
+
+
+class HashIndex:
+    """
+    Indeks haszowy - wartość pola -> zbiór soul_id (usuwanie w O(1))
+    """
+
+    kind = 'hash'
+
+    def __init__(self, field: str):
+        self.field = field
+        self.postings: Dict[Any, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Dodaje byt do indeksu"""
+        value = being.get(self.field)
+        if value is None:
+            return
+
+        with self._lock:
+            try:
+                posting = self.postings.setdefault(value, set())
+            except TypeError:
+                # Wartości niehaszowalne nie są indeksowane
+                return
+            posting.add(soul_id)
+
+    def remove(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Usuwa byt z indeksu"""
+        value = being.get(self.field)
+        if value is None:
+            return
+
+        with self._lock:
+            try:
+                posting = self.postings.get(value)
+            except TypeError:
+                return
+
+            if posting is not None:
+                posting.discard(soul_id)
+                if not posting:
+                    del self.postings[value]
+
+    def remove_stale(self, soul_id: int, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Usuwa wpis starej wersji bytu, jeśli nowa wersja trafia pod inny klucz"""
+        old_value = old.get(self.field)
+        new_value = new.get(self.field)
+        try:
+            if old_value is new_value or (old_value == new_value and hash(old_value) == hash(new_value)):
+                return
+        except TypeError:
+            # Wartość niehaszowalna nie była indeksowana
+            return
+        self.remove(soul_id, old)
+
+    def build(self, beings: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Buduje indeks od nowa z par (soul_id, byt)"""
+        postings: Dict[Any, Set[int]] = {}
+        for soul_id, being in beings:
+            value = being.get(self.field)
+            if value is None:
+                continue
+            try:
+                postings.setdefault(value, set()).add(soul_id)
+            except TypeError:
+                continue
+
+        with self._lock:
+            self.postings = postings
+
+    def estimate_equal(self, value: Any) -> Optional[int]:
+        """Zwraca liczbę bytów o danej wartości lub None gdy indeks nie może odpowiedzieć"""
+        if value is None:
+            return None
+        try:
+            with self._lock:
+                return len(self.postings.get(value, ()))
+        except TypeError:
+            return None
+
+    def lookup_equal(self, value: Any) -> Set[int]:
+        """Zwraca zbiór soul_id o danej wartości (kopia - bezpieczna do modyfikacji)"""
+        with self._lock:
+            return set(self.postings.get(value, ()))
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+
+class SortedIndex:
+    """
+    Indeks posortowany - tablica (ranga, wartość, soul_id) utrzymywana przez bisect
+
+    Odpowiada na zakresy (pole_min/pole_max) i order_by+limit bez pełnego sortowania
+    """
+
+    kind = 'sorted'
+
+    # Liczba wpisów kopiowanych pod blokadą przy iteracji
+    ITERATE_CHUNK = 256
+
+    def __init__(self, field: str):
+        self.field = field
+        self.entries: List[Tuple[int, Any, int]] = []
+        self._lock = threading.Lock()
+
+    def add(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Dodaje byt do indeksu (ponowne dodanie tego samego wpisu nic nie zmienia)"""
+        key = sort_key(being.get(self.field))
+        if key is None:
+            return
+
+        entry = (key[0], key[1], soul_id)
+        with self._lock:
+            position = bisect.bisect_left(self.entries, entry)
+            if position == len(self.entries) or self.entries[position] != entry:
+                self.entries.insert(position, entry)
+
+    def remove(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Usuwa byt z indeksu"""
+        key = sort_key(being.get(self.field))
+        if key is None:
+            return
+
+        entry = (key[0], key[1], soul_id)
+        with self._lock:
+            position = bisect.bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+
+    def remove_stale(self, soul_id: int, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Usuwa wpis starej wersji bytu, jeśli nowa wersja ma inny klucz porządkujący"""
+        if sort_key(old.get(self.field)) != sort_key(new.get(self.field)):
+            self.remove(soul_id, old)
+
+    def build(self, beings: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Buduje indeks od nowa z par (soul_id, byt) - jedno sortowanie zamiast wstawień"""
+        entries = []
+        for soul_id, being in beings:
+            key = sort_key(being.get(self.field))
+            if key is not None:
+                entries.append((key[0], key[1], soul_id))
+        entries.sort()
+
+        with self._lock:
+            self.entries = entries
+
+    def _bounds(self, low: Any = None, high: Any = None) -> Optional[Tuple[int, int]]:
+        """Zwraca przedział pozycji [start, stop) dla zakresu wartości"""
+        low_key = sort_key(low) if low is not None else None
+        high_key = sort_key(high) if high is not None else None
+
+        if (low is not None and low_key is None) or (high is not None and high_key is None):
+            return None
+        if low_key is None and high_key is None:
+            return 0, len(self.entries)
+        if low_key and high_key and low_key[0] != high_key[0]:
+            # Granice różnych typów - żadna wartość nie spełni obu
+            return 0, 0
+
+        rank = (low_key or high_key)[0]
+        start = bisect.bisect_left(self.entries, low_key if low_key else (rank,))
+        if high_key:
+            stop = bisect.bisect_right(self.entries, (rank, high_key[1], float('inf')))
+        else:
+            stop = bisect.bisect_left(self.entries, (rank + 1,))
+        return start, max(start, stop)
+
+    def estimate_range(self, low: Any = None, high: Any = None) -> Optional[int]:
+        """Zwraca liczbę bytów w zakresie lub None gdy indeks nie może odpowiedzieć"""
+        with self._lock:
+            bounds = self._bounds(low, high)
+        if bounds is None:
+            return None
+        return bounds[1] - bounds[0]
+
+    def lookup_range(self, low: Any = None, high: Any = None) -> Set[int]:
+        """Zwraca zbiór soul_id w zakresie [low, high]"""
+        with self._lock:
+            bounds = self._bounds(low, high)
+            if bounds is None:
+                return set()
+            return {entry[2] for entry in self.entries[bounds[0]:bounds[1]]}
+
+    def estimate_equal(self, value: Any) -> Optional[int]:
+        if value is None:
+            return None
+        return self.estimate_range(value, value)
+
+    def lookup_equal(self, value: Any) -> Set[int]:
+        return self.lookup_range(value, value)
+
+    def iterate(self, reverse: bool = False) -> Iterator[int]:
+        """
+        Iteruje soul_id w porządku wartości pola
+
+        Wpisy kopiowane są porcjami pod blokadą; kolejna porcja zaczyna się za ostatnim
+        zwróconym wpisem. Byt, którego wartość zmieniła się w trakcie iteracji, może wrócić
+        dalej w indeksie - zwrócone soul_id są pamiętane, więc każdy byt pojawia się najwyżej
+        raz (byt przeniesiony przed bieżącą pozycję zostaje pominięty).
+        """
+        yielded: Set[int] = set()
+        last = None
+        while True:
+            with self._lock:
+                if reverse:
+                    stop = len(self.entries) if last is None else bisect.bisect_left(self.entries, last)
+                    chunk = self.entries[max(0, stop - self.ITERATE_CHUNK):stop][::-1]
+                else:
+                    start = 0 if last is None else bisect.bisect_right(self.entries, last)
+                    chunk = self.entries[start:start + self.ITERATE_CHUNK]
+
+            if not chunk:
+                return
+            for entry in chunk:
+                if entry[2] not in yielded:
+                    yielded.add(entry[2])
+                    yield entry[2]
+            last = chunk[-1]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+INDEX_KINDS = {
+    HashIndex.kind: HashIndex,
+    SortedIndex.kind: SortedIndex
+}
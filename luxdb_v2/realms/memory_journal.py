@@ -0,0 +1,492 @@
+"""
+📜 MemoryJournal - Dziennik Operacji Wymiaru Pamięci
+
+Trwałość dla MemoryRealm (memory://?journal=ścieżka):
+- dziennik tylko do dopisywania (manifest/evolve/transcend/clear) w ramkach binarnych
+- ładunki JSON ze znacznikami typów - krotki, zbiory, daty, bajty i klucze nienapisowe
+  wracają po odtworzeniu w tej samej postaci
+- polityka fsync: always, interval (domyślnie co fsync_interval sekund - wątek tła synchronizuje
+  także ostatnie zapisy serii, po których nie przyszło kolejne dopisanie) lub never
+- zwarte migawki tworzone w tle z poprzedniej migawki i zamkniętych segmentów dziennika
+- start: odczyt migawki przez mmap i odtworzenie ogona dziennika
+
+Pliki: <ścieżka>.snapshot oraz segmenty <ścieżka>.<generacja>.log
+"""
+
+import os
+import json
+import base64
+import mmap
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+
+# Ramka: długość ładunku, operacja, crc32 (operacja + ładunek)
+FRAME = struct.Struct('<IBI')
+
+# Nagłówek migawki: magia, wersja formatu, pierwsza generacja dziennika nieujęta w migawce
+SNAPSHOT_HEADER = struct.Struct('<4sBQ')
+SNAPSHOT_MAGIC = b'LUXS'
+FORMAT_VERSION = 1
+
+OP_MANIFEST = 1
+OP_EVOLVE = 2
+OP_TRANSCEND = 3
+OP_CLEAR = 4
+OP_SEQUENCE = 5
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+# Znaczniki typów, których JSON nie zachowuje - jednokluczowe obiekty {znacznik: wartość}
+TAG_TUPLE = '__tuple__'
+TAG_SET = '__set__'
+TAG_FROZENSET = '__frozenset__'
+TAG_DATETIME = '__datetime__'
+TAG_DATE = '__date__'
+TAG_BYTES = '__bytes__'
+TAG_DICT = '__dict__'
+TAGS = frozenset((TAG_TUPLE, TAG_SET, TAG_FROZENSET, TAG_DATETIME, TAG_DATE, TAG_BYTES, TAG_DICT))
+
+
+def _tagged(value: Any) -> Any:
+    """Zamienia wartość na postać JSON, oznaczając typy, które odtworzenie zamieniłoby na inne"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+
+    # Zwarte rekordy MemoryRealm są mapowaniami, ale nie słownikami
+    if isinstance(value, Mapping):
+        if all(isinstance(key, str) for key in value) and not (len(value) == 1 and next(iter(value)) in TAGS):
+            return {key: _tagged(item) for key, item in value.items()}
+        # Klucze nienapisowe (JSON zamieniłby je na napisy) lub kolizja ze znacznikiem
+        return {TAG_DICT: [[_tagged(key), _tagged(item)] for key, item in value.items()]}
+
+    if isinstance(value, list):
+        return [_tagged(item) for item in value]
+    if isinstance(value, tuple):
+        return {TAG_TUPLE: [_tagged(item) for item in value]}
+    if isinstance(value, frozenset):
+        return {TAG_FROZENSET: [_tagged(item) for item in value]}
+    if isinstance(value, set):
+        return {TAG_SET: [_tagged(item) for item in value]}
+    if isinstance(value, datetime):
+        return {TAG_DATETIME: value.isoformat()}
+    if isinstance(value, date):
+        return {TAG_DATE: value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {TAG_BYTES: base64.b64encode(value).decode('ascii')}
+
+    raise TypeError(f"Wartość typu {type(value).__name__} nie jest serializowalna do dziennika")
+
+
+def _untagged(obj: Dict[str, Any]) -> Any:
+    """object_hook json.loads - odtwarza typy oznaczone przez _tagged"""
+    if len(obj) != 1:
+        return obj
+
+    tag, value = next(iter(obj.items()))
+    if tag == TAG_TUPLE:
+        return tuple(value)
+    if tag == TAG_SET:
+        return set(value)
+    if tag == TAG_FROZENSET:
+        return frozenset(value)
+    if tag == TAG_DATETIME:
+        return datetime.fromisoformat(value)
+    if tag == TAG_DATE:
+        return date.fromisoformat(value)
+    if tag == TAG_BYTES:
+        return base64.b64decode(value)
+    if tag == TAG_DICT:
+        return {key: item for key, item in value}
+    return obj
+
+
+def encode_frame(op: int, payload: Any) -> bytes:
+    """Koduje operację jako ramkę dziennika"""
+    body = json.dumps(_tagged(payload), separators=(',', ':')).encode('utf-8')
+    crc = zlib.crc32(body, zlib.crc32(bytes((op,))))
+    return FRAME.pack(len(body), op, crc) + body
+
+
+def iter_frames(buffer, offset: int = 0) -> Iterator[Tuple[int, Any, int]]:
+    """
+    Iteruje ramki bufora jako (operacja, ładunek, koniec ramki)
+
+    Zatrzymuje się na pierwszej niepełnej lub uszkodzonej ramce (urwany zapis).
+    """
+    view = memoryview(buffer)
+    end = len(view)
+
+    while offset + FRAME.size <= end:
+        length, op, crc = FRAME.unpack_from(view, offset)
+        start = offset + FRAME.size
+        stop = start + length
+        if stop > end:
+            return
+
+        body = view[start:stop]
+        if zlib.crc32(body, zlib.crc32(bytes((op,)))) != crc:
+            return
+
+        yield op, json.loads(body.tobytes(), object_hook=_untagged), stop
+        offset = stop
+
+
+class MemoryJournal:
+    """
+    Dziennik operacji z migawkami dla MemoryRealm
+
+    Migawka powstaje w wątku tła przez złożenie poprzedniej migawki z zamkniętymi
+    segmentami dziennika - żywy stan wymiaru nie jest przy tym blokowany ani kopiowany.
+    """
+
+    def __init__(self, path: str, fsync: str = 'interval', fsync_interval: float = 1.0,
+                 snapshot_every: int = 100000, logger=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Nieznana polityka fsync: {fsync} (dostępne: {', '.join(FSYNC_POLICIES)})")
+
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.logger = logger
+
+        self.generation = 0
+        self.loaded = False
+        self.operations_since_snapshot = 0
+        self.snapshots_written = 0
+
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self._sync_thread: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+
+        # Dopisywanie i rotacja segmentów z wielu wątków (append może zlecić migawkę)
+        self._lock = threading.RLock()
+
+    @property
+    def snapshot_path(self) -> str:
+        return f"{self.path}.snapshot"
+
+    def segment_path(self, generation: int) -> str:
+        return f"{self.path}.{generation}.log"
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    # ------------------------------------------------------------------
+    # Otwieranie i odtwarzanie
+    # ------------------------------------------------------------------
+
+    def open(self, apply: Callable[[int, Any], None]) -> int:
+        """
+        Otwiera dziennik do dopisywania - przy pierwszym otwarciu odtwarza stan
+
+        Args:
+            apply: Funkcja stosująca operację (op, ładunek) do stanu wymiaru
+
+        Returns:
+            Liczba odtworzonych operacji
+        """
+        if self.is_open:
+            return 0
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        replayed = 0
+        if not self.loaded:
+            replayed = self._replay(apply)
+            self.loaded = True
+
+        self._open_segment()
+
+        if self.fsync == 'interval':
+            self._closing.clear()
+            self._sync_thread = threading.Thread(
+                target=self._run_sync_timer, name=f"luxdb-fsync-{os.path.basename(self.path)}", daemon=True
+            )
+            self._sync_thread.start()
+        return replayed
+
+    def _replay(self, apply: Callable[[int, Any], None]) -> int:
+        """Ładuje migawkę przez mmap i odtwarza ogon dziennika"""
+        tmp_path = self.snapshot_path + '.tmp'
+        if os.path.exists(tmp_path):
+            # Pozostałość po przerwanej migawce
+            os.remove(tmp_path)
+
+        replayed = 0
+        first_generation = 0
+
+        if os.path.exists(self.snapshot_path) and os.path.getsize(self.snapshot_path) > 0:
+            with open(self.snapshot_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                first_generation = self._read_snapshot_header(snapshot)
+                for op, payload, _ in iter_frames(snapshot, SNAPSHOT_HEADER.size):
+                    apply(op, payload)
+                    replayed += 1
+
+        for generation in self._segment_generations():
+            segment = self.segment_path(generation)
+            if generation < first_generation:
+                # Segment ujęty już w migawce
+                os.remove(segment)
+                continue
+
+            good_end = 0
+            with open(segment, 'rb') as f:
+                data = f.read()
+            for op, payload, end in iter_frames(data):
+                apply(op, payload)
+                replayed += 1
+                good_end = end
+
+            if good_end < len(data):
+                # Urwany zapis na końcu segmentu - odetnij, by kolejne ramki były czytelne
+                with open(segment, 'r+b') as f:
+                    f.truncate(good_end)
+                self._log('warning', f"⚠️ Obcięto uszkodzony ogon dziennika {segment} ({len(data) - good_end} B)")
+
+            self.generation = max(self.generation, generation)
+
+        self.generation = max(self.generation, first_generation)
+        return replayed
+
+    @staticmethod
+    def _read_snapshot_header(buffer) -> int:
+        magic, version, generation = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Plik migawki ma nieprawidłowy format")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja migawki: {version}")
+        return generation
+
+    def _segment_generations(self) -> List[int]:
+        """Zwraca generacje istniejących segmentów dziennika (rosnąco)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        prefix = os.path.basename(self.path) + '.'
+        generations = []
+
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith('.log'):
+                number = name[len(prefix):-4]
+                if number.isdigit():
+                    generations.append(int(number))
+        return sorted(generations)
+
+    # ------------------------------------------------------------------
+    # Zapis
+    # ------------------------------------------------------------------
+
+    def encode(self, op: int, payload: Any) -> bytes:
+        """Koduje operację przed zastosowaniem - błąd serializacji nie zmienia stanu"""
+        return encode_frame(op, payload)
+
+    def append(self, frame: bytes, operations: int = 1) -> None:
+        """
+        Dopisuje ramkę (lub sklejone ramki partii) zgodnie z polityką fsync
+
+        Args:
+            frame: Zakodowana ramka lub konkatenacja ramek
+            operations: Liczba operacji w zapisie (dla progu migawki)
+        """
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("Dziennik wymiaru jest zamknięty")
+
+            self._file.write(frame)
+
+            if self.fsync == 'always':
+                self._sync()
+            elif self.fsync == 'interval':
+                self._file.flush()
+                if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                    self._sync()
+                else:
+                    self._unsynced = True
+
+            self.operations_since_snapshot += operations
+            if self.snapshot_every and self.operations_since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _run_sync_timer(self) -> None:
+        """Polityka interval: synchronizuje zapisy czekające dłużej niż fsync_interval"""
+        while not self._closing.wait(self.fsync_interval):
+            with self._lock:
+                if self._file is not None and self._unsynced:
+                    try:
+                        self._sync()
+                    except OSError as e:
+                        self._log('error', f"❌ Błąd fsync dziennika {self.path}: {e}")
+
+    def _open_segment(self) -> None:
+        self._file = open(self.segment_path(self.generation), 'ab')
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """Zamyka dziennik czekając na trwającą migawkę"""
+        # Wątek synchronizacji bierze self._lock - zatrzymaj go przed jej przejęciem
+        self._closing.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+            self._sync_thread = None
+
+        with self._lock:
+            if self._snapshot_thread is not None:
+                self._snapshot_thread.join()
+                self._snapshot_thread = None
+            self._close_segment()
+
+    # ------------------------------------------------------------------
+    # Migawki
+    # ------------------------------------------------------------------
+
+    def snapshot(self, wait: bool = False) -> bool:
+        """
+        Zamyka bieżący segment i zleca migawkę w tle
+
+        Args:
+            wait: Czekaj na zapis migawki
+
+        Returns:
+            False gdy poprzednia migawka jeszcze trwa (i nie czekamy)
+        """
+        with self._lock:
+            if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+                if not wait:
+                    return False
+                self._snapshot_thread.join()
+
+            sealed = self.generation
+            self._close_segment()
+            self.generation += 1
+            self._open_segment()
+            self.operations_since_snapshot = 0
+
+            thread = threading.Thread(
+                target=self._write_snapshot, args=(sealed,),
+                name=f"luxdb-snapshot-{os.path.basename(self.path)}", daemon=True
+            )
+            self._snapshot_thread = thread
+            thread.start()
+
+        if wait:
+            thread.join()
+        return True
+
+    def _write_snapshot(self, sealed: int) -> None:
+        """Składa migawkę z poprzedniej migawki i segmentów do generacji sealed włącznie"""
+        try:
+            started = time.time()
+            beings, next_soul_id, first_generation = self._fold(sealed)
+
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, sealed + 1))
+                f.write(encode_frame(OP_SEQUENCE, {'next_soul_id': next_soul_id}))
+                for being in beings.values():
+                    f.write(encode_frame(OP_MANIFEST, being))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, self.snapshot_path)
+            self._sync_directory()
+
+            for generation in range(first_generation, sealed + 1):
+                segment = self.segment_path(generation)
+                if os.path.exists(segment):
+                    os.remove(segment)
+
+            self.snapshots_written += 1
+            self._log('debug', f"📸 Migawka dziennika {self.path}: {len(beings)} bytów w {time.time() - started:.3f}s")
+
+        except Exception as e:
+            self._log('error', f"❌ Błąd zapisu migawki dziennika {self.path}: {e}")
+
+    def _fold(self, sealed: int) -> Tuple[Dict[int, Dict[str, Any]], int, int]:
+        """Odtwarza stan z plików (bez dostępu do żywego wymiaru)"""
+        beings: Dict[int, Dict[str, Any]] = {}
+        state = {'next_soul_id': 1}
+        first_generation = 0
+
+        def apply(op: int, payload: Any) -> None:
+            if op == OP_MANIFEST:
+                beings[payload['soul_id']] = payload
+                state['next_soul_id'] = max(state['next_soul_id'], payload['soul_id'] + 1)
+            elif op == OP_EVOLVE:
+                being = beings.get(payload['soul_id'])
+                if being is not None:
+                    being.update(payload['changes'])
+            elif op == OP_TRANSCEND:
+                beings.pop(payload['soul_id'], None)
+            elif op == OP_CLEAR:
+                beings.clear()
+                state['next_soul_id'] = 1
+            elif op == OP_SEQUENCE:
+                state['next_soul_id'] = max(state['next_soul_id'], payload['next_soul_id'])
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                first_generation = self._read_snapshot_header(snapshot)
+                for op, payload, _ in iter_frames(snapshot, SNAPSHOT_HEADER.size):
+                    apply(op, payload)
+
+        for generation in range(first_generation, sealed + 1):
+            segment = self.segment_path(generation)
+            if not os.path.exists(segment):
+                continue
+            with open(segment, 'rb') as f:
+                data = f.read()
+            for op, payload, _ in iter_frames(data):
+                apply(op, payload)
+
+        return beings, state['next_soul_id'], first_generation
+
+    def _sync_directory(self) -> None:
+        # Trwałość zmiany nazwy pliku wymaga fsync katalogu (niedostępne na Windows)
+        if os.name != 'posix':
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _log(self, level: str, message: str) -> None:
+        if self.logger is not None:
+            getattr(self.logger, level)(message)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki dziennika"""
+        segment = self.segment_path(self.generation)
+        return {
+            'path': self.path,
+            'fsync': self.fsync,
+            'generation': self.generation,
+            'operations_since_snapshot': self.operations_since_snapshot,
+            'snapshots_written': self.snapshots_written,
+            'snapshot_bytes': os.path.getsize(self.snapshot_path) if os.path.exists(self.snapshot_path) else 0,
+            'segment_bytes': os.path.getsize(segment) if os.path.exists(segment) else 0
+        }
@@ -2,12 +2,33 @@
 """
 ⚡ MemoryRealm - Szybki Wymiar Pamięci
 
+Układy przechowywania (memory://?layout=...):
+- row: słownik na byt z indeksami wtórnymi (domyślny)
+- columnar: kolumny NumPy z filtrami wektorowymi (&numeric=pole,...&categorical=pole,...)
+- compact: zwarte rekordy tylko do odczytu ze wspólnymi układami kluczy (&intern=pole,...)
+
+Trwałość (opcjonalna, dla każdego układu): &journal=ścieżka
+- &fsync=always|interval|never, &fsync_interval=sekundy, &snapshot_every=liczba_operacji
+
+Współbieżność: zapisy blokują pas (stripe) wyznaczony przez soul_id (&lock_stripes=64),
+odczyty nie blokują wymiaru - skan idzie po liście soul_id, która tylko rośnie.
 """
 
+import sys
 import time
-from typing import Dict, Any, List, Optional, Union
+import heapq
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
 from .base_realm import BaseRealm
+from .memory_index import HashIndex, SortedIndex, INDEX_KINDS, sort_key
+from .memory_columnar import ColumnarStore
+from .memory_compact import RecordPool, estimate_population
+from .memory_journal import (
+    MemoryJournal, OP_MANIFEST, OP_EVOLVE, OP_TRANSCEND, OP_CLEAR, OP_SEQUENCE
+)
 
 
 class MemoryRealm(BaseRealm):
@@ -15,21 +36,107 @@ class MemoryRealm(BaseRealm):
     Wymiar danych w pamięci - najszybszy dostęp, ale dane nietrwałe
     """
     
+    # Maksymalny stosunek rozmiaru indeksu do liczby kandydatów, przy którym opłaca się przecięcie
+    INTERSECT_RATIO = 4
+    
+    # Indeksy tworzone dla każdego wymiaru pamięci
+    DEFAULT_INDEXES = {
+        'soul_name': 'hash',
+        'realm_affinity': 'hash',
+        'energy_level': 'sorted'
+    }
+    
+    # Klucze warunków sterujące zapytaniem, a nie filtrujące byty
+    QUERY_OPTIONS = ('order_by', 'order_desc', 'limit')
+    
+    # Dostępne układy przechowywania
+    LAYOUTS = ('row', 'columnar', 'compact')
+    
+    # Funkcje agregujące
+    AGGREGATES = ('count', 'sum', 'avg', 'min', 'max')
+    
+    # Domyślna liczba pasów blokad zapisu
+    LOCK_STRIPES = 64
+    
+    # Liczba bytów, z których get_memory_stats szacuje rozmiar całego wymiaru
+    MEMORY_SAMPLE = 1000
+    
+    # Operacje w pamięci są krótsze niż przełączenie wątku - AsyncRealm wywołuje je inline
+    ASYNC_WORKERS = 0
+    
     def __init__(self, name: str, connection_string: str, astral_engine):
         super().__init__(name, connection_string, astral_engine)
         
+        self.layout = self.options.get('layout', 'row')
+        if self.layout not in self.LAYOUTS:
+            raise ValueError(f"Nieznany układ wymiaru pamięci: {self.layout} (dostępne: {', '.join(self.LAYOUTS)})")
+        
         # Przechowywanie danych w pamięci
         self.beings: Dict[int, Dict[str, Any]] = {}
         self.next_soul_id = 1
-        self._indices: Dict[str, Dict[Any, List[int]]] = {
-            'soul_name': {},
-            'realm_affinity': {},
-            'energy_level': {}
-        }
+        
+        # Kolejność manifestacji - lista tylko dopisywana, usunięte byty zostają jako nagrobki
+        self._order: List[int] = []
+        
+        # Układ zwarty przechowuje niemodyfikowalne rekordy zamiast słowników
+        self._records: Optional[RecordPool] = None
+        if self.layout == 'compact':
+            self._records = self._create_record_pool()
+        
+        # Układ kolumnowy zastępuje słowniki i indeksy maskami wektorowymi
+        self._columns: Optional[ColumnarStore] = None
+        if self.layout == 'columnar':
+            self._columns = self._create_columnar_store()
+            self._indices: Dict[str, Union[HashIndex, SortedIndex]] = {}
+        else:
+            self._indices = self._create_default_indices()
+        
+        # Opcjonalny dziennik operacji - trwałość i szybki restart
+        self._journal: Optional[MemoryJournal] = None
+        if 'journal' in self.options:
+            self._journal = self._create_journal()
+        
+        # Blokady: self._lock (przydział soul_id) -> pas bytu -> magazyn kolumnowy -> dziennik
+        self._stripes = [threading.Lock() for _ in range(int(self.options.get('lock_stripes', self.LOCK_STRIPES)))]
+        self._columns_lock = threading.Lock()
+        self._epoch = 0
+    
+    @property
+    def _tombstones(self) -> int:
+        """Liczba nagrobków w liście kolejności - wyliczana, bo transcend trzyma tylko blokadę pasa"""
+        return len(self._order) - len(self.beings)
+    
+    def _stripe(self, soul_id: Any) -> threading.Lock:
+        """Zwraca blokadę pasa dla bytu - zapisy różnych bytów zwykle nie konkurują"""
+        return self._stripes[hash(soul_id) % len(self._stripes)]
+    
+    @contextmanager
+    def _exclusive(self):
+        """Wstrzymuje wszystkie zapisy (operacje administracyjne i odtwarzanie)"""
+        with self._lock:
+            for stripe in self._stripes:
+                stripe.acquire()
+            try:
+                yield
+            finally:
+                for stripe in reversed(self._stripes):
+                    stripe.release()
     
     def connect(self) -> bool:
         """Nawiązuje połączenie z wymiarem pamięci"""
         try:
+            # Odtwórz stan z migawki i dziennika (tylko przy pierwszym połączeniu)
+            if self._journal is not None and not self._journal.is_open:
+                started = time.time()
+                with self._exclusive():
+                    replayed = self._journal.open(self._replay_operation)
+                if replayed:
+                    self.count_beings()
+                    self.engine.logger.info(
+                        f"📜 Odtworzono wymiar {self.name}: {replayed} operacji, "
+                        f"{self._being_count} bytów w {time.time() - started:.3f}s"
+                    )
+            
             # Połączenie jest zawsze dostępne dla wymiaru pamięci
             self.is_connected = True
             self.engine.logger.info(f"⚡ Połączono z wymiarem pamięci: {self.name}")
@@ -44,7 +151,10 @@ class MemoryRealm(BaseRealm):
         try:
             # Opcjonalnie możemy wyczyścić dane
             # self.beings.clear()
-            # self._indices = {'soul_name': {}, 'realm_affinity': {}, 'energy_level': {}}
+            # self._indices = self._create_default_indices()
+            
+            if self._journal is not None:
+                self._journal.close()
             
             self.is_connected = False
             self.engine.logger.info(f"⚡ Rozłączono z wymiarem pamięci: {self.name}")
@@ -59,35 +169,100 @@ class MemoryRealm(BaseRealm):
         if not self.is_connected:
             self.connect()
         
-        # Przygotuj dane
-        soul_id = self.next_soul_id
-        self.next_soul_id += 1
+        while True:
+            # Atomowy przydział soul_id
+            with self._lock:
+                soul_id = self.next_soul_id
+                self.next_soul_id += 1
+                epoch = self._epoch
+            
+            with self._stripe(soul_id):
+                # Wymiar wyczyszczony po przydziale - soul_id mógłby się powtórzyć
+                if epoch != self._epoch:
+                    continue
+                
+                being = self._manifest_locked(soul_id, being_data)
+                break
+        
+        self.count_beings()
+        
+        self.engine.logger.debug(f"✨ Manifestowano byt '{being['soul_name']}' w wymiarze pamięci {self.name}")
+        return being
+    
+    def manifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Manifestuje wiele bytów - partia pod jedną blokadą zapisu i jednym zapisem do dziennika
+        
+        Args:
+            beings: Dane bytów (dowolny iterowalny, także generator)
+            batch_size: Liczba bytów w jednej partii
+            
+        Returns:
+            Lista zmanifestowanych bytów
+        """
+        if not self.is_connected:
+            self.connect()
+        
+        manifested = []
+        for batch in self._batches(beings, batch_size):
+            frames: Optional[List[bytes]] = [] if self._journal is not None else None
+            
+            with self._exclusive():
+                try:
+                    for being_data in batch:
+                        soul_id = self.next_soul_id
+                        self.next_soul_id += 1
+                        manifested.append(self._manifest_locked(soul_id, being_data, frames))
+                finally:
+                    # Byty zapisane przed ewentualnym błędem też trafiają do dziennika
+                    if frames:
+                        self._journal.append(b''.join(frames), operations=len(frames))
+        
+        self.count_beings()
         
+        self.engine.logger.debug(f"✨ Manifestowano {len(manifested)} bytów partiami w wymiarze pamięci {self.name}")
+        return manifested
+    
+    def _manifest_locked(self, soul_id: int, being_data: Dict[str, Any],
+                         frames: Optional[List[bytes]] = None) -> Dict[str, Any]:
+        """
+        Tworzy i zapisuje byt (pod blokadą pasa soul_id)
+        
+        Args:
+            frames: Lista na ramki dziennika zapisywane później jedną partią
+        """
         soul_name = being_data.get('soul_name', f'being_{soul_id}')
         energy_level = being_data.get('energy_level', 100.0)
         realm_affinity = being_data.get('realm_affinity', 'neutral')
         manifestation_time = datetime.now().isoformat()
         
-        # Utwórz byt
-        being = being_data.copy()
-        being.update({
+        core = {
             'soul_id': soul_id,
             'soul_name': soul_name,
             'energy_level': energy_level,
             'realm_affinity': realm_affinity,
             'manifestation_time': manifestation_time
-        })
+        }
         
-        # Zapisz w pamięci
-        self.beings[soul_id] = being
+        # Utwórz byt - rekord zwarty powstaje bez pośredniej kopii słownika
+        if self._records is not None:
+            being = self._records.build(being_data, core)
+        else:
+            being = being_data.copy()
+            being.update(core)
         
-        # Aktualizuj indeksy
-        self._update_indices(soul_id, being)
+        # Serializacja przed zapisem - błąd nie zostawia bytu poza dziennikiem
+        frame = self._journal.encode(OP_MANIFEST, being) if self._journal is not None else None
         
-        # Zwiększ licznik
-        self._being_count += 1
+        # Zapisz w pamięci
+        self._store_being(soul_id, being)
+        
+        if frame is not None:
+            if frames is not None:
+                frames.append(frame)
+            else:
+                self._journal.append(frame)
         
-        self.engine.logger.debug(f"✨ Manifestowano byt '{soul_name}' w wymiarze pamięci {self.name}")
         return being
     
     def contemplate(self, intention: str, **conditions) -> List[Dict[str, Any]]:
@@ -95,186 +270,469 @@ class MemoryRealm(BaseRealm):
         if not self.is_connected:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        # Zbierz wszystkie byty spełniające warunki
-        results = []
+        results = list(self._execute_query(conditions))
+        
+        self.engine.logger.debug(f"🔍 Kontemplacja '{intention}' zwróciła {len(results)} bytów")
+        return results
+    
+    def contemplate_iter(self, intention: str, **conditions) -> Iterator[Dict[str, Any]]:
+        """
+        Kontempluje leniwie - zwraca iterator bytów zamiast pełnej listy
+        
+        Iteracja kończy się po osiągnięciu limitu. Równoległe zapisy są dozwolone -
+        iterator zwraca każdy byt co najwyżej raz, w wersji aktualnej w chwili odczytu
+        (przy order_by byt przesunięty zmianą przed bieżącą pozycję zostaje pominięty).
+        """
+        if not self.is_connected:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        return self._execute_query(conditions)
+    
+    def _execute_query(self, conditions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Buduje leniwy potok zapytania: kandydaci -> filtr -> porządek -> limit"""
+        if self._columns is not None:
+            # Kompaktowanie przenumerowuje wiersze - wynik materializowany pod blokadą magazynu
+            with self._columns_lock:
+                return iter(list(self._columns.query(conditions, self._matches_conditions, self._order_key)))
+        
+        # Planer wybiera kandydatów z indeksów, skan tylko gdy brak indeksu
+        candidates = self._plan_candidates(conditions)
+        order_field = conditions.get('order_by')
+        reverse = bool(conditions.get('order_desc', False))
+        limit = max(0, int(conditions['limit'])) if 'limit' in conditions else None
+        
+        if not order_field:
+            # Domyślnie najnowsze pierwsze - porządek wynika z kolejności wstawiania
+            matches = self._iter_recent(candidates, conditions)
+        
+        elif candidates is None and isinstance(self._indices.get(order_field), SortedIndex):
+            # Przejście indeksu posortowanego zamiast pełnego sortowania
+            matches = self._iter_by_index(self._indices[order_field], reverse, conditions)
         
-        # Jeśli nie ma warunków, zwróć wszystkie byty
-        if not conditions:
-            results = list(self.beings.values())
         else:
-            # Filtruj na podstawie warunków
-            for being in self.beings.values():
+            matches = self._iter_recent(candidates, conditions)
+            key = self._order_key(order_field, reverse)
+            
+            if limit is not None:
+                # Ograniczony kopiec - O(n log limit) zamiast pełnego sortowania
+                select = heapq.nlargest if reverse else heapq.nsmallest
+                return iter(select(limit, matches, key=key))
+            
+            return iter(sorted(matches, key=key, reverse=reverse))
+        
+        if limit is not None:
+            return islice(matches, limit)
+        return matches
+    
+    def _iter_recent(self, candidates: Optional[Set[int]], conditions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Iteruje pasujące byty od najnowszych (soul_id rośnie z czasem manifestacji)"""
+        if candidates is None:
+            for _, being in self._scan_recent():
                 if self._matches_conditions(being, conditions):
-                    results.append(being)
+                    yield being
+            return
         
-        # Sortowanie
-        if 'order_by' in conditions:
-            order_field = conditions['order_by']
-            reverse = conditions.get('order_desc', False)
-            
-            results.sort(
-                key=lambda x: x.get(order_field, 0),
-                reverse=reverse
-            )
-        else:
-            # Domyślnie sortuj po czasie manifestacji (najnowsze pierwsze)
-            results.sort(
-                key=lambda x: x.get('manifestation_time', ''),
-                reverse=True
-            )
+        # Kopiec kandydatów - kolejne byty zdejmowane dopiero gdy są potrzebne
+        heap = [-soul_id for soul_id in candidates]
+        heapq.heapify(heap)
         
-        # Limit
-        if 'limit' in conditions:
-            limit = int(conditions['limit'])
-            results = results[:limit]
+        while heap:
+            being = self.beings.get(-heapq.heappop(heap))
+            if being is not None and self._matches_conditions(being, conditions):
+                yield being
+    
+    def _iter_by_index(self, index: SortedIndex, reverse: bool, conditions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Iteruje pasujące byty w porządku indeksu posortowanego"""
+        for soul_id in index.iterate(reverse=reverse):
+            being = self.beings.get(soul_id)
+            if being is not None and self._matches_conditions(being, conditions):
+                yield being
         
-        self.engine.logger.debug(f"🔍 Kontemplacja '{intention}' zwróciła {len(results)} bytów")
-        return results
+        # Byty bez porządkowalnej wartości pola trafiają na koniec
+        for _, being in self._scan_recent():
+            if sort_key(being.get(index.field)) is None and self._matches_conditions(being, conditions):
+                yield being
+    
+    def _scan_recent(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Iteruje (soul_id, byt) od najnowszych bez blokowania zapisów
+        
+        Lista kolejności tylko rośnie, więc równoległe zapisy nie przesuwają pozycji -
+        każdy byt zwracany jest najwyżej raz, usunięte są pomijane.
+        """
+        order = self._order
+        beings = self.beings
+        
+        for position in range(len(order) - 1, -1, -1):
+            soul_id = order[position]
+            being = beings.get(soul_id)
+            if being is not None:
+                yield soul_id, being
+    
+    @staticmethod
+    def _order_key(field: str, reverse: bool) -> Callable[[Dict[str, Any]], Tuple]:
+        """Klucz sortowania zgodny z SortedIndex - byty bez wartości pola zawsze na końcu"""
+        missing = (0,) if reverse else (1,)
+        rank = 1 if reverse else 0
+        
+        def key(being: Dict[str, Any]) -> Tuple:
+            value_key = sort_key(being.get(field))
+            return missing if value_key is None else (rank, value_key)
+        
+        return key
     
     def transcend(self, being_id: int) -> bool:
         """Transcenduje (usuwa) byt z wymiaru pamięci"""
         if not self.is_connected:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        if being_id in self.beings:
-            being = self.beings[being_id]
+        with self._stripe(being_id):
+            if not self._apply_transcend(being_id):
+                return False
             
-            # Usuń z indeksów
-            self._remove_from_indices(being_id, being)
-            
-            # Usuń z głównego słownika
-            del self.beings[being_id]
-            
-            # Zmniejsz licznik
-            self._being_count = max(0, self._being_count - 1)
-            
-            self.engine.logger.debug(f"🕊️ Byt {being_id} transcendował z wymiaru pamięci {self.name}")
-            return True
-        else:
+            if self._journal is not None:
+                self._journal.append(self._journal.encode(OP_TRANSCEND, {'soul_id': being_id}))
+        
+        # Zaktualizuj licznik
+        self.count_beings()
+        
+        # Zbyt wiele nagrobków w liście kolejności - przepisz ją
+        if self._tombstones > len(self.beings) + 1024:
+            with self._exclusive():
+                self._compact_order()
+        
+        self.engine.logger.debug(f"🕊️ Byt {being_id} transcendował z wymiaru pamięci {self.name}")
+        return True
+    
+    def _apply_transcend(self, being_id: int) -> bool:
+        """Usuwa byt z magazynu i indeksów"""
+        if self._columns is not None:
+            with self._columns_lock:
+                return self._columns.delete(being_id)
+        
+        # Usuń z głównego słownika - odczyty przez indeksy pominą byt już teraz
+        being = self.beings.pop(being_id, None)
+        if being is None:
             return False
+        
+        # Usuń z indeksów
+        self._remove_from_indices(being_id, being)
+        return True
+    
+    def _compact_order(self) -> None:
+        """Usuwa nagrobki z listy kolejności (przy wstrzymanych zapisach)"""
+        beings = self.beings
+        self._order = [soul_id for soul_id in self._order if soul_id in beings]
     
     def evolve(self, being_id: int, new_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Ewoluuje (aktualizuje) byt w wymiarze pamięci"""
         if not self.is_connected:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        if being_id not in self.beings:
-            return None
+        changes = {**new_data, 'last_evolution': datetime.now().isoformat()}
+        frame = None
+        if self._journal is not None:
+            frame = self._journal.encode(OP_EVOLVE, {'soul_id': being_id, 'changes': changes})
+        
+        with self._stripe(being_id):
+            evolved = self._apply_evolve(being_id, changes)
+            if evolved is None:
+                return None
+            
+            if frame is not None:
+                self._journal.append(frame)
+        
+        self.engine.logger.debug(f"🦋 Byt {being_id} ewoluował w wymiarze pamięci {self.name}")
+        
+        # Układ wierszowy zwraca kopię - wywołujący nie może zmienić słownika w magazynie
+        return evolved.copy() if self.layout == 'row' else evolved
+    
+    def _apply_evolve(self, being_id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Stosuje zmiany do bytu w magazynie i indeksach (kopiowanie przy zapisie)
+        
+        Nowa wersja trafia do indeksów przed podmianą, a wpisy starej są usuwane po niej -
+        równoległy odczyt przez indeks zawsze znajdzie byt i zweryfikuje go na jednej z wersji.
+        """
+        if self._columns is not None:
+            with self._columns_lock:
+                return self._columns.update(being_id, changes)
         
         # Pobierz aktualny byt
-        current_being = self.beings[being_id]
+        current_being = self.beings.get(being_id)
+        if current_being is None:
+            return None
         
-        # Usuń z indeksów
-        self._remove_from_indices(being_id, current_being)
+        if self._records is not None:
+            # Rekordy są niemodyfikowalne - nowa wersja zastępuje starą
+            evolved = self._records.build(current_being, changes)
+        else:
+            evolved = {**current_being, **changes}
         
-        # Aktualizuj dane
-        current_being.update(new_data)
-        current_being['last_evolution'] = datetime.now().isoformat()
+        indices = self._indices.values()
+        for index in indices:
+            index.add(being_id, evolved)
         
         # Zapisz zaktualizowany byt
-        self.beings[being_id] = current_being
+        self.beings[being_id] = evolved
+        
+        for index in indices:
+            index.remove_stale(being_id, current_being, evolved)
+        return evolved
+    
+    def _store_being(self, soul_id: int, being: Dict[str, Any]) -> None:
+        """Zapisuje byt w magazynie układu i w indeksach"""
+        if self._columns is not None:
+            with self._columns_lock:
+                self._columns.insert(soul_id, being)
+        else:
+            self.beings[soul_id] = being
+            self._order.append(soul_id)
+            
+            # Aktualizuj indeksy
+            self._update_indices(soul_id, being)
+    
+    def _replay_operation(self, op: int, payload: Any) -> None:
+        """Stosuje operację z migawki lub dziennika (bez ponownego zapisu do dziennika)"""
+        if op == OP_MANIFEST:
+            soul_id = payload['soul_id']
+            being = self._records.build(payload) if self._records is not None else payload
+            self._store_being(soul_id, being)
+            self.next_soul_id = max(self.next_soul_id, soul_id + 1)
         
-        # Aktualizuj indeksy
-        self._update_indices(being_id, current_being)
+        elif op == OP_EVOLVE:
+            self._apply_evolve(payload['soul_id'], payload['changes'])
         
-        self.engine.logger.debug(f"🦋 Byt {being_id} ewoluował w wymiarze pamięci {self.name}")
-        return current_being.copy()
+        elif op == OP_TRANSCEND:
+            self._apply_transcend(payload['soul_id'])
+        
+        elif op == OP_CLEAR:
+            self._reset_storage()
+        
+        elif op == OP_SEQUENCE:
+            self.next_soul_id = max(self.next_soul_id, payload['next_soul_id'])
     
     def count_beings(self) -> int:
         """Zwraca liczbę bytów w wymiarze"""
-        self._being_count = len(self.beings)
+        self._being_count = len(self._columns) if self._columns is not None else len(self.beings)
         return self._being_count
     
+    def _plan_candidates(self, conditions: Dict[str, Any]) -> Optional[Set[int]]:
+        """
+        Planer zapytań - wybiera najbardziej selektywne indeksy dla warunków
+        
+        Args:
+            conditions: Warunki wyszukiwania
+            
+        Returns:
+            Zbiór kandydatów (soul_id) do weryfikacji lub None gdy potrzebny jest pełny skan
+        """
+        # Lista (szacowany rozmiar, funkcja zwracająca zbiór soul_id)
+        postings = []
+        ranges: Dict[str, List[Any]] = {}
+        
+        for key, value in conditions.items():
+            if key in self.QUERY_OPTIONS:
+                continue
+            
+            range_field = self._range_field(key)
+            if range_field:
+                bounds = ranges.setdefault(range_field, [None, None])
+                bounds[0 if key.endswith('_min') else 1] = value
+                continue
+            
+            # Równość po dowolnym indeksie
+            index = self._indices.get(key)
+            if index is None:
+                continue
+            
+            size = index.estimate_equal(value)
+            if size is not None:
+                postings.append((size, lambda index=index, value=value: index.lookup_equal(value)))
+        
+        # Zakresy po indeksach posortowanych
+        for field, (low, high) in ranges.items():
+            index = self._indices.get(field)
+            if not isinstance(index, SortedIndex):
+                continue
+            
+            size = index.estimate_range(low, high)
+            if size is not None:
+                postings.append((size, lambda index=index, low=low, high=high: index.lookup_range(low, high)))
+        
+        if not postings:
+            return None
+        
+        # Najbardziej selektywny indeks wyznacza kandydatów
+        postings.sort(key=lambda item: item[0])
+        candidates = postings[0][1]()
+        
+        # Przecinaj z kolejnymi tylko gdy są porównywalnie małe - resztę sprawdzi weryfikacja
+        for size, posting in postings[1:]:
+            if not candidates or size > len(candidates) * self.INTERSECT_RATIO:
+                break
+            candidates.intersection_update(posting())
+        
+        return candidates
+    
+    @staticmethod
+    def _range_field(key: str) -> Optional[str]:
+        """Zwraca nazwę pola dla warunku zakresowego (pole_min / pole_max)"""
+        if key.endswith('_min') or key.endswith('_max'):
+            return key[:-4]
+        return None
+    
     def _matches_conditions(self, being: Dict[str, Any], conditions: Dict[str, Any]) -> bool:
         """Sprawdza czy byt spełnia warunki"""
         for key, value in conditions.items():
             # Pomiń specjalne klucze
-            if key in ['order_by', 'order_desc', 'limit']:
+            if key in self.QUERY_OPTIONS:
                 continue
             
-            # Sprawdź różne typy warunków
-            if key == 'soul_name':
-                if being.get('soul_name') != value:
-                    return False
-            
-            elif key == 'energy_level_min':
-                if being.get('energy_level', 0) < value:
+            # Warunki zakresowe (np. energy_level_min, energy_level_max)
+            range_field = self._range_field(key)
+            if range_field:
+                actual = being.get(range_field)
+                try:
+                    if key.endswith('_min'):
+                        matches = actual >= value
+                    else:
+                        matches = actual <= value
+                except TypeError:
+                    # Brak pola lub wartość nieporównywalna
                     return False
-            
-            elif key == 'energy_level_max':
-                if being.get('energy_level', 0) > value:
+                
+                if not matches:
                     return False
             
-            elif key == 'realm_affinity':
-                if being.get('realm_affinity') != value:
-                    return False
-            
-            elif key in being:
-                # Ogólne dopasowanie
-                if being[key] != value:
-                    return False
+            # Dopasowanie równościowe - brak pola oznacza brak dopasowania
+            elif being.get(key) != value:
+                return False
         
         return True
     
     def _update_indices(self, soul_id: int, being: Dict[str, Any]) -> None:
         """Aktualizuje indeksy dla szybszego wyszukiwania"""
-        # Indeks po soul_name
-        soul_name = being.get('soul_name')
-        if soul_name:
-            if soul_name not in self._indices['soul_name']:
-                self._indices['soul_name'][soul_name] = []
-            self._indices['soul_name'][soul_name].append(soul_id)
-        
-        # Indeks po realm_affinity
-        realm_affinity = being.get('realm_affinity')
-        if realm_affinity:
-            if realm_affinity not in self._indices['realm_affinity']:
-                self._indices['realm_affinity'][realm_affinity] = []
-            self._indices['realm_affinity'][realm_affinity].append(soul_id)
-        
-        # Indeks po energy_level (zaokrąglony do 10)
-        energy_level = being.get('energy_level')
-        if energy_level is not None:
-            energy_bucket = int(energy_level // 10) * 10
-            if energy_bucket not in self._indices['energy_level']:
-                self._indices['energy_level'][energy_bucket] = []
-            self._indices['energy_level'][energy_bucket].append(soul_id)
+        for index in self._indices.values():
+            index.add(soul_id, being)
     
     def _remove_from_indices(self, soul_id: int, being: Dict[str, Any]) -> None:
         """Usuwa z indeksów"""
-        # Usuń z indeksu soul_name
-        soul_name = being.get('soul_name')
-        if soul_name and soul_name in self._indices['soul_name']:
-            if soul_id in self._indices['soul_name'][soul_name]:
-                self._indices['soul_name'][soul_name].remove(soul_id)
-            if not self._indices['soul_name'][soul_name]:
-                del self._indices['soul_name'][soul_name]
-        
-        # Usuń z indeksu realm_affinity
-        realm_affinity = being.get('realm_affinity')
-        if realm_affinity and realm_affinity in self._indices['realm_affinity']:
-            if soul_id in self._indices['realm_affinity'][realm_affinity]:
-                self._indices['realm_affinity'][realm_affinity].remove(soul_id)
-            if not self._indices['realm_affinity'][realm_affinity]:
-                del self._indices['realm_affinity'][realm_affinity]
-        
-        # Usuń z indeksu energy_level
-        energy_level = being.get('energy_level')
-        if energy_level is not None:
-            energy_bucket = int(energy_level // 10) * 10
-            if energy_bucket in self._indices['energy_level']:
-                if soul_id in self._indices['energy_level'][energy_bucket]:
-                    self._indices['energy_level'][energy_bucket].remove(soul_id)
-                if not self._indices['energy_level'][energy_bucket]:
-                    del self._indices['energy_level'][energy_bucket]
+        for index in self._indices.values():
+            index.remove(soul_id, being)
+    
+    def _create_default_indices(self) -> Dict[str, Union[HashIndex, SortedIndex]]:
+        """Tworzy domyślne indeksy wymiaru"""
+        return {
+            field: INDEX_KINDS[kind](field) for field, kind in self.DEFAULT_INDEXES.items()
+        }
+    
+    def _create_columnar_store(self) -> ColumnarStore:
+        """Tworzy magazyn kolumnowy z kolumnami z connection string"""
+        def fields(option: str) -> List[str]:
+            return [field.strip() for field in self.options.get(option, '').split(',') if field.strip()]
+        
+        return ColumnarStore(
+            numeric=['energy_level'] + fields('numeric'),
+            categorical=['soul_name', 'realm_affinity'] + fields('categorical')
+        )
+    
+    def _create_record_pool(self) -> RecordPool:
+        """Tworzy fabrykę zwartych rekordów z polami internowanymi z connection string"""
+        fields = [field.strip() for field in self.options.get('intern', '').split(',') if field.strip()]
+        return RecordPool(intern=['realm_affinity'] + fields)
+    
+    def _create_journal(self) -> MemoryJournal:
+        """Tworzy dziennik operacji z opcji connection string"""
+        return MemoryJournal(
+            self.options['journal'],
+            fsync=self.options.get('fsync', 'interval'),
+            fsync_interval=float(self.options.get('fsync_interval', 1.0)),
+            snapshot_every=int(self.options.get('snapshot_every', 100000)),
+            logger=self.engine.logger
+        )
+    
+    def snapshot(self, wait: bool = False) -> bool:
+        """
+        Zleca zwartą migawkę dziennika w tle
+        
+        Args:
+            wait: Czekaj na zapis migawki
+            
+        Returns:
+            True jeśli migawka została zlecona
+        """
+        if self._journal is None:
+            raise ValueError("Wymiar pamięci nie ma dziennika (brak opcji journal=)")
+        if not self._journal.is_open:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        return self._journal.snapshot(wait=wait)
+    
+    def create_index(self, field: str, kind: str = 'hash') -> None:
+        """
+        Tworzy indeks wtórny na dowolnym kluczu esencji
+        
+        Args:
+            field: Nazwa pola (klucz esencji)
+            kind: 'hash' dla równości lub 'sorted' dla zakresów i order_by
+        """
+        if self._columns is not None:
+            raise ValueError("Układ kolumnowy filtruje maskami wektorowymi - indeksy nie są używane")
+        
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Nieznany typ indeksu: {kind} (dostępne: {', '.join(INDEX_KINDS)})")
+        
+        with self._exclusive():
+            existing = self._indices.get(field)
+            if existing is not None:
+                if existing.kind == kind:
+                    return
+                raise ValueError(f"Indeks na polu '{field}' już istnieje (typ: {existing.kind})")
+            
+            index = INDEX_KINDS[kind](field)
+            index.build(self.beings.items())
+            
+            # Nowy słownik indeksów - trwające odczyty iterują poprzedni
+            self._indices = {**self._indices, field: index}
+        
+        self.engine.logger.info(f"🗂️ Utworzono indeks {kind} na polu '{field}' w wymiarze {self.name}")
+    
+    def drop_index(self, field: str) -> bool:
+        """
+        Usuwa indeks wtórny
+        
+        Args:
+            field: Nazwa pola
+            
+        Returns:
+            True jeśli indeks istniał
+        """
+        with self._exclusive():
+            if field not in self._indices:
+                return False
+            self._indices = {name: index for name, index in self._indices.items() if name != field}
+        
+        self.engine.logger.info(f"🗂️ Usunięto indeks na polu '{field}' w wymiarze {self.name}")
+        return True
+    
+    def list_indexes(self) -> Dict[str, str]:
+        """Zwraca indeksy wymiaru (pole -> typ)"""
+        return {field: index.kind for field, index in self._indices.items()}
     
     def optimize(self) -> None:
         """Optymalizuje wymiar pamięci"""
-        # Wyczyść puste indeksy
-        for index_name in self._indices:
-            empty_keys = [k for k, v in self._indices[index_name].items() if not v]
-            for key in empty_keys:
-                del self._indices[index_name][key]
+        with self._exclusive():
+            # Układ kolumnowy - usuń martwe wiersze
+            if self._columns is not None:
+                with self._columns_lock:
+                    self._columns.compact()
+            
+            # Indeksy usuwają puste listy postingów na bieżąco - przebuduj je dla zwolnienia pamięci
+            for index in self._indices.values():
+                index.build(self.beings.items())
+            
+            self._compact_order()
         
         self.engine.logger.debug(f"⚡ Zoptymalizowano wymiar pamięci: {self.name}")
     
@@ -285,31 +743,161 @@ class MemoryRealm(BaseRealm):
     
     def clear(self) -> None:
         """Czyści wszystkie dane z wymiaru"""
-        self.beings.clear()
-        self._indices = {'soul_name': {}, 'realm_affinity': {}, 'energy_level': {}}
-        self.next_soul_id = 1
-        self._being_count = 0
+        # Czyszczenie musi trafić do dziennika, inaczej restart przywróci byty
+        if self._journal is not None and not self._journal.is_open:
+            self.connect()
+        
+        with self._exclusive():
+            self._reset_storage()
+            
+            if self._journal is not None:
+                self._journal.append(self._journal.encode(OP_CLEAR, None))
         
         self.engine.logger.info(f"🧹 Wyczyszczono wymiar pamięci: {self.name}")
     
+    def _reset_storage(self) -> None:
+        """Usuwa wszystkie byty zachowując definicje indeksów"""
+        self._epoch += 1
+        self.beings = {}
+        self._order = []
+        self._indices = {field: INDEX_KINDS[index.kind](field) for field, index in self._indices.items()}
+        if self._columns is not None:
+            self._columns = self._create_columnar_store()
+        if self._records is not None:
+            self._records = self._create_record_pool()
+        self.next_soul_id = 1
+        self._being_count = 0
+    
     def get_beings_sample(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Zwraca próbkę bytów z wymiaru"""
         return self.contemplate("sample_beings", limit=limit)
     
+    def aggregate(self, intention: str, func: str, field: Optional[str] = None, **conditions) -> Any:
+        """
+        Liczy agregat po bytach spełniających warunki
+        
+        Args:
+            intention: Intencja zapytania
+            func: count, sum, avg, min lub max
+            field: Pole liczbowe (niewymagane dla count)
+            **conditions: Warunki jak w contemplate
+            
+        Returns:
+            Wartość agregatu (None gdy brak wartości dla avg/min/max)
+        """
+        if not self.is_connected:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        if func not in self.AGGREGATES:
+            raise ValueError(f"Nieznana funkcja agregująca: {func} (dostępne: {', '.join(self.AGGREGATES)})")
+        if func != 'count' and not field:
+            raise ValueError(f"Agregat {func} wymaga pola")
+        
+        conditions = {k: v for k, v in conditions.items() if k not in self.QUERY_OPTIONS}
+        
+        # Układ kolumnowy liczy maskami wektorowymi
+        if self._columns is not None:
+            with self._columns_lock:
+                handled, value = self._columns.aggregate(func, field, conditions)
+            if handled:
+                self.engine.logger.debug(f"📊 Agregat '{intention}' ({func}) policzony wektorowo")
+                return value
+        
+        beings = self._execute_query(conditions)
+        if func == 'count':
+            return sum(1 for _ in beings)
+        
+        values = [being.get(field) for being in beings]
+        
+        if func in ('sum', 'avg'):
+            # Tylko liczby (bez wartości logicznych i NaN)
+            numbers = [
+                value for value in values
+                if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+            ]
+            if func == 'sum':
+                return float(sum(numbers))
+            return sum(numbers) / len(numbers) if numbers else None
+        
+        # min / max w porządku SortedIndex (liczby przed napisami)
+        keyed = [(sort_key(value), value) for value in values if sort_key(value) is not None]
+        if not keyed:
+            return None
+        select = min if func == 'min' else max
+        return select(keyed, key=lambda item: item[0])[1]
+    
     def get_memory_stats(self) -> Dict[str, Any]:
         """Zwraca statystyki użycia pamięci"""
-        import sys
+        if self._columns is not None:
+            with self._columns_lock:
+                total_size = self._columns.memory_bytes()
+            stats = {
+                'layout': self.layout,
+                'beings_count': len(self._columns),
+                'next_soul_id': self.next_soul_id,
+                'columns': {
+                    'numeric': list(self._columns.numeric_fields),
+                    'categorical': list(self._columns.categorical_fields),
+                    'timestamp': list(self._columns.timestamp_fields)
+                },
+                'estimated_memory_bytes': total_size,
+                'estimated_memory_mb': total_size / (1024 * 1024)
+            }
+            if self._journal is not None:
+                stats['journal'] = self._journal.get_stats()
+            return stats
         
-        total_size = sys.getsizeof(self.beings)
-        for being in self.beings.values():
-            total_size += sys.getsizeof(being)
+        # Próbka pod krótką blokadą - zapisy zmieniają self.beings pod blokadami pasów.
+        # Byty rozłożone równo wzdłuż kolejności manifestacji, nie tylko najstarsze.
+        with self._exclusive():
+            beings_count = len(self.beings)
+            step = max(1, len(self._order) // self.MEMORY_SAMPLE)
+            sample = [
+                (soul_id, self.beings[soul_id])
+                for soul_id in self._order[::step] if soul_id in self.beings
+            ]
+            containers_size = sys.getsizeof(self.beings) + sys.getsizeof(self._order)
+            if self._records is not None:
+                containers_size += sys.getsizeof(self._records.layouts) + sys.getsizeof(self._records.strings)
         
-        return {
-            'beings_count': len(self.beings),
+        # Byty nie są zmieniane w miejscu (evolve tworzy nowy rekord) - próbkę można mierzyć bez blokady.
+        # Oba układy mierzone na tej samej próbce; obiekty współdzielone przez byty liczone raz.
+        if self._records is not None:
+            compact_sample = [list(item) for item in sample]
+            row_sample = [[soul_id, self._records.expand(record)] for soul_id, record in sample]
+        else:
+            pool = self._create_record_pool()
+            row_sample = [list(item) for item in sample]
+            compact_sample = [[soul_id, pool.build(being)] for soul_id, being in sample]
+        
+        row_size = estimate_population(row_sample, beings_count)
+        compact_size = estimate_population(compact_sample, beings_count)
+        total_size = containers_size + (compact_size if self._records is not None else row_size)
+        
+        stats = {
+            'layout': self.layout,
+            'beings_count': beings_count,
             'next_soul_id': self.next_soul_id,
             'indices_count': {
                 name: len(index) for name, index in self._indices.items()
             },
+            'indices': self.list_indexes(),
             'estimated_memory_bytes': total_size,
-            'estimated_memory_mb': total_size / (1024 * 1024)
+            'estimated_memory_mb': total_size / (1024 * 1024),
+            # Szacunek z próbki - bajty bytów bez kontenerów wymiaru, dla obu układów
+            'layout_estimate': {
+                'sample_size': len(sample),
+                'row_bytes': row_size,
+                'compact_bytes': compact_size,
+                'compact_savings': 1 - compact_size / row_size if row_size else 0.0
+            }
         }
+        
+        if self._records is not None:
+            stats['record_layouts'] = len(self._records.layouts)
+            stats['interned_strings'] = len(self._records.strings)
+        
+        if self._journal is not None:
+            stats['journal'] = self._journal.get_stats()
+        
+        return stats
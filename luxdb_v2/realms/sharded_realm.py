@@ -0,0 +1,377 @@
+"""
+🧩 ShardedRealm - Wymiar Dzielony na Wiele Plików SQLite
+
+Jeden plik SQLite to jeden pisarz. ShardedRealm rozkłada byty na N wymiarów SQLiteRealm
+(osobne pliki), więc zapisy do różnych shardów nie czekają na siebie nawzajem.
+
+Connection string: sharded://ścieżka?shards=4&opcja=wartość...
+- shardy: ścieżka.0.db ... ścieżka.N-1.db (końcówka .db ścieżki jest pomijana)
+- pozostałe opcje (journal_mode, codec, fts, group_commit, ...) trafiają do każdego shardu
+
+soul_id nadaje ShardedRealm, a właścicielem bytu jest shard soul_id % N. Zakresy soul_id
+rezerwowane są blokami (ID_BLOCK) w tabeli shard_sequence pierwszego shardu, więc wiele
+procesów może zapisywać do tych samych plików bez kolizji soul_id. W obrębie procesu soul_id
+rosną; między procesami i po restarcie mogą powstać przerwy (jak przy AUTOINCREMENT).
+
+Operacje punktowe (evolve, transcend, contemplate po soul_id) trafiają wprost do właściciela.
+Pozostałe zapytania wykonywane są równolegle na wszystkich shardach, a posortowane wyniki
+scalane przez k-drożne scalanie kopcem (heapq.merge) z limitem.
+
+manifest_many zapisuje część partii każdego shardu w jednej transakcji. Gdy zapis w części
+shardów się nie powiedzie, pozostałe są już zatwierdzone - ShardWriteError zawiera zapisane
+byty i błędy shardów.
+
+Liczba shardów jest częścią układu danych - zmiana wymaga przeniesienia bytów.
+"""
+
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .base_realm import BaseRealm
+from .sqlite_realm import SQLiteRealm
+
+
+class ShardWriteError(RuntimeError):
+    """Zapis partii nie powiódł się w części shardów - zapisy w pozostałych są zatwierdzone"""
+
+    def __init__(self, manifested: List[Dict[str, Any]], errors: Dict[int, Exception]):
+        self.manifested = manifested
+        self.errors = errors
+        failed = ', '.join(f"{index}: {error}" for index, error in sorted(errors.items()))
+        super().__init__(f"Zapis nie powiódł się w shardach {failed} - zapisano {len(manifested)} bytów")
+
+
+class ShardedRealm(BaseRealm):
+    """
+    Wymiar podzielony na shardy SQLiteRealm według soul_id
+    """
+
+    # Pula wątków AsyncRealm - zapisy do różnych shardów mogą iść równolegle
+    ASYNC_WORKERS = 4
+
+    # Opcje samego ShardedRealm - nie są przekazywane do shardów
+    OWN_OPTIONS = ('shards',)
+
+    # Liczba soul_id rezerwowanych naraz we wspólnej tabeli shard_sequence
+    ID_BLOCK = 1000
+    SEQUENCE_TABLE = 'shard_sequence'
+
+    def __init__(self, name: str, connection_string: str, astral_engine):
+        super().__init__(name, connection_string, astral_engine)
+
+        path = connection_string.split('?', 1)[0]
+        if path.startswith('sharded://'):
+            path = path[10:]
+        if not path or path == ':memory:':
+            raise ValueError("ShardedRealm wymaga ścieżki plików shardów")
+        self.base_path = path[:-3] if path.endswith('.db') else path
+
+        self.shard_count = int(self.options.get('shards', 4))
+        if self.shard_count < 1:
+            raise ValueError("Liczba shardów musi być dodatnia")
+
+        shard_options = urlencode({key: value for key, value in self.options.items() if key not in self.OWN_OPTIONS})
+        self.shards: List[SQLiteRealm] = [
+            SQLiteRealm(
+                f"{name}#{index}",
+                f"sqlite://{self.shard_path(index)}" + (f"?{shard_options}" if shard_options else ''),
+                astral_engine
+            )
+            for index in range(self.shard_count)
+        ]
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Zarezerwowany, jeszcze nienadany zakres soul_id [_next_soul_id, _reserved_end)
+        self._next_soul_id = 0
+        self._reserved_end = 0
+        self.connect()
+
+    def shard_path(self, index: int) -> str:
+        return f"{self.base_path}.{index}.db"
+
+    def shard_for(self, soul_id: Any) -> SQLiteRealm:
+        """Zwraca shard będący właścicielem bytu"""
+        return self.shards[int(soul_id) % self.shard_count]
+
+    def connect(self) -> bool:
+        """Łączy wszystkie shardy i ustala następne wolne soul_id"""
+        try:
+            for shard in self.shards:
+                if not shard.connection and not shard.connect():
+                    raise RuntimeError(f"Nie udało się połączyć shardu {shard.name}")
+
+            # sqlite_sequence pamięta największe nadane soul_id, także usuniętych bytów -
+            # początek sekwencji dla plików sprzed shard_sequence (i nigdy jej nie cofa)
+            first_free = 1 + max(shard.last_soul_id() for shard in self.shards)
+            self.shards[0]._write(
+                lambda cursor: SQLiteRealm.seed_sequence(cursor, self.SEQUENCE_TABLE, first_free)
+            )
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.shard_count,
+                                                    thread_name_prefix=f"luxdb-shard-{self.name}")
+
+            self.is_connected = True
+            self.engine.logger.info(f"🧩 Połączono z wymiarem {self.name} ({self.shard_count} shardów)")
+            return True
+
+        except Exception as e:
+            self.engine.logger.error(f"❌ Błąd połączenia z wymiarem {self.name}: {e}")
+            return False
+
+    def disconnect(self) -> bool:
+        """Rozłącza wszystkie shardy"""
+        try:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+            disconnected = all([shard.disconnect() for shard in self.shards])
+            self.is_connected = False
+            self.engine.logger.info(f"🧩 Rozłączono z wymiarem {self.name}")
+            return disconnected
+
+        except Exception as e:
+            self.engine.logger.error(f"❌ Błąd rozłączania z wymiarem {self.name}: {e}")
+            return False
+
+    def _require_connection(self) -> None:
+        if not self.is_connected:
+            raise RuntimeError("Brak połączenia z wymiarem")
+
+    def _allocate_soul_ids(self, count: int) -> range:
+        """Nadaje count kolejnych soul_id z zakresu zarezerwowanego przez ten proces"""
+        with self._lock:
+            if self._reserved_end - self._next_soul_id < count:
+                # Resztka poprzedniego bloku przepada - przerwa w soul_id jak po restarcie
+                size = max(count, self.ID_BLOCK)
+                first = self.shards[0]._write(
+                    lambda cursor: SQLiteRealm.reserve_sequence(cursor, self.SEQUENCE_TABLE, size)
+                )
+                self._next_soul_id, self._reserved_end = first, first + size
+
+            first = self._next_soul_id
+            self._next_soul_id += count
+        return range(first, first + count)
+
+    def _fan_out(self, operation: Callable[[SQLiteRealm], Any]) -> List[Any]:
+        """Wykonuje operację na wszystkich shardach równolegle - wyniki w kolejności shardów"""
+        if self.shard_count == 1:
+            return [operation(self.shards[0])]
+        return list(self._executor.map(operation, self.shards))
+
+    def manifest(self, being_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Manifestuje byt w shardzie wyznaczonym przez nowe soul_id"""
+        self._require_connection()
+
+        soul_id = self._allocate_soul_ids(1)[0]
+        result = self.shard_for(soul_id).manifest(being_data, soul_id=soul_id)
+        self._being_count += 1
+        return result
+
+    def manifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Manifestuje wiele bytów - partia dzielona między shardy i zapisywana w nich równolegle
+
+        Args:
+            beings: Dane bytów (dowolny iterowalny, także generator)
+            batch_size: Liczba bytów w jednej partii (przed podziałem na shardy)
+
+        Returns:
+            Lista zmanifestowanych bytów w kolejności wejścia
+        """
+        self._require_connection()
+
+        manifested = []
+        for batch in self._batches(beings, batch_size):
+            soul_ids = self._allocate_soul_ids(len(batch))
+
+            # Pozycje partii przypadające na każdy shard
+            positions: List[List[int]] = [[] for _ in self.shards]
+            for position, soul_id in enumerate(soul_ids):
+                positions[soul_id % self.shard_count].append(position)
+
+            def write(shard_index: int) -> List[Dict[str, Any]]:
+                shard_positions = positions[shard_index]
+                if not shard_positions:
+                    return []
+                return self.shards[shard_index].manifest_many(
+                    [batch[position] for position in shard_positions],
+                    batch_size=len(shard_positions),
+                    soul_ids=[soul_ids[position] for position in shard_positions]
+                )
+
+            # Każdy shard zapisuje swoją część w jednej transakcji - czekaj na wszystkie
+            futures = [self._executor.submit(write, shard_index) for shard_index in range(self.shard_count)]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+            errors: Dict[int, Exception] = {}
+            for shard_index, future in enumerate(futures):
+                try:
+                    written = future.result()
+                except Exception as e:
+                    errors[shard_index] = e
+                    continue
+                for position, being in zip(positions[shard_index], written):
+                    results[position] = being
+
+            committed = [being for being in results if being is not None]
+            manifested.extend(committed)
+            self._being_count += len(committed)
+
+            if errors:
+                self.engine.logger.error(f"❌ Częściowy zapis partii w wymiarze {self.name}: shardy {sorted(errors)}")
+                raise ShardWriteError(manifested, errors)
+
+        return manifested
+
+    def _point_soul_id(self, conditions: Dict[str, Any]) -> Optional[int]:
+        """soul_id z warunku równości - zapytanie trafia wtedy do jednego shardu"""
+        soul_id = conditions.get('soul_id')
+        if soul_id is None or isinstance(soul_id, bool):
+            return None
+        try:
+            return int(soul_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _merge_key(self, conditions: Dict[str, Any]) -> Tuple[Callable[[Dict[str, Any]], tuple], bool]:
+        """
+        Klucz scalania zgodny z ORDER BY shardów (pole, potem soul_id) i kierunek
+
+        Kolejność typów jak w SQLite: NULL < liczby < tekst < pozostałe.
+        """
+        field, descending = self.shards[0]._order_spec(conditions)
+
+        def key(being: Dict[str, Any]) -> tuple:
+            value = SQLiteRealm._essence_value(being, field) if field not in being else being[field]
+            if value is None:
+                ranked = (0, 0)
+            elif isinstance(value, (int, float)):
+                ranked = (1, value)
+            elif isinstance(value, str):
+                ranked = (2, value)
+            else:
+                ranked = (3, repr(value))
+            return ranked + (being.get('soul_id') or 0,)
+
+        return key, descending
+
+    def _merge(self, results: List[Iterable[Dict[str, Any]]], conditions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Scala posortowane wyniki shardów kopcem i przycina do limitu"""
+        key, descending = self._merge_key(conditions)
+        merged = heapq.merge(*results, key=key, reverse=descending)
+
+        if 'limit' in conditions:
+            return islice(merged, max(0, int(conditions['limit'])))
+        return merged
+
+    def contemplate(self, intention: str, **conditions) -> List[Dict[str, Any]]:
+        """
+        Kontempluje byty - równolegle na wszystkich shardach, wyniki scalane w kolejności order_by
+
+        Warunek soul_id kieruje zapytanie do jednego shardu. Każdy shard stosuje limit
+        sam, więc scalanie czyta najwyżej limit bytów z każdego.
+        """
+        self._require_connection()
+
+        soul_id = self._point_soul_id(conditions)
+        if soul_id is not None:
+            return self.shard_for(soul_id).contemplate(intention, **conditions)
+
+        results = self._fan_out(lambda shard: shard.contemplate(intention, **conditions))
+        beings = list(self._merge(results, conditions))
+
+        self.engine.logger.debug(f"🔍 Kontemplacja '{intention}' na {self.shard_count} shardach zwróciła {len(beings)} bytów")
+        return beings
+
+    def contemplate_iter(self, intention: str, batch_size: int = 500, **conditions) -> Iterator[Dict[str, Any]]:
+        """
+        Strumieniuje wyniki - scalanie kopcem strumieni contemplate_iter wszystkich shardów
+
+        Każdy shard zajmuje połączenie czytelnika do wyczerpania (lub zamknięcia) iteratora.
+        """
+        self._require_connection()
+
+        soul_id = self._point_soul_id(conditions)
+        if soul_id is not None:
+            yield from self.shard_for(soul_id).contemplate_iter(intention, batch_size, **conditions)
+            return
+
+        streams = [shard.contemplate_iter(intention, batch_size, **conditions) for shard in self.shards]
+        try:
+            yield from self._merge(streams, conditions)
+        finally:
+            for stream in streams:
+                stream.close()
+
+    def search(self, text: str, limit: int = 20, prefix: bool = False, raw: bool = False,
+               **conditions) -> List[Dict[str, Any]]:
+        """
+        Wyszukuje pełnotekstowo na wszystkich shardach - wyniki scalane po search_rank
+
+        bm25 liczony jest ze statystyk każdego shardu osobno - ranking między shardami jest przybliżony.
+        """
+        self._require_connection()
+
+        results = self._fan_out(lambda shard: shard.search(text, limit, prefix, raw, **conditions))
+        return list(islice(heapq.merge(*results, key=lambda being: being['search_rank']), max(0, int(limit))))
+
+    def transcend(self, being_id: int) -> bool:
+        """Transcenduje byt w shardzie-właścicielu"""
+        self._require_connection()
+
+        transcended = self.shard_for(being_id).transcend(being_id)
+        if transcended:
+            self._being_count = max(0, self._being_count - 1)
+        return transcended
+
+    def evolve(self, being_id: int, new_data: Dict[str, Any],
+               return_being: bool = True) -> Optional[Dict[str, Any]]:
+        """Ewoluuje byt w shardzie-właścicielu (zob. SQLiteRealm.evolve)"""
+        self._require_connection()
+        return self.shard_for(being_id).evolve(being_id, new_data, return_being=return_being)
+
+    def create_essence_index(self, field: str) -> str:
+        """Tworzy indeks esencji na wszystkich shardach"""
+        return self._fan_out(lambda shard: shard.create_essence_index(field))[0]
+
+    def drop_essence_index(self, field: str) -> bool:
+        """Usuwa indeks esencji ze wszystkich shardów"""
+        return any(self._fan_out(lambda shard: shard.drop_essence_index(field)))
+
+    def list_essence_indexes(self) -> List[str]:
+        return self.shards[0].list_essence_indexes()
+
+    def estimate_count(self, **conditions) -> int:
+        return sum(self._fan_out(lambda shard: shard.estimate_count(**conditions)))
+
+    def optimize(self) -> None:
+        self._fan_out(lambda shard: shard.optimize())
+
+    def count_beings(self) -> int:
+        """Suma liczności shardów (utrzymywanych przez triggery)"""
+        if not self.is_connected:
+            return self._being_count
+        return sum(self._fan_out(lambda shard: shard.count_beings()))
+
+    def is_healthy(self) -> bool:
+        return self.is_connected and all(shard.is_healthy() for shard in self.shards)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Zwraca status wymiaru wraz z licznościami shardów"""
+        status = super().get_status()
+        status['shards'] = [
+            {
+                'name': shard.name,
+                'path': shard.db_path,
+                'connected': shard.is_connected,
+                'being_count': shard.count_beings() if shard.is_connected else 0,
+                'size_bytes': os.path.getsize(shard.db_path) if os.path.exists(shard.db_path) else 0
+            }
+            for shard in self.shards
+        ]
+        return status
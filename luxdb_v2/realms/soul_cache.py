@@ -0,0 +1,116 @@
+"""
+🔥 SoulCache - Pamięć Podręczna Gorących Dusz
+
+Ograniczony cache LRU z TTL dla SoulRealm.get_soul (sqlite://...?soul_cache_size=256&soul_cache_ttl=30).
+Dusze takie jak Soul #0 czy mistrzowie portali są czytane znacznie częściej niż zmieniane -
+trafienie w cache pomija SELECT i dekodowanie pól złożonych.
+
+Zapisy SoulRealm unieważniają wpisy. Licznik generacji chroni przed wyścigiem:
+odczyt, który zaczął się przed unieważnieniem, nie zapisze do cache nieaktualnej duszy.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class SoulCache:
+    """
+    Cache LRU zdekodowanych dusz
+
+    Zwraca kopie - wywołujący mogą modyfikować otrzymane słowniki bez psucia cache.
+    max_size = 0 wyłącza cache, ttl = 0 wyłącza wygasanie.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0):
+        if max_size < 0:
+            raise ValueError("Rozmiar cache dusz nie może być ujemny")
+        if ttl < 0:
+            raise ValueError("TTL cache dusz nie może być ujemny")
+
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def generation(self) -> int:
+        """Generacja odczytana przed zapytaniem do bazy - przekazywana do put"""
+        return self._generation
+
+    def get(self, soul_id: str) -> Optional[Dict[str, Any]]:
+        """Zwraca kopię duszy z cache lub None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(soul_id)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, soul = entry
+            if self.ttl and expires_at < time.monotonic():
+                del self._entries[soul_id]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(soul_id)
+            self._hits += 1
+
+        return copy.deepcopy(soul)
+
+    def put(self, soul_id: str, soul: Dict[str, Any], generation: int) -> None:
+        """Zapisuje duszę, o ile od odczytu generacja nie zmieniła się (brak zapisu w międzyczasie)"""
+        if not self.enabled:
+            return
+
+        soul = copy.deepcopy(soul)
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            self._entries[soul_id] = (time.monotonic() + self.ttl, soul)
+            self._entries.move_to_end(soul_id)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, soul_id: str) -> None:
+        """Usuwa duszę z cache - wywoływane przy każdym zapisie duszy"""
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(soul_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'invalidations': self._invalidations
+        }
@@ -3,34 +3,72 @@
 🕯️ SoulRealm - Wymiar Dusz
 
 Przechowuje reprezentacje dusz w bazie danych zamiast w kodzie.
-Każda dusza to JSON z definicją typu, roli, intencji i pamięci.
+Każda dusza to definicja typu, roli, intencji i pamięci - pola złożone
+serializowane kodekiem wymiaru (domyślnie JSON, zob. essence_codec).
+
+Intencje i wspomnienia żyją w osobnych tabelach:
+- soul_intents: indeksowana tabela łącząca - wyszukiwanie po intencji to odczyt indeksu
+- soul_memories: wspomnienia tylko dopisywane; add_memory_to_soul przycina starsze ponad
+  limit typu (opcja memory_retention), pamięć zapisana w całości (manifest_soul,
+  update_soul_memory) nie jest przycinana
+Dopisanie wspomnienia to jeden INSERT zamiast przepisania całej pamięci duszy.
+
+get_soul korzysta z cache LRU gorących dusz (opcje soul_cache_size, soul_cache_ttl),
+unieważnianego przez każdy zapis duszy w tym wymiarze. Zapisy z innych procesów
+są widoczne najpóźniej po TTL.
 """
 
-import json
-from typing import Dict, Any, List, Optional
+import sqlite3
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
-from .sqlite_realm import SqliteRealm
+from .sqlite_realm import SQLiteRealm
+from .soul_cache import SoulCache
 
 
-class SoulRealm(SqliteRealm):
+class SoulRealm(SQLiteRealm):
     """
     Wymiar dusz - przechowuje dusze jako struktury JSON w bazie
     """
     
+    # Pola złożone serializowane kodekiem wymiaru (nazwa -> wartość domyślna)
+    ENCODED_FIELDS = {'intents': list, 'memory': dict, 'sockets': dict}
+    
+    # Domyślna liczba wspomnień zachowywanych dla każdego typu
+    MEMORY_RETENTION = 100
+    
+    # Liczba dusz w jednym zapytaniu IN przy dołączaniu intencji i wspomnień
+    ATTACH_CHUNK = 500
+    
+    # Domyślny rozmiar (liczba dusz) i TTL (sekundy) cache get_soul
+    SOUL_CACHE_SIZE = 256
+    SOUL_CACHE_TTL = 30.0
+    
     def __init__(self, name: str, connection_string: str, astral_engine):
-        super().__init__(name, connection_string, astral_engine)
+        # Schemat przed super().__init__ - konstruktor SQLiteRealm wywołuje connect()
         self.soul_schema = {
             'id': 'TEXT PRIMARY KEY',
             'type': 'TEXT NOT NULL',
             'role': 'TEXT',
-            'intents': 'TEXT',  # JSON array
-            'memory': 'TEXT',   # JSON object
+            'intents': 'TEXT',  # przestarzałe - intencje w soul_intents
+            'memory': 'TEXT',   # pamięć niebędąca listą wspomnień (wspomnienia w soul_memories)
             'sockets': 'TEXT',  # JSON object
             'created_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
             'updated_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
-            'status': 'TEXT DEFAULT "dormant"',
+            'status': "TEXT DEFAULT 'dormant'",
             'energy_level': 'REAL DEFAULT 100.0'
         }
+        super().__init__(name, connection_string, astral_engine)
+        
+        self.soul_cache = SoulCache(
+            max_size=int(self.options.get('soul_cache_size', self.SOUL_CACHE_SIZE)),
+            ttl=float(self.options.get('soul_cache_ttl', self.SOUL_CACHE_TTL))
+        )
+    
+    @property
+    def memory_retention(self) -> int:
+        """Liczba wspomnień zachowywanych dla każdego typu (?memory_retention=...)"""
+        # Właściwość - konstruktor SQLiteRealm łączy się, zanim SoulRealm ustawi atrybuty
+        return int(self.options.get('memory_retention', self.MEMORY_RETENTION))
     
     def connect(self) -> bool:
         """Nawiązuje połączenie i tworzy tabelę dusz"""
@@ -47,8 +85,32 @@ class SoulRealm(SqliteRealm):
                 )
                 """
                 
-                self.cursor.execute(create_table_sql)
-                self.connection.commit()
+                with self._lock:
+                    cursor = self.connection.cursor()
+                    cursor.execute(create_table_sql)
+                    cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS soul_intents (
+                        soul_id TEXT NOT NULL,
+                        intent TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        PRIMARY KEY (soul_id, intent)
+                    ) WITHOUT ROWID
+                    """)
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_soul_intents_intent ON soul_intents(intent)")
+                    cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS soul_memories (
+                        memory_id INTEGER PRIMARY KEY,
+                        soul_id TEXT NOT NULL,
+                        memory_type TEXT NOT NULL,
+                        timestamp TEXT,  -- NULL: wpis zapisany w całości w data
+                        data
+                    )
+                    """)
+                    cursor.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_soul_memories_type ON soul_memories(soul_id, memory_type, memory_id)"
+                    )
+                    self._migrate_embedded(cursor)
+                    self.connection.commit()
                 
                 self.engine.logger.info(f"🕯️ SoulRealm '{self.name}' połączony i gotowy")
                 return True
@@ -71,9 +133,7 @@ class SoulRealm(SqliteRealm):
             
             soul_type = soul_data.get('type', 'unknown')
             role = soul_data.get('role', '')
-            intents = json.dumps(soul_data.get('intents', []))
-            memory = json.dumps(soul_data.get('memory', {}))
-            sockets = json.dumps(soul_data.get('sockets', {}))
+            sockets = self.encode_essence(soul_data.get('sockets', {}))
             status = soul_data.get('status', 'dormant')
             energy_level = soul_data.get('energy_level', 100.0)
             
@@ -84,10 +144,20 @@ class SoulRealm(SqliteRealm):
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             """
             
-            self.cursor.execute(insert_sql, (
-                soul_id, soul_type, role, intents, memory, sockets, status, energy_level
-            ))
-            self.connection.commit()
+            with self._lock:
+                try:
+                    cursor = self.connection.cursor()
+                    static_memory = self._replace_memory(cursor, soul_id, soul_data.get('memory', {}))
+                    cursor.execute(insert_sql, (
+                        soul_id, soul_type, role, None, static_memory, sockets, status, energy_level
+                    ))
+                    self._replace_intents(cursor, soul_id, soul_data.get('intents', []))
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+                finally:
+                    self.soul_cache.invalidate(soul_id)
             
             # Pobierz pełną duszę z bazy
             manifested_soul = self.get_soul(soul_id)
@@ -104,14 +174,21 @@ class SoulRealm(SqliteRealm):
         if not self.is_connected:
             self.connect()
         
+        cached = self.soul_cache.get(soul_id)
+        if cached is not None:
+            return cached
+        
         try:
+            generation = self.soul_cache.generation
             select_sql = "SELECT * FROM souls WHERE id = ?"
-            self.cursor.execute(select_sql, (soul_id,))
-            row = self.cursor.fetchone()
+            with self._reader() as connection:
+                row = connection.execute(select_sql, (soul_id,)).fetchone()
+                if not row:
+                    return None
+                soul = self._load_souls(connection, [row])[0]
             
-            if row:
-                return self._row_to_soul(row)
-            return None
+            self.soul_cache.put(soul_id, soul, generation)
+            return soul
             
         except Exception as e:
             self.engine.logger.error(f"❌ Błąd pobierania duszy {soul_id}: {e}")
@@ -140,16 +217,16 @@ class SoulRealm(SqliteRealm):
                 params.append(status)
             
             if has_intent:
-                conditions.append("intents LIKE ?")
-                params.append(f'%"{has_intent}"%')
+                # Odczyt indeksu idx_soul_intents_intent
+                conditions.append("id IN (SELECT soul_id FROM soul_intents WHERE intent = ?)")
+                params.append(has_intent)
             
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
             select_sql = f"SELECT * FROM souls{where_clause} ORDER BY created_at DESC"
             
-            self.cursor.execute(select_sql, params)
-            rows = self.cursor.fetchall()
-            
-            return [self._row_to_soul(row) for row in rows]
+            with self._reader() as connection:
+                rows = connection.execute(select_sql, params).fetchall()
+                return self._load_souls(connection, rows)
             
         except Exception as e:
             self.engine.logger.error(f"❌ Błąd wyszukiwania dusz: {e}")
@@ -179,10 +256,12 @@ class SoulRealm(SqliteRealm):
             WHERE id = ?
             """
             
-            self.cursor.execute(update_sql, (new_status, soul_id))
-            self.connection.commit()
+            with self._lock:
+                updated = self.connection.execute(update_sql, (new_status, soul_id)).rowcount
+                self.connection.commit()
+                self.soul_cache.invalidate(soul_id)
             
-            if self.cursor.rowcount > 0:
+            if updated > 0:
                 self.engine.logger.info(f"🕯️ Dusza '{soul_id}' zmienila status na '{new_status}'")
                 return True
             else:
@@ -194,34 +273,61 @@ class SoulRealm(SqliteRealm):
             return False
     
     def add_memory_to_soul(self, soul_id: str, memory_type: str, memory_data: Any) -> bool:
-        """Dodaje wspomnienie do duszy"""
-        soul = self.get_soul(soul_id)
-        if not soul:
-            return False
+        """Dodaje wspomnienie do duszy - jeden INSERT, starsze ponad limit typu są przycinane"""
+        if not self.is_connected:
+            self.connect()
         
         try:
-            memory = json.loads(soul['memory'])
-            
-            if memory_type not in memory:
-                memory[memory_type] = []
-            
-            memory[memory_type].append({
-                'timestamp': datetime.now().isoformat(),
-                'data': memory_data
-            })
-            
-            # Ogranicz liczbę wspomnień (ostatnie 100)
-            if len(memory[memory_type]) > 100:
-                memory[memory_type] = memory[memory_type][-100:]
-            
-            return self.update_soul_memory(soul_id, memory)
+            with self._lock:
+                try:
+                    cursor = self.connection.cursor()
+                    cursor.execute("""
+                    INSERT INTO soul_memories (soul_id, memory_type, timestamp, data)
+                    SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM souls WHERE id = ?)
+                    """, (soul_id, memory_type, datetime.now().isoformat(), self.encode_essence(memory_data), soul_id))
+                    
+                    added = cursor.rowcount > 0
+                    if added:
+                        self._trim_memory(cursor, soul_id, memory_type)
+                        cursor.execute("UPDATE souls SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (soul_id,))
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+                finally:
+                    self.soul_cache.invalidate(soul_id)
+            
+            if not added:
+                self.engine.logger.warning(f"⚠️ Nie znaleziono duszy '{soul_id}'")
+            return added
             
         except Exception as e:
             self.engine.logger.error(f"❌ Błąd dodawania pamięci do duszy {soul_id}: {e}")
             return False
     
+    def get_soul_memories(self, soul_id: str, memory_type: str,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Zwraca wspomnienia danego typu (od najstarszych) bez wczytywania całej duszy"""
+        if not self.is_connected:
+            self.connect()
+        
+        query = """
+        SELECT timestamp, data FROM soul_memories
+        WHERE soul_id = ? AND memory_type = ?
+        ORDER BY memory_id DESC
+        """
+        params: List[Any] = [soul_id, memory_type]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(0, int(limit)))
+        
+        with self._reader() as connection:
+            rows = connection.execute(query, params).fetchall()
+        
+        return [self._memory_entry(row['timestamp'], row['data']) for row in reversed(rows)]
+    
     def update_soul_memory(self, soul_id: str, memory: Dict[str, Any]) -> bool:
-        """Aktualizuje pamięć duszy"""
+        """Zastępuje całą pamięć duszy"""
         if not self.is_connected:
             self.connect()
         
@@ -232,30 +338,178 @@ class SoulRealm(SqliteRealm):
             WHERE id = ?
             """
             
-            self.cursor.execute(update_sql, (json.dumps(memory), soul_id))
-            self.connection.commit()
-            
-            return self.cursor.rowcount > 0
+            with self._lock:
+                try:
+                    cursor = self.connection.cursor()
+                    if not cursor.execute("SELECT 1 FROM souls WHERE id = ?", (soul_id,)).fetchone():
+                        return False
+                    static_memory = self._replace_memory(cursor, soul_id, memory)
+                    updated = cursor.execute(update_sql, (static_memory, soul_id)).rowcount
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+                finally:
+                    self.soul_cache.invalidate(soul_id)
+            
+            return updated > 0
             
         except Exception as e:
             self.engine.logger.error(f"❌ Błąd aktualizacji pamięci duszy {soul_id}: {e}")
             return False
     
+    def add_intent_to_soul(self, soul_id: str, intent: str) -> bool:
+        """Dodaje intencję do duszy (bez duplikatów)"""
+        if not self.is_connected:
+            self.connect()
+        
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+            INSERT OR IGNORE INTO soul_intents (soul_id, intent, position)
+            SELECT ?, ?, (SELECT ifnull(MAX(position), -1) + 1 FROM soul_intents WHERE soul_id = ?)
+            WHERE EXISTS (SELECT 1 FROM souls WHERE id = ?)
+            """, (soul_id, intent, soul_id, soul_id))
+            added = cursor.rowcount > 0
+            self.connection.commit()
+            self.soul_cache.invalidate(soul_id)
+        
+        return added
+    
+    def remove_intent_from_soul(self, soul_id: str, intent: str) -> bool:
+        """Usuwa intencję duszy"""
+        if not self.is_connected:
+            self.connect()
+        
+        with self._lock:
+            removed = self.connection.execute(
+                "DELETE FROM soul_intents WHERE soul_id = ? AND intent = ?", (soul_id, intent)
+            ).rowcount > 0
+            self.connection.commit()
+            self.soul_cache.invalidate(soul_id)
+        
+        return removed
+    
+    def _replace_intents(self, cursor: sqlite3.Cursor, soul_id: str, intents: Iterable[str]) -> None:
+        """Zastępuje intencje duszy (kolejność zachowana w position)"""
+        cursor.execute("DELETE FROM soul_intents WHERE soul_id = ?", (soul_id,))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO soul_intents (soul_id, intent, position) VALUES (?, ?, ?)",
+            [(soul_id, intent, position) for position, intent in enumerate(intents)]
+        )
+    
+    def _replace_memory(self, cursor: sqlite3.Cursor, soul_id: str, memory: Dict[str, Any]) -> Optional[Any]:
+        """
+        Zastępuje pamięć duszy
+        
+        Listy trafiają do soul_memories (puste zostają jako znacznik typu),
+        pozostałe wartości do kolumny memory - zwracana jest ich zakodowana postać.
+        """
+        cursor.execute("DELETE FROM soul_memories WHERE soul_id = ?", (soul_id,))
+        
+        static = {}
+        for memory_type, entries in (memory or {}).items():
+            if not isinstance(entries, list) or not entries:
+                static[memory_type] = entries
+                continue
+            
+            rows = []
+            for entry in entries:
+                if isinstance(entry, dict) and set(entry) == {'timestamp', 'data'} and entry['timestamp'] is not None:
+                    rows.append((soul_id, memory_type, entry['timestamp'], self.encode_essence(entry['data'])))
+                else:
+                    # Wpis w innym kształcie - zapisany w całości
+                    rows.append((soul_id, memory_type, None, self.encode_essence(entry)))
+            cursor.executemany(
+                "INSERT INTO soul_memories (soul_id, memory_type, timestamp, data) VALUES (?, ?, ?, ?)", rows
+            )
+        
+        return self.encode_essence(static) if static else None
+    
+    def _trim_memory(self, cursor: sqlite3.Cursor, soul_id: str, memory_type: str) -> None:
+        """Usuwa wspomnienia starsze niż ostatnie memory_retention danego typu"""
+        cursor.execute("""
+        DELETE FROM soul_memories
+        WHERE soul_id = ? AND memory_type = ? AND memory_id <= (
+            SELECT memory_id FROM soul_memories
+            WHERE soul_id = ? AND memory_type = ?
+            ORDER BY memory_id DESC LIMIT 1 OFFSET ?
+        )
+        """, (soul_id, memory_type, soul_id, memory_type, self.memory_retention))
+    
+    def _memory_entry(self, timestamp: Optional[str], data: Any) -> Any:
+        """Odtwarza wpis pamięci z wiersza soul_memories"""
+        value = self.decode_essence(data)
+        if timestamp is None:
+            return value
+        return {'timestamp': timestamp, 'data': value}
+    
+    def _migrate_embedded(self, cursor: sqlite3.Cursor) -> None:
+        """Przenosi intencje i listy wspomnień zapisane w wierszach souls do tabel znormalizowanych"""
+        rows = cursor.execute(
+            "SELECT id, intents, memory FROM souls WHERE intents IS NOT NULL"
+        ).fetchall()
+        
+        for row in rows:
+            soul_id = row['id']
+            try:
+                intents = self.decode_essence(row['intents']) if row['intents'] else []
+                memory = self.decode_essence(row['memory']) if row['memory'] else {}
+            except ValueError as e:
+                self.engine.logger.warning(f"⚠️ Pominięto migrację duszy {soul_id}: {e}")
+                continue
+            
+            self._replace_intents(cursor, soul_id, intents)
+            static_memory = self._replace_memory(cursor, soul_id, memory)
+            cursor.execute("UPDATE souls SET intents = NULL, memory = ? WHERE id = ?", (static_memory, soul_id))
+        
+        if rows:
+            self.engine.logger.info(f"🕯️ Przeniesiono intencje i pamięć {len(rows)} dusz do tabel soul_intents/soul_memories")
+    
+    def _load_souls(self, connection: sqlite3.Connection, rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """Konwertuje wiersze na dusze i dołącza intencje oraz wspomnienia (zapytania per porcja dusz)"""
+        souls = [self._row_to_soul(row) for row in rows]
+        by_id = {soul['id']: soul for soul in souls}
+        ids = list(by_id)
+        
+        for start in range(0, len(ids), self.ATTACH_CHUNK):
+            chunk = ids[start:start + self.ATTACH_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            
+            for intent_row in connection.execute(
+                f"SELECT soul_id, intent FROM soul_intents WHERE soul_id IN ({placeholders}) ORDER BY soul_id, position",
+                chunk
+            ):
+                by_id[intent_row['soul_id']]['intents'].append(intent_row['intent'])
+            
+            for memory_row in connection.execute(
+                f"SELECT soul_id, memory_type, timestamp, data FROM soul_memories "
+                f"WHERE soul_id IN ({placeholders}) ORDER BY memory_id",
+                chunk
+            ):
+                memory = by_id[memory_row['soul_id']]['memory']
+                entries = memory.get(memory_row['memory_type'])
+                if not isinstance(entries, list):
+                    entries = memory[memory_row['memory_type']] = []
+                try:
+                    entries.append(self._memory_entry(memory_row['timestamp'], memory_row['data']))
+                except ValueError as e:
+                    self.engine.logger.warning(f"⚠️ Błąd dekodowania wspomnienia duszy {memory_row['soul_id']}: {e}")
+        
+        return souls
+    
     def _row_to_soul(self, row) -> Dict[str, Any]:
-        """Konwertuje wiersz z bazy na strukturę duszy"""
-        columns = [desc[0] for desc in self.cursor.description]
-        soul_dict = dict(zip(columns, row))
+        """Konwertuje wiersz z bazy na strukturę duszy (intencje i wspomnienia dołącza _load_souls)"""
+        soul_dict = dict(row)
         
-        # Parsuj JSON fields
+        # Dekoduj pola złożone kodekiem, którym zostały zapisane
         try:
-            soul_dict['intents'] = json.loads(soul_dict['intents']) if soul_dict['intents'] else []
-            soul_dict['memory'] = json.loads(soul_dict['memory']) if soul_dict['memory'] else {}
-            soul_dict['sockets'] = json.loads(soul_dict['sockets']) if soul_dict['sockets'] else {}
-        except json.JSONDecodeError as e:
-            self.engine.logger.warning(f"⚠️ Błąd parsowania JSON dla duszy {soul_dict['id']}: {e}")
-            soul_dict['intents'] = []
-            soul_dict['memory'] = {}
-            soul_dict['sockets'] = {}
+            for field, default in self.ENCODED_FIELDS.items():
+                soul_dict[field] = self.decode_essence(soul_dict[field]) if soul_dict[field] else default()
+        except ValueError as e:
+            self.engine.logger.warning(f"⚠️ Błąd dekodowania duszy {soul_dict['id']}: {e}")
+            for field, default in self.ENCODED_FIELDS.items():
+                soul_dict[field] = default()
         
         return soul_dict
     
@@ -275,12 +529,11 @@ class SoulRealm(SqliteRealm):
             FROM souls
             """
             
-            self.cursor.execute(stats_sql)
-            row = self.cursor.fetchone()
+            with self._reader() as connection:
+                row = connection.execute(stats_sql).fetchone()
             
             if row:
-                columns = [desc[0] for desc in self.cursor.description]
-                stats = dict(zip(columns, row))
+                stats = dict(row)
                 stats['avg_energy'] = round(stats['avg_energy'] or 0, 2)
                 return stats
             
@@ -302,13 +555,12 @@ class SoulRealm(SqliteRealm):
             self.connect()
         
         try:
-            count_sql = "SELECT COUNT(*) FROM souls"
-            self.cursor.execute(count_sql)
-            count = self.cursor.fetchone()[0]
-            
-            delete_sql = "DELETE FROM souls"
-            self.cursor.execute(delete_sql)
-            self.connection.commit()
+            with self._lock:
+                count = self.connection.execute("DELETE FROM souls").rowcount
+                self.connection.execute("DELETE FROM soul_intents")
+                self.connection.execute("DELETE FROM soul_memories")
+                self.connection.commit()
+                self.soul_cache.clear()
             
             self.engine.logger.info(f"🧹 Usunięto {count} dusz z wymiaru")
             return count
@@ -316,3 +568,13 @@ class SoulRealm(SqliteRealm):
         except Exception as e:
             self.engine.logger.error(f"❌ Błąd czyszczenia dusz: {e}")
             return 0
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Zwraca liczniki cache gorących dusz (trafienia, chybienia, wywłaszczenia)"""
+        return self.soul_cache.get_stats()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Zwraca status wymiaru wraz ze statystykami cache dusz"""
+        status = super().get_status()
+        status['soul_cache'] = self.soul_cache.get_stats()
+        return status
@@ -0,0 +1,84 @@
+"""
+🔱 SQLitePool - Pula Połączeń Odczytu SQLite
+
+Ograniczona pula połączeń tylko do odczytu dla SQLiteRealm.
+W trybie WAL czytelnicy nie czekają na pisarza - każdy widzi ostatni zatwierdzony stan.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+from typing import Iterator, List
+
+
+class SQLiteReaderPool:
+    """
+    Pula połączeń tylko do odczytu (mode=ro)
+
+    Połączenia tworzone są leniwie, najwyżej size naraz; wątek czeka na wolne połączenie.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, busy_timeout: int = 5000):
+        if size < 1:
+            raise ValueError("Pula czytelników wymaga co najmniej jednego połączenia")
+
+        self.db_path = db_path
+        self.size = size
+        self.busy_timeout = busy_timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+
+        with self._lock:
+            self._all.append(connection)
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Wypożycza połączenie odczytu na czas bloku with"""
+        if self._closed:
+            raise RuntimeError("Pula czytelników jest zamknięta")
+
+        self._slots.acquire()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._open()
+
+            try:
+                yield connection
+            finally:
+                # Zakończ niejawną transakcję odczytu - inaczej blokuje checkpoint WAL
+                if connection.in_transaction:
+                    connection.rollback()
+                self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Zamyka wszystkie połączenia puli"""
+        self._closed = True
+        with self._lock:
+            connections, self._all = self._all, []
+        for connection in connections:
+            connection.close()
+
+    def get_stats(self) -> dict:
+        return {
+            'size': self.size,
+            'open_connections': len(self._all),
+            'idle_connections': self._idle.qsize()
+        }
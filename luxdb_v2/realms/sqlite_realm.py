@@ -3,14 +3,40 @@
 💎 SQLiteRealm - Lekki Wymiar SQLite
 
 Wymiar danych oparty na SQLite - idealny dla rozwoju i małych aplikacji
+
+Opcje connection string (sqlite://ścieżka?opcja=wartość&...):
+- journal_mode: tryb dziennika SQLite (domyślnie wal)
+- synchronous: off, normal, full lub extra (domyślnie ustawienie SQLite)
+- readers: rozmiar puli połączeń tylko do odczytu (domyślnie 4, 0 = odczyty przez pisarza)
+- busy_timeout: czas oczekiwania na blokadę w ms (domyślnie 5000)
+- group_commit: 1 = manifest/evolve/transcend zatwierdzane partiami przez wątek pisarza
+- group_commit_window: okno zbierania partii w ms (domyślnie 2)
+- group_commit_size: maksymalna liczba operacji w partii (domyślnie 256)
+- fts: indeks pełnotekstowy FTS5 - 1 (tylko soul_name) lub ścieżki essence po przecinku
+- codec: kodek esencji - json (domyślnie), msgpack, marshal lub pickle (zob. essence_codec)
+- fts_tokenizer: tokenizer FTS5 (domyślnie 'unicode61 remove_diacritics 2', 'trigram' dla podciągów)
+
+Liczności (łącznie, per realm_affinity, per przedział energii) utrzymują triggery
+w tabeli astral_stats - count_beings() i estimate_count() nie skanują bytów.
+
+Warunki contemplate() spoza kolumn tabeli trafiają do SQL jako json_extract(essence, '$.pole'),
+a create_essence_index() zakłada na takich ścieżkach indeksy wyrażeniowe. Przy kodeku binarnym
+esencja jest nieczytelna dla SQL - takie warunki sprawdzane są po odczycie, a indeksy esencji,
+sortowanie po jej polach i FTS są niedostępne.
 """
 
 import sqlite3
 import json
 import os
-from typing import Dict, Any, List, Optional, Union
+import re
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 from .base_realm import BaseRealm
+from .sqlite_pool import SQLiteReaderPool
+from .sqlite_writer import SQLiteGroupWriter
+from .essence_codec import merge_patch
 
 
 class SQLiteRealm(BaseRealm):
@@ -18,31 +44,128 @@ class SQLiteRealm(BaseRealm):
     Wymiar danych SQLite - lekki i szybki
     """
     
+    # Indeksy tabeli bytów (nazwa -> kolumna)
+    INDEXES = {
+        'idx_soul_name': 'soul_name',
+        'idx_energy_level': 'energy_level',
+        'idx_realm_affinity': 'realm_affinity',
+        'idx_manifestation_time': 'manifestation_time'
+    }
+    
+    # soul_id NULL = nadany przez AUTOINCREMENT
+    INSERT_BEING = '''
+        INSERT INTO astral_beings 
+        (soul_id, soul_name, essence, energy_level, realm_affinity, manifestation_time)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    
+    # Dedykowany wątek połączenia dla AsyncRealm
+    ASYNC_WORKERS = 1
+    
+    # Szerokość przedziału histogramu energii
+    ENERGY_BUCKET = 10
+    STATS_TRIGGERS = ('trg_stats_insert', 'trg_stats_delete', 'trg_stats_update')
+    SEARCH_TRIGGERS = ('trg_search_insert', 'trg_search_delete', 'trg_search_update')
+    FTS_TOKENIZERS = ('unicode61', 'ascii', 'porter', 'trigram')
+    
+    JOURNAL_MODES = ('wal', 'delete', 'truncate', 'persist', 'memory', 'off')
+    SYNCHRONOUS_LEVELS = ('off', 'normal', 'full', 'extra')
+    
+    # Kolumny tabeli - pozostałe pola wyszukiwane są w essence
+    COLUMNS = ('soul_id', 'soul_name', 'energy_level', 'realm_affinity', 'manifestation_time', 'last_evolution')
+    # Kolumny aktualizowane przez evolve, gdy pojawią się w nowych danych
+    EVOLVE_COLUMNS = ('soul_name', 'energy_level', 'realm_affinity')
+    QUERY_OPTIONS = ('order_by', 'order_desc', 'limit', 'after_soul_id', 'after_manifestation_time')
+    
+    # Ścieżka w essence: identyfikatory rozdzielone kropkami (wstawiana do SQL dosłownie)
+    ESSENCE_PATH = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+    ESSENCE_INDEX_PREFIX = 'idx_essence_'
+    
     def __init__(self, name: str, connection_string: str, astral_engine):
         super().__init__(name, connection_string, astral_engine)
         
-        # Parsuj connection string
-        if connection_string.startswith('sqlite://'):
-            self.db_path = connection_string[9:]
+        # Parsuj connection string (opcje po '?' parsuje BaseRealm)
+        path = connection_string.split('?', 1)[0]
+        if path.startswith('sqlite://'):
+            self.db_path = path[9:]
         else:
-            self.db_path = connection_string
+            self.db_path = path
+        
+        self.journal_mode = self.options.get('journal_mode', 'wal').lower()
+        if self.journal_mode not in self.JOURNAL_MODES:
+            raise ValueError(f"Nieznany tryb dziennika SQLite: {self.journal_mode}")
+        
+        self.synchronous = self.options.get('synchronous', '').lower() or None
+        if self.synchronous and self.synchronous not in self.SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Nieznany poziom synchronous SQLite: {self.synchronous}")
+        
+        self.busy_timeout = int(self.options.get('busy_timeout', 5000))
+        
+        # Baza w pamięci istnieje tylko w połączeniu pisarza - bez puli czytelników
+        self.reader_count = 0 if self.db_path == ':memory:' else int(self.options.get('readers', 4))
+        self._readers: Optional[SQLiteReaderPool] = None
+        
+        # Grupowe zatwierdzanie - jeden commit (fsync) na partię współbieżnych zapisów
+        self.group_commit = self.options.get('group_commit', '').lower() in ('1', 'true', 'yes', 'on')
+        self.group_commit_window = float(self.options.get('group_commit_window', 2)) / 1000
+        self.group_commit_size = int(self.options.get('group_commit_size', 256))
+        self._writer: Optional[SQLiteGroupWriter] = None
+        
+        # Wyszukiwanie pełnotekstowe - soul_name oraz wskazane ścieżki essence
+        fts = self.options.get('fts', '').strip()
+        self.search_enabled = bool(fts) and fts.lower() not in ('0', 'false', 'no', 'off')
+        self.search_fields = [] if fts.lower() in ('', '1', 'true', 'yes', 'on') else [
+            field.strip() for field in fts.split(',') if field.strip()
+        ]
+        for field in self.search_fields:
+            self._essence_path(field)
+        if self.search_enabled and not self.codec.sql_json:
+            raise ValueError(f"Indeks pełnotekstowy wymaga kodeka json (ustawiono {self.codec.name})")
+        self.search_tokenizer = self.options.get('fts_tokenizer', 'unicode61 remove_diacritics 2')
+        if not re.match(r'^[A-Za-z0-9_ ]+$', self.search_tokenizer) or \
+                self.search_tokenizer.split()[0] not in self.FTS_TOKENIZERS:
+            raise ValueError(f"Nieznany tokenizer FTS5: {self.search_tokenizer}")
         
         # Utwórz katalog jeśli nie istnieje
         os.makedirs(os.path.dirname(self.db_path) if os.path.dirname(self.db_path) else '.', exist_ok=True)
         
         self.connection: Optional[sqlite3.Connection] = None
+        self._bulk_loading = False
+        
+        # Możliwości biblioteki SQLite (ustalane przy połączeniu): UPDATE ... RETURNING od 3.35,
+        # json_patch z rozszerzenia JSON1 - bez nich evolve odczytuje i scala w Pythonie
+        self._returning = False
+        self._json_patch = False
         self._initialize_schema()
     
     def connect(self) -> bool:
         """Nawiązuje połączenie z bazą SQLite"""
+        if self.connection:
+            # Już połączony (konstruktor łączy przez _initialize_schema)
+            return True
+        
         try:
+            # Jedno połączenie pisarza - zapisy serializowane przez self._lock
             self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
             self.connection.row_factory = sqlite3.Row  # Umożliwia dostęp po nazwach kolumn
+            self.connection.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+            self.connection.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            if self.synchronous:
+                self.connection.execute(f"PRAGMA synchronous = {self.synchronous}")
             self.is_connected = True
+            self._detect_features()
             
             # Inicjalizuj schemat
             self._create_beings_table()
             
+            # Pula czytelników - w trybie WAL odczyty nie czekają na zapis
+            if self.reader_count > 0:
+                self._readers = SQLiteReaderPool(self.db_path, self.reader_count, self.busy_timeout)
+            
+            if self.group_commit:
+                self._writer = SQLiteGroupWriter(self.connection, self._lock, self.group_commit_window,
+                                                 self.group_commit_size, self.engine.logger)
+            
             self.engine.logger.info(f"💎 Połączono z wymiarem SQLite: {self.name}")
             return True
             
@@ -50,9 +173,31 @@ class SQLiteRealm(BaseRealm):
             self.engine.logger.error(f"❌ Błąd połączenia z wymiarem SQLite {self.name}: {e}")
             return False
     
+    def _detect_features(self) -> None:
+        """Sprawdza wersję SQLite i dostępność json_patch"""
+        self._returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+        try:
+            self.connection.execute("SELECT json_patch('{}', '{}')")
+            self._json_patch = True
+        except sqlite3.OperationalError:
+            self._json_patch = False
+        
+        if not self._returning or not self._json_patch:
+            self.engine.logger.debug(
+                f"💎 SQLite {sqlite3.sqlite_version} w wymiarze {self.name}: "
+                f"RETURNING={'tak' if self._returning else 'nie'}, json_patch={'tak' if self._json_patch else 'nie'}"
+            )
+    
     def disconnect(self) -> bool:
         """Rozłącza z bazą SQLite"""
         try:
+            # Najpierw zatwierdź zapisy oczekujące w kolejce pisarza
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+            if self._readers:
+                self._readers.close()
+                self._readers = None
             if self.connection:
                 self.connection.close()
                 self.connection = None
@@ -88,33 +233,211 @@ class SQLiteRealm(BaseRealm):
         ''')
         
         # Indeksy dla wydajności
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_soul_name ON astral_beings(soul_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_energy_level ON astral_beings(energy_level)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_realm_affinity ON astral_beings(realm_affinity)')
+        self._create_indexes(cursor)
+        
+        # Statystyki utrzymywane przez triggery
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS astral_stats (
+                kind TEXT NOT NULL,  -- total, affinity lub energy
+                key NOT NULL,        -- wartość realm_affinity lub początek przedziału energii
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        ''')
+        self._create_stats_triggers(cursor)
+        
+        # Baza sprzed tabeli statystyk lub po przerwanym bulk_load - przelicz jednym skanem
+        # (brakujące triggery wyszukiwania odbudują też indeks pełnotekstowy)
+        if not cursor.execute("SELECT 1 FROM astral_stats WHERE kind = 'total'").fetchone():
+            self._rebuild_stats(cursor)
+        
+        if self.search_enabled:
+            self._create_search(cursor)
         
         self.connection.commit()
     
-    def manifest(self, being_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Manifestuje nowy byt w wymiarze SQLite"""
+    def _stats_keys(self, row: str) -> Tuple[str, str]:
+        """Zwraca wyrażenia SQL kluczy statystyk dla wiersza NEW lub OLD"""
+        bucket = self.ENERGY_BUCKET
+        # Podłoga dzielenia - CAST obcina w stronę zera, co psułoby ujemne energie
+        energy = (f"(CAST({row}.energy_level / {bucket} AS INTEGER) - "
+                  f"({row}.energy_level < CAST({row}.energy_level / {bucket} AS INTEGER) * {bucket})) * {bucket}")
+        return f"ifnull({row}.realm_affinity, '')", f"ifnull({energy}, '')"
+    
+    def _stats_upsert(self, row: str, delta: int) -> str:
+        affinity, energy = self._stats_keys(row)
+        return f'''
+                INSERT INTO astral_stats (kind, key, count)
+                VALUES ('total', '', {delta}), ('affinity', {affinity}, {delta}), ('energy', {energy}, {delta})
+                ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count;'''
+    
+    def _create_stats_triggers(self, cursor: sqlite3.Cursor) -> None:
+        """Tworzy triggery utrzymujące astral_stats w tej samej transakcji co zapis bytu"""
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_insert AFTER INSERT ON astral_beings
+            BEGIN{self._stats_upsert('NEW', 1)}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_delete AFTER DELETE ON astral_beings
+            BEGIN{self._stats_upsert('OLD', -1)}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_update AFTER UPDATE OF energy_level, realm_affinity ON astral_beings
+            BEGIN{self._stats_upsert('OLD', -1)}{self._stats_upsert('NEW', 1)}
+            END
+        ''')
+    
+    def _rebuild_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Przelicza astral_stats od nowa jednym skanem tabeli bytów"""
+        affinity, energy = self._stats_keys('astral_beings')
+        cursor.execute("DELETE FROM astral_stats")
+        cursor.execute("INSERT INTO astral_stats (kind, key, count) SELECT 'total', '', COUNT(*) FROM astral_beings")
+        cursor.execute(f"""
+            INSERT INTO astral_stats (kind, key, count)
+            SELECT 'affinity', {affinity}, COUNT(*) FROM astral_beings GROUP BY 2
+        """)
+        cursor.execute(f"""
+            INSERT INTO astral_stats (kind, key, count)
+            SELECT 'energy', {energy}, COUNT(*) FROM astral_beings GROUP BY 2
+        """)
+    
+    def _search_body(self, row: str) -> str:
+        """Wyrażenie SQL sklejające indeksowane ścieżki essence wiersza NEW, OLD lub tabeli"""
+        if not self.search_fields:
+            return "''"
+        # json_tree rozwija listy i obiekty do wartości prostych (z odkodowanymi znakami \uXXXX)
+        parts = [f"ifnull((SELECT group_concat(atom, ' ') FROM json_tree({row}.essence, "
+                 f"'{self._essence_path(field)}')), '')"
+                 for field in self.search_fields]
+        return " || ' ' || ".join(parts)
+    
+    def _search_schema(self) -> Dict[str, str]:
+        """Zwraca definicje tabeli FTS5 i triggerów synchronizujących (nazwa -> SQL)"""
+        insert = f"INSERT INTO astral_search (rowid, soul_name, body) VALUES (NEW.soul_id, NEW.soul_name, {self._search_body('NEW')});"
+        delete = "DELETE FROM astral_search WHERE rowid = OLD.soul_id;"
+        return {
+            'astral_search': f"CREATE VIRTUAL TABLE astral_search USING fts5(soul_name, body, tokenize='{self.search_tokenizer}')",
+            'trg_search_insert': f"CREATE TRIGGER trg_search_insert AFTER INSERT ON astral_beings BEGIN {insert} END",
+            'trg_search_delete': f"CREATE TRIGGER trg_search_delete AFTER DELETE ON astral_beings BEGIN {delete} END",
+            'trg_search_update': (f"CREATE TRIGGER trg_search_update AFTER UPDATE OF soul_name, essence ON astral_beings "
+                                  f"BEGIN {delete} {insert} END")
+        }
+    
+    def _create_search(self, cursor: sqlite3.Cursor, rebuild: bool = False) -> None:
+        """
+        Tworzy tabelę FTS5 i triggery; przy zmianie konfiguracji (ścieżek, tokenizera)
+        usuwa stary indeks i buduje go od nowa jednym przebiegiem
+        """
+        schema = self._search_schema()
+        existing = dict(cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE name IN (%s)" % ', '.join('?' * len(schema)), list(schema)
+        ).fetchall())
+        
+        if existing.get('astral_search') != schema['astral_search']:
+            cursor.execute("DROP TABLE IF EXISTS astral_search")
+            existing = {}
+            rebuild = True
+        
+        for trigger_name in self.SEARCH_TRIGGERS:
+            if existing.get(trigger_name) != schema[trigger_name]:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+                cursor.execute(schema[trigger_name])
+                rebuild = True
+        
+        if 'astral_search' not in existing:
+            cursor.execute(schema['astral_search'])
+        
+        if rebuild:
+            cursor.execute("DELETE FROM astral_search")
+            cursor.execute(f"""
+                INSERT INTO astral_search (rowid, soul_name, body)
+                SELECT soul_id, soul_name, {self._search_body('astral_beings')} FROM astral_beings
+            """)
+            self.engine.logger.info(f"🔎 Zbudowano indeks pełnotekstowy wymiaru {self.name}")
+    
+    def reconcile_stats(self) -> int:
+        """
+        Uzgadnia statystyki z tabelą bytów (pełny skan - do naprawy, nie do codziennego użycia)
+        
+        Returns:
+            Liczba bytów
+        """
         if not self.connection:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        # Przygotuj dane
+        with self._lock:
+            cursor = self.connection.cursor()
+            self._rebuild_stats(cursor)
+            self.connection.commit()
+        
+        self.engine.logger.info(f"📊 Uzgodniono statystyki wymiaru {self.name}")
+        return self.count_beings()
+    
+    @contextmanager
+    def _reader(self):
+        """Wypożycza połączenie do odczytu (z puli lub połączenie pisarza pod blokadą)"""
+        if self._readers is None:
+            with self._lock:
+                yield self.connection
+        else:
+            with self._readers.connection() as connection:
+                yield connection
+    
+    def _write(self, operation: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """
+        Wykonuje operację zapisu i ją zatwierdza
+        
+        W trybie group_commit operacja trafia do wątku pisarza, a wywołujący czeka
+        na zatwierdzenie całej partii; inaczej własna transakcja pod blokadą pisarza.
+        """
+        if self._writer is not None:
+            return self._writer.submit(operation).result()
+        
+        with self._lock:
+            try:
+                result = operation(self.connection.cursor())
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+        return result
+    
+    def _create_indexes(self, cursor: sqlite3.Cursor) -> None:
+        """Tworzy indeksy tabeli bytów"""
+        for index_name, column in self.INDEXES.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON astral_beings({column})')
+    
+    def _prepare_being(self, being_data: Dict[str, Any], soul_id: Optional[int] = None) -> Tuple[tuple, str]:
+        """Przygotowuje parametry INSERT oraz czas manifestacji (soul_id None = AUTOINCREMENT)"""
         soul_name = being_data.get('soul_name', f'being_{datetime.now().timestamp()}')
-        essence = json.dumps(being_data)
+        essence = self.encode_essence(being_data)
         energy_level = being_data.get('energy_level', 100.0)
         realm_affinity = being_data.get('realm_affinity', 'neutral')
         manifestation_time = datetime.now().isoformat()
         
-        cursor = self.connection.cursor()
-        cursor.execute('''
-            INSERT INTO astral_beings 
-            (soul_name, essence, energy_level, realm_affinity, manifestation_time)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (soul_name, essence, energy_level, realm_affinity, manifestation_time))
+        return (soul_id, soul_name, essence, energy_level, realm_affinity, manifestation_time), manifestation_time
+    
+    def manifest(self, being_data: Dict[str, Any], soul_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Manifestuje nowy byt w wymiarze SQLite
         
-        soul_id = cursor.lastrowid
-        self.connection.commit()
+        Args:
+            being_data: Dane bytu
+            soul_id: Narzucone soul_id (np. nadane przez ShardedRealm) - domyślnie AUTOINCREMENT
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        # Przygotuj dane
+        params, manifestation_time = self._prepare_being(being_data, soul_id)
+        
+        def insert(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(self.INSERT_BEING, params)
+            return cursor.lastrowid
+        
+        soul_id = self._write(insert)
         
         # Zwiększ licznik
         self._being_count += 1
@@ -124,69 +447,439 @@ class SQLiteRealm(BaseRealm):
         result['soul_id'] = soul_id
         result['manifestation_time'] = manifestation_time
         
-        self.engine.logger.debug(f"✨ Manifestowano byt '{soul_name}' w wymiarze {self.name}")
+        self.engine.logger.debug(f"✨ Manifestowano byt '{params[1]}' w wymiarze {self.name}")
         return result
     
-    def contemplate(self, intention: str, **conditions) -> List[Dict[str, Any]]:
-        """Kontempluje (wyszukuje) byty w wymiarze"""
+    def manifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000,
+                      soul_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Manifestuje wiele bytów - executemany i jedna transakcja na partię
+        
+        Args:
+            beings: Dane bytów (dowolny iterowalny, także generator)
+            batch_size: Liczba bytów w jednej transakcji
+            soul_ids: Narzucone soul_id kolejnych bytów (np. nadane przez ShardedRealm)
+            
+        Returns:
+            Lista zmanifestowanych bytów
+        """
         if not self.connection:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        # Buduj zapytanie na podstawie warunków
-        query = "SELECT * FROM astral_beings"
-        params = []
+        ids = iter(soul_ids) if soul_ids is not None else None
+        
+        manifested = []
+        for batch in self._batches(beings, batch_size):
+            if ids is not None:
+                batch_ids = list(islice(ids, len(batch)))
+                if len(batch_ids) != len(batch):
+                    raise ValueError("Liczba soul_ids mniejsza niż liczba bytów")
+            else:
+                batch_ids = [None] * len(batch)
+            
+            prepared = [self._prepare_being(being_data, soul_id) for being_data, soul_id in zip(batch, batch_ids)]
+            
+            # Blokada: soul_id partii wyliczane z last_insert_rowid() tego połączenia
+            with self._lock:
+                try:
+                    cursor = self.connection.cursor()
+                    cursor.executemany(self.INSERT_BEING, [params for params, _ in prepared])
+                    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+            
+            # AUTOINCREMENT w jednej transakcji nadaje kolejne soul_id
+            if ids is None:
+                batch_ids = range(last_id - len(batch) + 1, last_id + 1)
+            for soul_id, being_data, (_, manifestation_time) in zip(batch_ids, batch, prepared):
+                result = being_data.copy()
+                result['soul_id'] = soul_id
+                result['manifestation_time'] = manifestation_time
+                manifested.append(result)
+            
+            self._being_count += len(batch)
+        
+        self.engine.logger.debug(f"✨ Manifestowano {len(manifested)} bytów partiami w wymiarze {self.name}")
+        return manifested
+    
+    @contextmanager
+    def bulk_load(self):
+        """
+        Tryb masowego ładowania
+        
+        Usuwa indeksy idx_* (także indeksy esencji) oraz triggery statystyk i wyszukiwania,
+        wyłącza synchronous na czas ładowania, a po jego zakończeniu odtwarza indeksy,
+        statystyki i indeks pełnotekstowy jednym przebiegiem.
+        
+        Użycie:
+            with realm.bulk_load():
+                realm.manifest_many(beings, batch_size=10000)
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        if self._bulk_loading:
+            raise RuntimeError("Tryb masowego ładowania jest już aktywny")
+        
+        cursor = self.connection.cursor()
+        synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        
+        self._bulk_loading = True
+        essence_indexes = []
+        try:
+            with self._lock:
+                essence_indexes = cursor.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE ?",
+                    (self.ESSENCE_INDEX_PREFIX + '%',)
+                ).fetchall()
+                for index_name in [*self.INDEXES, *(row[0] for row in essence_indexes)]:
+                    cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+                for trigger_name in (*self.STATS_TRIGGERS, *self.SEARCH_TRIGGERS):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+                # Bez wiersza 'total' następne połączenie przeliczy statystyki - także gdy
+                # proces zginie w trakcie ładowania i blok finally się nie wykona
+                cursor.execute("DELETE FROM astral_stats WHERE kind = 'total'")
+                self.connection.commit()
+                cursor.execute("PRAGMA synchronous = OFF")
+            
+            self.engine.logger.info(f"📦 Rozpoczęto masowe ładowanie wymiaru {self.name}")
+            yield self
+        
+        finally:
+            with self._lock:
+                self.connection.commit()
+                cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
+                self._create_indexes(cursor)
+                for _, index_sql in essence_indexes:
+                    cursor.execute(index_sql)
+                self._create_stats_triggers(cursor)
+                self._rebuild_stats(cursor)
+                if self.search_enabled:
+                    self._create_search(cursor, rebuild=True)
+                self.connection.commit()
+            self._bulk_loading = False
+            
+            self.engine.logger.info(f"📦 Zakończono masowe ładowanie wymiaru {self.name} - indeksy odtworzone")
+    
+    @classmethod
+    def _essence_path(cls, field: str) -> str:
+        """Waliduje ścieżkę pola w essence i zwraca ścieżkę JSON"""
+        if not isinstance(field, str) or not cls.ESSENCE_PATH.match(field):
+            raise ValueError(f"Nieprawidłowa nazwa pola: {field!r}")
+        return f"$.{field}"
+    
+    def _field_expression(self, field: str) -> str:
+        """Zwraca wyrażenie SQL dla pola - kolumnę lub json_extract z essence"""
+        if field in self.COLUMNS:
+            return field
+        path = self._essence_path(field)
+        if not self.codec.sql_json:
+            raise ValueError(f"Pole esencji '{field}' niedostępne w SQL przy kodeku {self.codec.name} - wymaga kodeka json")
+        # Tekst musi być identyczny z wyrażeniem w create_essence_index, inaczej SQLite pominie indeks
+        return f"json_extract(essence, '{path}')"
+    
+    @staticmethod
+    def _sql_value(value: Any) -> Any:
+        """Zamienia wartość warunku na postać porównywalną z json_extract"""
+        if isinstance(value, bool):
+            # json_extract zwraca true/false jako 1/0
+            return int(value)
+        if isinstance(value, (dict, list, tuple)):
+            # Obiekty i tablice json_extract zwraca jako zwarty tekst JSON
+            return json.dumps(value, separators=(',', ':'))
+        return value
+    
+    def _build_where(self, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any], Dict[str, Any]]:
+        """
+        Tłumaczy warunki na klauzule WHERE i parametry
+        
+        Returns:
+            Klauzule, parametry oraz warunki na esencji do sprawdzenia po odczycie (kodek binarny)
+        """
         where_clauses = []
+        params = []
+        residual = {}
         
-        # Podstawowe filtry
-        if 'soul_name' in conditions:
-            where_clauses.append("soul_name = ?")
-            params.append(conditions['soul_name'])
+        for key, value in conditions.items():
+            if key in self.QUERY_OPTIONS:
+                continue
+            
+            is_range = (key.endswith('_min') or key.endswith('_max')) and key not in self.COLUMNS
+            field = key[:-4] if is_range else key
+            if field not in self.COLUMNS and not self.codec.sql_json:
+                self._essence_path(field)
+                residual[key] = value
+                continue
+            
+            # Warunki zakresowe (pole_min / pole_max), o ile pole_min samo nie jest kolumną
+            if is_range:
+                operator = '>=' if key.endswith('_min') else '<='
+                where_clauses.append(f"{self._field_expression(key[:-4])} {operator} ?")
+                params.append(self._sql_value(value))
+            
+            elif value is None:
+                where_clauses.append(f"{self._field_expression(key)} IS NULL")
+            
+            else:
+                where_clauses.append(f"{self._field_expression(key)} = ?")
+                params.append(self._sql_value(value))
         
-        if 'energy_level_min' in conditions:
-            where_clauses.append("energy_level >= ?")
-            params.append(conditions['energy_level_min'])
+        return where_clauses, params, residual
+    
+    @staticmethod
+    def _essence_value(being: Dict[str, Any], field: str) -> Any:
+        """Zwraca wartość ścieżki (a.b.c) w bycie lub None"""
+        value: Any = being
+        for part in field.split('.'):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+    
+    def _matches_residual(self, being: Dict[str, Any], residual: Dict[str, Any]) -> bool:
+        """Sprawdza warunki na esencji po odczycie - semantyka jak w SQL"""
+        for key, value in residual.items():
+            if (key.endswith('_min') or key.endswith('_max')) and key not in self.COLUMNS:
+                actual = self._essence_value(being, key[:-4])
+                try:
+                    if actual is None or not (actual >= value if key.endswith('_min') else actual <= value):
+                        return False
+                except TypeError:
+                    return False
+            elif self._essence_value(being, key) != value:
+                return False
+        return True
+    
+    def _decode_rows(self, rows: Iterable[sqlite3.Row], residual: Dict[str, Any],
+                     limit: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Dekoduje wiersze, odrzuca niespełniające warunków esencji i przycina do limitu"""
+        count = 0
+        for row in rows:
+            if limit is not None and count >= limit:
+                return
+            being = self._row_to_being(row)
+            if residual and not self._matches_residual(being, residual):
+                continue
+            count += 1
+            yield being
+    
+    def _order_spec(self, conditions: Dict[str, Any]) -> Tuple[str, bool]:
+        """Zwraca pole i kierunek sortowania z order_by (pole, opcjonalnie 'asc'/'desc') i order_desc"""
+        order_by = conditions.get('order_by')
+        if not order_by:
+            return 'manifestation_time', True
         
-        if 'energy_level_max' in conditions:
-            where_clauses.append("energy_level <= ?")
-            params.append(conditions['energy_level_max'])
+        descending = bool(conditions.get('order_desc', False))
+        parts = str(order_by).split()
+        if len(parts) == 2 and parts[1].lower() in ('asc', 'desc'):
+            descending = parts[1].lower() == 'desc'
+        elif len(parts) != 1:
+            raise ValueError(f"Nieprawidłowe sortowanie: {order_by!r}")
         
-        if 'realm_affinity' in conditions:
-            where_clauses.append("realm_affinity = ?")
-            params.append(conditions['realm_affinity'])
+        # Walidacja nazwy pola
+        self._field_expression(parts[0])
+        return parts[0], descending
+    
+    def _keyset_clause(self, field: str, descending: bool,
+                       conditions: Dict[str, Any]) -> Tuple[Optional[str], List[Any]]:
+        """
+        Buduje warunek paginacji kluczem (after_soul_id / after_manifestation_time)
+        
+        Kolejna strona zaczyna się za ostatnim bytem poprzedniej - bez OFFSET,
+        więc koszt strony nie rośnie z jej numerem.
+        """
+        after_id = conditions.get('after_soul_id')
+        after_time = conditions.get('after_manifestation_time')
+        if after_id is None and after_time is None:
+            return None, []
+        
+        operator = '<' if descending else '>'
+        if field == 'soul_id':
+            if after_id is None or after_time is not None:
+                raise ValueError("Sortowanie po soul_id wymaga samego after_soul_id")
+            return f"soul_id {operator} ?", [int(after_id)]
+        
+        if field == 'manifestation_time' and after_time is not None:
+            if after_id is None:
+                return f"manifestation_time {operator} ?", [after_time]
+            # soul_id rozstrzyga remisy czasu manifestacji
+            return f"(manifestation_time, soul_id) {operator} (?, ?)", [after_time, int(after_id)]
+        
+        raise ValueError(
+            "Paginacja kluczem wymaga sortowania po soul_id (after_soul_id) "
+            "lub manifestation_time (after_manifestation_time)"
+        )
+    
+    def _build_query(self, conditions: Dict[str, Any]) -> Tuple[str, List[Any], Dict[str, Any], Optional[int]]:
+        """
+        Buduje zapytanie SELECT i parametry dla warunków kontemplacji
+        
+        Returns:
+            Zapytanie, parametry, warunki do sprawdzenia po odczycie i limit do zastosowania po nich
+        """
+        query = "SELECT * FROM astral_beings"
+        where_clauses, params, residual = self._build_where(conditions)
+        
+        field, descending = self._order_spec(conditions)
+        keyset, keyset_params = self._keyset_clause(field, descending, conditions)
+        if keyset:
+            where_clauses.append(keyset)
+            params.extend(keyset_params)
         
         # Dodaj WHERE jeśli są warunki
         if where_clauses:
             query += " WHERE " + " AND ".join(where_clauses)
         
-        # Sortowanie
-        if 'order_by' in conditions:
-            query += f" ORDER BY {conditions['order_by']}"
-        else:
-            query += " ORDER BY manifestation_time DESC"
+        # Sortowanie - soul_id jako rozstrzygnięcie remisów daje stabilny porządek stron
+        direction = 'DESC' if descending else 'ASC'
+        query += f" ORDER BY {self._field_expression(field)} {direction}"
+        if field != 'soul_id':
+            query += f", soul_id {direction}"
         
-        # Limit
-        if 'limit' in conditions:
-            query += f" LIMIT {conditions['limit']}"
+        # Limit - przy warunkach sprawdzanych po odczycie stosowany dopiero po nich
+        limit = max(0, int(conditions['limit'])) if 'limit' in conditions else None
+        if limit is not None and not residual:
+            query += " LIMIT ?"
+            params.append(limit)
+            limit = None
         
-        cursor = self.connection.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        return query, params, residual, limit
+    
+    def _row_to_being(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Zamienia wiersz na słownik bytu z rozpakowaną essence"""
+        being = dict(row)
+        payload = being['essence']
+        if isinstance(payload, bytes):
+            # Surowe bajty kodeka binarnego nie są serializowalne do JSON (REST, jsonify)
+            del being['essence']
+        # Dekoduj essence kodekiem, którym została zapisana
+        if payload:
+            try:
+                essence_data = self.decode_essence(payload)
+                being.update(essence_data)
+            except ValueError:
+                pass
+        return being
+    
+    def contemplate(self, intention: str, **conditions) -> List[Dict[str, Any]]:
+        """
+        Kontempluje (wyszukuje) byty w wymiarze
+        
+        Kolumny tabeli filtrowane są bezpośrednio, pozostałe pola przez json_extract na essence.
+        Warunki pole_min / pole_max oznaczają zakres, None - brak pola lub null.
+        Paginacja: limit oraz after_soul_id / after_manifestation_time z ostatniego bytu strony.
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        query, params, residual, limit = self._build_query(conditions)
+        
+        with self._reader() as connection:
+            rows = connection.execute(query, params).fetchall()
         
         # Konwertuj na słowniki
+        results = list(self._decode_rows(rows, residual, limit))
+        
+        self.engine.logger.debug(f"🔍 Kontemplacja '{intention}' zwróciła {len(results)} bytów")
+        return results
+    
+    def contemplate_iter(self, intention: str, batch_size: int = 500, **conditions) -> Iterator[Dict[str, Any]]:
+        """
+        Strumieniuje wyniki kontemplacji - fetchmany po batch_size wierszy
+        
+        Połączenie z puli czytelników jest zajęte do wyczerpania (lub zamknięcia) iteratora,
+        a jego transakcja odczytu widzi stan z chwili rozpoczęcia.
+        Bez puli (baza :memory:) wiersze pobierane są od razu, by nie trzymać blokady pisarza
+        między kolejnymi krokami iteracji - dekodowanie essence pozostaje leniwe.
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        if batch_size < 1:
+            raise ValueError("batch_size musi być dodatni")
+        
+        query, params, residual, limit = self._build_query(conditions)
+        
+        if self._readers is None:
+            with self._reader() as connection:
+                rows = connection.execute(query, params).fetchall()
+            yield from self._decode_rows(rows, residual, limit)
+            return
+        
+        def fetch_batches(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        
+        count = 0
+        with self._readers.connection() as connection:
+            cursor = connection.execute(query, params)
+            try:
+                for being in self._decode_rows(fetch_batches(cursor), residual, limit):
+                    count += 1
+                    yield being
+            finally:
+                cursor.close()
+        
+        self.engine.logger.debug(f"🔍 Kontemplacja strumieniowa '{intention}' zwróciła {count} bytów")
+    
+    @staticmethod
+    def _search_query(text: str, prefix: bool) -> str:
+        """Zamienia zwykły tekst na zapytanie FTS5 - każde słowo w cudzysłowie, wszystkie wymagane"""
+        terms = ['"' + term.replace('"', '""') + '"' + ('*' if prefix else '') for term in text.split()]
+        return ' '.join(terms)
+    
+    def search(self, text: str, limit: int = 20, prefix: bool = False, raw: bool = False,
+               **conditions) -> List[Dict[str, Any]]:
+        """
+        Wyszukuje byty pełnotekstowo (FTS5) - wyniki od najtrafniejszych (bm25)
+        
+        Args:
+            text: Szukany tekst - słowa muszą wystąpić wszystkie (w soul_name lub ścieżkach z opcji fts)
+            limit: Maksymalna liczba wyników
+            prefix: Dopasowanie początków słów ('astr' znajdzie 'astral')
+            raw: Tekst jest gotowym zapytaniem FTS5 (OR, NEAR, soul_name:...)
+            **conditions: Dodatkowe warunki jak w contemplate()
+            
+        Returns:
+            Lista bytów z polem search_rank (mniejszy = trafniejszy)
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        if not self.search_enabled:
+            raise RuntimeError(f"Wymiar {self.name} nie ma indeksu pełnotekstowego (opcja fts)")
+        
+        match = text if raw else self._search_query(text, prefix)
+        if not match:
+            return []
+        
+        where_clauses, params, _ = self._build_where(conditions)
+        where = ''.join(f" AND {clause}" for clause in where_clauses)
+        
+        # Podzapytanie - bm25 działa tylko w kontekście FTS, a kolumny bytów nie kolidują z astral_search
+        query = f"""
+            SELECT astral_beings.*, found.search_rank FROM (
+                SELECT rowid, bm25(astral_search, 2.0, 1.0) AS search_rank
+                FROM astral_search WHERE astral_search MATCH ?
+            ) AS found
+            JOIN astral_beings ON astral_beings.soul_id = found.rowid
+            WHERE 1{where}
+            ORDER BY found.search_rank
+            LIMIT ?
+        """
+        
+        with self._reader() as connection:
+            rows = connection.execute(query, [match, *params, max(0, int(limit))]).fetchall()
+        
         results = []
         for row in rows:
-            being = dict(row)
-            # Parsuj essence z JSON
-            if being['essence']:
-                try:
-                    essence_data = json.loads(being['essence'])
-                    being.update(essence_data)
-                except json.JSONDecodeError:
-                    pass
-            
+            being = self._row_to_being(row)
+            being['search_rank'] = row['search_rank']
             results.append(being)
         
-        self.engine.logger.debug(f"🔍 Kontemplacja '{intention}' zwróciła {len(results)} bytów")
+        self.engine.logger.debug(f"🔎 Wyszukiwanie '{text}' zwróciło {len(results)} bytów")
         return results
     
     def transcend(self, being_id: int) -> bool:
@@ -194,88 +887,328 @@ class SQLiteRealm(BaseRealm):
         if not self.connection:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        cursor = self.connection.cursor()
-        cursor.execute("DELETE FROM astral_beings WHERE soul_id = ?", (being_id,))
+        def delete(cursor: sqlite3.Cursor) -> bool:
+            cursor.execute("DELETE FROM astral_beings WHERE soul_id = ?", (being_id,))
+            return cursor.rowcount > 0
         
-        if cursor.rowcount > 0:
-            self.connection.commit()
+        deleted = self._write(delete)
+        
+        if deleted:
             self._being_count = max(0, self._being_count - 1)
             self.engine.logger.debug(f"🕊️ Byt {being_id} transcendował z wymiaru {self.name}")
             return True
         else:
             return False
     
-    def evolve(self, being_id: int, new_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Ewoluuje (aktualizuje) byt"""
+    def evolve(self, being_id: int, new_data: Dict[str, Any],
+               return_being: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Ewoluuje (aktualizuje) byt - jedno UPDATE z json_patch zamiast odczytu i zapisu
+        
+        Essence scalana jest według JSON Merge Patch (RFC 7396): pola spoza new_data
+        zostają, zagnieżdżone obiekty są scalane, a wartość None usuwa pole.
+        Przy kodeku binarnym lub bez json_patch (JSON1) scalanie odbywa się w Pythonie,
+        a bez RETURNING (SQLite < 3.35) byt odczytywany jest po UPDATE - zawsze w tej samej
+        operacji zapisu.
+        
+        Args:
+            being_id: ID bytu
+            new_data: Nowe dane
+            return_being: False zwraca tylko soul_id i last_evolution (bez odczytu rekordu)
+            
+        Returns:
+            Zaktualizowany byt lub None gdy byt nie istnieje
+        """
         if not self.connection:
             raise RuntimeError("Brak połączenia z wymiarem")
         
-        # Pobierz aktualny byt
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM astral_beings WHERE soul_id = ?", (being_id,))
-        row = cursor.fetchone()
+        last_evolution = datetime.now().isoformat()
+        patch_in_sql = self.codec.sql_json and self._json_patch
+        
+        # Kolumny z whitelisty - nazwy bezpieczne do wstawienia w SQL
+        if patch_in_sql:
+            assignments = ["essence = json_patch(coalesce(essence, '{}'), ?)", "last_evolution = ?"]
+            params: List[Any] = [json.dumps(new_data), last_evolution]
+        else:
+            # Esencja wyliczana w operacji zapisu - miejsce parametru uzupełnia update()
+            assignments = ["essence = ?", "last_evolution = ?"]
+            params = [None, last_evolution]
+        for column in self.EVOLVE_COLUMNS:
+            if column in new_data:
+                assignments.append(f"{column} = ?")
+                params.append(new_data[column])
+        params.append(being_id)
         
-        if not row:
+        returning = return_being and self._returning
+        query = f"UPDATE astral_beings SET {', '.join(assignments)} WHERE soul_id = ?"
+        if returning:
+            query += " RETURNING *"
+        
+        def update(cursor: sqlite3.Cursor) -> Union[sqlite3.Row, bool, None]:
+            if not patch_in_sql:
+                row = cursor.execute("SELECT essence FROM astral_beings WHERE soul_id = ?", (being_id,)).fetchone()
+                if not row:
+                    return None
+                current = self.decode_essence(row[0]) if row[0] else {}
+                params[0] = self.encode_essence(merge_patch(current, new_data))
+            cursor.execute(query, params)
+            if returning:
+                return cursor.fetchone()
+            if not return_being or cursor.rowcount == 0:
+                return cursor.rowcount > 0
+            return cursor.execute("SELECT * FROM astral_beings WHERE soul_id = ?", (being_id,)).fetchone()
+        
+        updated = self._write(update)
+        if not updated:
             return None
         
-        # Połącz stare i nowe dane
-        current_data = dict(row)
-        if current_data['essence']:
-            try:
-                essence_data = json.loads(current_data['essence'])
-                current_data.update(essence_data)
-            except json.JSONDecodeError:
-                pass
+        self.engine.logger.debug(f"🦋 Byt {being_id} ewoluował w wymiarze {self.name}")
         
-        # Aktualizuj danymi
-        current_data.update(new_data)
+        if not return_being:
+            return {'soul_id': being_id, 'last_evolution': last_evolution}
+        return self._row_to_being(updated)
+    
+    @staticmethod
+    def seed_sequence(cursor: sqlite3.Cursor, table: str, first_free: int) -> None:
+        """
+        Tworzy sekwencję soul_id we własnej tabeli i przesuwa ją co najmniej do first_free (nigdy nie cofa)
         
-        # Przygotuj nową essence
-        new_essence = json.dumps(new_data)
-        energy_level = new_data.get('energy_level', current_data.get('energy_level', 100.0))
-        soul_name = new_data.get('soul_name', current_data.get('soul_name'))
-        realm_affinity = new_data.get('realm_affinity', current_data.get('realm_affinity'))
-        last_evolution = datetime.now().isoformat()
+        Dla wymiarów nadających soul_id samodzielnie (ShardedRealm, TieredRealm) - table to stała klasy.
+        """
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                name TEXT PRIMARY KEY,
+                next INTEGER NOT NULL
+            )
+        """)
+        cursor.execute(
+            f"INSERT INTO {table} (name, next) VALUES ('soul_id', ?) "
+            f"ON CONFLICT(name) DO UPDATE SET next = max(next, excluded.next)", (first_free,)
+        )
+    
+    @staticmethod
+    def reserve_sequence(cursor: sqlite3.Cursor, table: str, size: int) -> int:
+        """Rezerwuje size kolejnych soul_id i zwraca pierwszy - UPDATE przed odczytem blokuje innych pisarzy"""
+        cursor.execute(f"UPDATE {table} SET next = next + ? WHERE name = 'soul_id'", (size,))
+        return cursor.execute(f"SELECT next FROM {table} WHERE name = 'soul_id'").fetchone()[0] - size
+    
+    def last_soul_id(self) -> int:
+        """Największe nadane soul_id według sqlite_sequence (także usuniętych bytów)"""
+        with self._reader() as connection:
+            row = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'astral_beings'").fetchone()
+        return row[0] if row else 0
+    
+    def write_back(self, rows: List[Dict[str, Any]], deleted: Iterable[int] = ()) -> None:
+        """
+        Zapisuje pełne wiersze bytów (upsert po soul_id) i usuwa byty - jedna transakcja
         
-        # Aktualizuj w bazie
-        cursor.execute('''
-            UPDATE astral_beings 
-            SET soul_name = ?, essence = ?, energy_level = ?, 
-                realm_affinity = ?, last_evolution = ?
-            WHERE soul_id = ?
-        ''', (soul_name, new_essence, energy_level, realm_affinity, last_evolution, being_id))
+        Dla warstw cache (TieredRealm), które trzymają wiersze w pamięci i zapisują je partiami.
         
-        self.connection.commit()
+        Args:
+            rows: Wiersze z kolumnami COLUMNS oraz zakodowaną essence
+            deleted: soul_id bytów do usunięcia
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
         
-        # Zwróć zaktualizowany byt
-        result = current_data.copy()
-        result['last_evolution'] = last_evolution
+        columns = self.COLUMNS + ('essence',)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns if column != 'soul_id')
+        upsert = (f"INSERT INTO astral_beings ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                  f"ON CONFLICT(soul_id) DO UPDATE SET {updates}")
+        params = [tuple(row.get(column) for column in columns) for row in rows]
+        deleted = [(soul_id,) for soul_id in deleted]
         
-        self.engine.logger.debug(f"🦋 Byt {being_id} ewoluował w wymiarze {self.name}")
-        return result
+        def write(cursor: sqlite3.Cursor) -> None:
+            if params:
+                cursor.executemany(upsert, params)
+            if deleted:
+                cursor.executemany("DELETE FROM astral_beings WHERE soul_id = ?", deleted)
+        
+        self._write(write)
+        self.engine.logger.debug(f"💾 Zapisano {len(params)} i usunięto {len(deleted)} bytów w wymiarze {self.name}")
+    
+    def recode_essences(self, batch_size: int = 1000) -> int:
+        """
+        Przekodowuje esencje zapisane innym kodekiem na kodek wymiaru
+        
+        Potrzebne po zmianie kodeka, gdy zapytania SQL po esencji (kodek json) mają objąć
+        także starsze wiersze. Każda partia to osobna transakcja.
+        
+        Returns:
+            Liczba przekodowanych bytów
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        recoded = 0
+        last_id = 0
+        while True:
+            with self._lock:
+                cursor = self.connection.cursor()
+                rows = cursor.execute(
+                    "SELECT soul_id, essence FROM astral_beings WHERE soul_id > ? ORDER BY soul_id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for soul_id, essence in rows:
+                    if not essence:
+                        continue
+                    payload = self.encode_essence(self.decode_essence(essence))
+                    if payload != essence:
+                        updates.append((payload, soul_id))
+                
+                cursor.executemany("UPDATE astral_beings SET essence = ? WHERE soul_id = ?", updates)
+                self.connection.commit()
+            
+            recoded += len(updates)
+            last_id = rows[-1][0]
+        
+        self.engine.logger.info(f"🧬 Przekodowano {recoded} esencji na kodek {self.codec.name} w wymiarze {self.name}")
+        return recoded
+    
+    def _essence_index_name(self, field: str) -> str:
+        self._essence_path(field)
+        return self.ESSENCE_INDEX_PREFIX + field.replace('.', '__')
+    
+    def create_essence_index(self, field: str) -> str:
+        """
+        Tworzy indeks wyrażeniowy na ścieżce w essence
+        
+        Args:
+            field: Pole esencji, zagnieżdżone przez kropki (np. 'is_active', 'config.mode')
+            
+        Returns:
+            Nazwa utworzonego indeksu
+        """
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        if field in self.COLUMNS:
+            raise ValueError(f"Pole {field} jest kolumną tabeli - ma własny indeks")
+        
+        index_name = self._essence_index_name(field)
+        with self._lock:
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON astral_beings({self._field_expression(field)})"
+            )
+            self.connection.commit()
+        
+        self.engine.logger.info(f"🗂️ Utworzono indeks esencji '{field}' w wymiarze {self.name}")
+        return index_name
+    
+    def drop_essence_index(self, field: str) -> bool:
+        """Usuwa indeks wyrażeniowy ścieżki w essence"""
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        index_name = self._essence_index_name(field)
+        with self._lock:
+            exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,)
+            ).fetchone()
+            if exists:
+                self.connection.execute(f"DROP INDEX {index_name}")
+                self.connection.commit()
+        
+        return bool(exists)
+    
+    def list_essence_indexes(self) -> List[str]:
+        """Zwraca pola esencji, które mają indeks wyrażeniowy"""
+        if not self.connection:
+            return []
+        
+        with self._reader() as connection:
+            rows = connection.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND name LIKE ? ORDER BY name",
+                (self.ESSENCE_INDEX_PREFIX + '%',)
+            ).fetchall()
+        
+        # Ścieżkę odczytaj z definicji indeksu - nazwa nie rozróżnia 'a.b' od 'a__b'
+        fields = []
+        for row in rows:
+            match = re.search(r"'\$\.([^']+)'", row[0] or '')
+            if match:
+                fields.append(match.group(1))
+        return fields
     
     def count_beings(self) -> int:
         """Zwraca liczbę bytów w wymiarze"""
         if not self.connection:
             return 0
         
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT COUNT(*) FROM astral_beings")
-        result = cursor.fetchone()
+        # O(1) - licznik utrzymywany przez triggery
+        with self._reader() as connection:
+            result = connection.execute("SELECT count FROM astral_stats WHERE kind = 'total'").fetchone()
+            if result is None:
+                # Trwa bulk_load - triggery wyłączone, policz tabelę
+                result = connection.execute("SELECT COUNT(*) FROM astral_beings").fetchone()
         
-        count = result[0] if result else 0
+        count = result[0]
         self._being_count = count
         return count
     
+    def get_histograms(self) -> Dict[str, Any]:
+        """Zwraca liczność wymiaru oraz histogramy realm_affinity i przedziałów energii"""
+        if not self.connection:
+            raise RuntimeError("Brak połączenia z wymiarem")
+        
+        with self._reader() as connection:
+            rows = connection.execute("SELECT kind, key, count FROM astral_stats WHERE count > 0").fetchall()
+        
+        histograms: Dict[str, Any] = {'total': 0, 'realm_affinity': {}, 'energy_buckets': {}}
+        for kind, key, count in rows:
+            if kind == 'total':
+                histograms['total'] = count
+            elif kind == 'affinity':
+                histograms['realm_affinity'][key if key != '' else None] = count
+            else:
+                histograms['energy_buckets'][key if key != '' else None] = count
+        
+        histograms['energy_bucket_width'] = self.ENERGY_BUCKET
+        return histograms
+    
+    def estimate_count(self, **conditions) -> int:
+        """
+        Szacuje liczbę bytów spełniających warunki - ze statystyk, bez dotykania bytów
+        
+        realm_affinity liczone jest dokładnie, energy_level_min/max z dokładnością do przedziału,
+        a połączenie obu zakłada niezależność. Pozostałe warunki są pomijane (górne oszacowanie).
+        """
+        histograms = self.get_histograms()
+        total = histograms['total']
+        if not total:
+            return 0
+        
+        estimate = float(total)
+        if 'realm_affinity' in conditions:
+            estimate *= histograms['realm_affinity'].get(conditions['realm_affinity'], 0) / total
+        
+        low = conditions.get('energy_level_min')
+        high = conditions.get('energy_level_max')
+        if low is not None or high is not None:
+            width = self.ENERGY_BUCKET
+            in_range = sum(
+                count for bucket, count in histograms['energy_buckets'].items()
+                if bucket is not None
+                and (low is None or bucket + width > low)
+                and (high is None or bucket <= high)
+            )
+            estimate *= in_range / total
+        
+        return int(round(estimate))
+    
     def optimize(self) -> None:
         """Optymalizuje wydajność wymiaru"""
         if not self.connection:
             return
         
-        cursor = self.connection.cursor()
-        cursor.execute("VACUUM")
-        cursor.execute("ANALYZE")
-        self.connection.commit()
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("VACUUM")
+            cursor.execute("ANALYZE")
+            self.connection.commit()
         
         self.engine.logger.debug(f"⚡ Zoptymalizowano wymiar SQLite: {self.name}")
     
@@ -0,0 +1,155 @@
+"""
+✍️ SQLiteWriter - Grupowe Zatwierdzanie Zapisów SQLite
+
+Wątek pisarza dla SQLiteRealm (sqlite://ścieżka?group_commit=1):
+zapisy z wielu wątków trafiają do kolejki, a pisarz wykonuje wszystko,
+co nadeszło w krótkim oknie czasu (lub do max_batch operacji), w jednej transakcji.
+Każdy wywołujący czeka na swój Future, który kończy się dopiero po commit -
+jeden fsync na partię zamiast na operację, bez utraty trwałości.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# Operacja zapisu - wykonywana na kursorze pisarza, bez własnego commit
+Operation = Callable[[sqlite3.Cursor], Any]
+
+_STOP = object()
+
+
+class SQLiteGroupWriter:
+    """
+    Wątek grupowego zatwierdzania zapisów
+
+    Każda operacja partii działa we własnym SAVEPOINT - błąd jednej
+    wycofuje tylko ją, pozostałe zostają zatwierdzone.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock,
+                 window: float = 0.002, max_batch: int = 256, logger=None):
+        if max_batch < 1:
+            raise ValueError("max_batch musi być dodatni")
+
+        self.connection = connection
+        self.lock = lock
+        self.window = window
+        self.max_batch = max_batch
+        self.logger = logger
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._state_lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._operations = 0
+        self._largest_batch = 0
+
+        self._thread = threading.Thread(target=self._run, name='luxdb-sqlite-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Operation) -> Future:
+        """Dodaje operację do kolejki - Future kończy się po zatwierdzeniu partii"""
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("Pisarz grupowy jest zamknięty")
+            self._queue.put((operation, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.window
+
+            # Zbieraj operacje do końca okna lub do max_batch
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._commit_batch(batch)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: List[Tuple[Operation, Future]]) -> None:
+        """Wykonuje partię w jednej transakcji i kończy Future wywołujących"""
+        batch = [(operation, future) for operation, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+
+        with self.lock:
+            try:
+                cursor = self.connection.cursor()
+                if not self.connection.in_transaction:
+                    # Bez jawnego BEGIN zwolnienie zewnętrznego SAVEPOINT zatwierdziłoby transakcję
+                    cursor.execute("BEGIN")
+
+                for operation, future in batch:
+                    cursor.execute("SAVEPOINT group_operation")
+                    try:
+                        result = operation(cursor)
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO group_operation")
+                        cursor.execute("RELEASE group_operation")
+                        outcomes.append((future, None, e))
+                    else:
+                        cursor.execute("RELEASE group_operation")
+                        outcomes.append((future, result, None))
+
+                self.connection.commit()
+
+            except Exception as e:
+                # Nieudany commit - żadna operacja partii nie jest trwała
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                if self.logger:
+                    self.logger.error(f"❌ Błąd zatwierdzania partii zapisów SQLite: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+
+        self._batches += 1
+        self._operations += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Zatwierdza oczekujące zapisy i zatrzymuje wątek pisarza"""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> dict:
+        return {
+            'batches': self._batches,
+            'operations': self._operations,
+            'average_batch': self._operations / self._batches if self._batches else 0.0,
+            'largest_batch': self._largest_batch,
+            'pending': self._queue.qsize(),
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch
+        }
@@ -0,0 +1,520 @@
+"""
+🔥 TieredRealm - Wymiar Dwuwarstwowy (pamięć przed SQLite)
+
+Gorąca warstwa w pamięci przed trwałym SQLiteRealm (tiered://ścieżka.db?opcja=wartość...):
+- cache_size: maksymalna liczba bytów w pamięci (domyślnie 10000)
+- eviction: lru (domyślnie) lub lfu - przybliżone, najrzadziej używany z próbki najstarszych
+- flush_interval: co ile sekund wątek zapisu opróżnia brudne byty (domyślnie 0.5)
+- flush_batch: liczba brudnych bytów, która budzi wątek zapisu wcześniej (domyślnie 500)
+- pozostałe opcje (journal_mode, codec, fts, ...) trafiają do SQLiteRealm
+
+manifest/evolve/transcend zmieniają tylko pamięć i oznaczają byt jako brudny - zapis do SQLite
+idzie w tle, partiami, jedną transakcją (write-back). Brudne byty nie są wywłaszczane.
+Odczyt po soul_id (get, contemplate(soul_id=...)) sięga do SQLite tylko przy chybieniu
+i zostawia byt w pamięci (read-through). Pozostałe zapytania najpierw opróżniają brudne byty,
+a potem pytają SQLite - wyniki są zawsze aktualne.
+
+Zapisy niezapisane w chwili awarii procesu (najwyżej flush_interval) giną - disconnect()
+zapisuje wszystko.
+
+soul_id nadaje TieredRealm z bloków (ID_BLOCK) rezerwowanych w tabeli tiered_sequence pliku
+SQLite - soul_id bytu usuniętego przed zapisem nie wraca po restarcie, a wiele procesów może
+pisać do tego samego pliku bez kolizji soul_id (przerwy w soul_id jak w ShardedRealm).
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from .base_realm import BaseRealm
+from .essence_codec import merge_patch
+from .sqlite_realm import SQLiteRealm
+
+# Stany brudnego bytu: nowy (brak w SQLite), zmieniony, usunięty
+NEW = 'new'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class TieredRealm(BaseRealm):
+    """
+    Wymiar z gorącą warstwą w pamięci i zapisem write-back do SQLiteRealm
+    """
+
+    # Chybienia czytają SQLite, zapytania czekają na zapis - dedykowany wątek jak SQLiteRealm
+    ASYNC_WORKERS = 1
+
+    OWN_OPTIONS = ('cache_size', 'eviction', 'flush_interval', 'flush_batch')
+    EVICTION_POLICIES = ('lru', 'lfu')
+    # Liczba najdawniej używanych bytów, spośród których LFU wybiera najrzadziej używany
+    LFU_SAMPLE = 16
+
+    # Liczba soul_id rezerwowanych naraz w tabeli tiered_sequence pliku SQLite
+    ID_BLOCK = 1000
+    SEQUENCE_TABLE = 'tiered_sequence'
+
+    def __init__(self, name: str, connection_string: str, astral_engine):
+        super().__init__(name, connection_string, astral_engine)
+
+        path = connection_string.split('?', 1)[0]
+        if path.startswith('tiered://'):
+            path = path[9:]
+
+        self.cache_size = int(self.options.get('cache_size', 10000))
+        if self.cache_size < 1:
+            raise ValueError("cache_size musi być dodatni")
+
+        self.eviction = self.options.get('eviction', 'lru').lower()
+        if self.eviction not in self.EVICTION_POLICIES:
+            raise ValueError(f"Nieznana polityka wywłaszczania: {self.eviction}")
+
+        self.flush_interval = float(self.options.get('flush_interval', 0.5))
+        self.flush_batch = int(self.options.get('flush_batch', 500))
+
+        backing_options = urlencode({key: value for key, value in self.options.items() if key not in self.OWN_OPTIONS})
+        self.backing = SQLiteRealm(
+            f"{name}#backing",
+            f"sqlite://{path}" + (f"?{backing_options}" if backing_options else ''),
+            astral_engine
+        )
+
+        # soul_id -> (wiersz tabeli z zakodowaną essence, zdekodowana essence)
+        self._hot: "OrderedDict[int, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        self._frequency: Dict[int, int] = {}
+        self._dirty: "OrderedDict[int, str]" = OrderedDict()
+        # Różnica liczności: niezapisane nowe byty minus niezapisane usunięcia
+        self._pending_delta = 0
+        # soul_id z partii zapisywanej właśnie do SQLite
+        self._in_flight: Set[int] = set()
+        # Zarezerwowany, jeszcze nienadany zakres soul_id [_next_soul_id, _reserved_end)
+        self._next_soul_id = 0
+        self._reserved_end = 0
+
+        # Jeden zapis naraz; count_beings czeka na zapis, by nie liczyć bytów podwójnie
+        self._flush_lock = threading.Lock()
+        self._flush_wanted = threading.Event()
+        self._stopping = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.flushed_beings = 0
+
+        self.connect()
+
+    def connect(self) -> bool:
+        """Łączy SQLite, zakłada sekwencję soul_id i uruchamia wątek zapisu"""
+        try:
+            if not self.backing.connection and not self.backing.connect():
+                raise RuntimeError(f"Nie udało się połączyć wymiaru {self.backing.name}")
+
+            # Pliki sprzed tiered_sequence - sekwencja zaczyna się za największym soul_id w SQLite
+            first_free = 1 + self.backing.last_soul_id()
+            self.backing._write(
+                lambda cursor: SQLiteRealm.seed_sequence(cursor, self.SEQUENCE_TABLE, first_free)
+            )
+
+            if self._flusher is None:
+                self._stopping.clear()
+                self._flusher = threading.Thread(target=self._run_flusher, name=f'luxdb-tiered-{self.name}', daemon=True)
+                self._flusher.start()
+
+            self.is_connected = True
+            self.engine.logger.info(f"🔥 Połączono z wymiarem {self.name} (cache {self.cache_size}, {self.eviction})")
+            return True
+
+        except Exception as e:
+            self.engine.logger.error(f"❌ Błąd połączenia z wymiarem {self.name}: {e}")
+            return False
+
+    def disconnect(self) -> bool:
+        """Zatrzymuje wątek zapisu, zapisuje brudne byty i rozłącza SQLite"""
+        try:
+            if self._flusher is not None:
+                self._stopping.set()
+                self._flush_wanted.set()
+                self._flusher.join()
+                self._flusher = None
+
+            self.flush()
+            self.is_connected = False
+            self.engine.logger.info(f"🔥 Rozłączono z wymiarem {self.name}")
+            return self.backing.disconnect()
+
+        except Exception as e:
+            self.engine.logger.error(f"❌ Błąd rozłączania z wymiarem {self.name}: {e}")
+            return False
+
+    def _require_connection(self) -> None:
+        if not self.is_connected:
+            raise RuntimeError("Brak połączenia z wymiarem")
+
+    # Zapis w tle
+
+    def _run_flusher(self) -> None:
+        while not self._stopping.is_set():
+            self._flush_wanted.wait(self.flush_interval)
+            self._flush_wanted.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                # Brudne byty wróciły do kolejki - kolejna próba przy następnym cyklu
+                self.engine.logger.error(f"❌ Błąd zapisu warstwy pamięci wymiaru {self.name}: {e}")
+
+    def flush(self) -> int:
+        """
+        Zapisuje wszystkie brudne byty do SQLite w jednej transakcji
+
+        Returns:
+            Liczba zapisanych (i usuniętych) bytów
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                # Byty zostają brudne do zatwierdzenia zapisu - nie mogą zostać wywłaszczone,
+                # a chybienie nie przeczyta z SQLite stanu sprzed zapisu
+                batch = [(soul_id, state, self._hot[soul_id][0] if state != DELETED else None)
+                         for soul_id, state in self._dirty.items()]
+                self._in_flight = {soul_id for soul_id, _, _ in batch}
+
+            try:
+                self.backing.write_back(
+                    [dict(row) for _, state, row in batch if state != DELETED],
+                    [soul_id for soul_id, state, _ in batch if state == DELETED]
+                )
+            except Exception:
+                with self._lock:
+                    self._in_flight = set()
+                raise
+
+            with self._lock:
+                for soul_id, state, row in batch:
+                    current = self._dirty.get(soul_id)
+                    if current == DELETED:
+                        if state == DELETED:
+                            del self._dirty[soul_id]
+                    elif current is not None:
+                        if self._hot[soul_id][0] is row:
+                            del self._dirty[soul_id]
+                        elif current == NEW:
+                            # Zmieniony w trakcie zapisu - jest już w SQLite, czeka tylko zmiana
+                            self._dirty[soul_id] = UPDATED
+
+                self._in_flight = set()
+                self._pending_delta -= sum(1 if state == NEW else -1 if state == DELETED else 0 for _, state, _ in batch)
+                self.flushes += 1
+                self.flushed_beings += len(batch)
+                self._evict_over_budget()
+
+        return len(batch)
+
+    def _mark_dirty(self, soul_id: int, state: str) -> None:
+        """Oznacza byt jako brudny (wywoływane pod self._lock)"""
+        current = self._dirty.get(soul_id)
+        if state == UPDATED and current == NEW:
+            state = NEW
+        self._dirty[soul_id] = state
+        if len(self._dirty) >= self.flush_batch:
+            self._flush_wanted.set()
+
+    # Warstwa pamięci
+
+    def _touch(self, soul_id: int) -> None:
+        self._hot.move_to_end(soul_id)
+        if self.eviction == 'lfu':
+            self._frequency[soul_id] = self._frequency.get(soul_id, 0) + 1
+
+    def _admit(self, soul_id: int, row: Dict[str, Any], essence: Dict[str, Any]) -> None:
+        """Wstawia byt do pamięci (wywoływane pod self._lock)"""
+        self._hot[soul_id] = (row, essence)
+        self._touch(soul_id)
+        self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        """Wywłaszcza czyste byty ponad cache_size - brudne czekają na zapis"""
+        overflow = len(self._hot) - self.cache_size
+        if overflow <= 0:
+            return
+
+        # Kolejność od najdawniej używanych; brudne pomijane
+        candidates = (soul_id for soul_id in self._hot if soul_id not in self._dirty)
+        if self.eviction == 'lru':
+            victims = []
+            for soul_id in candidates:
+                victims.append(soul_id)
+                if len(victims) == overflow:
+                    break
+        else:
+            victims = []
+            sample = []
+            for soul_id in candidates:
+                sample.append(soul_id)
+                if len(sample) >= max(self.LFU_SAMPLE, overflow * 2):
+                    break
+            sample.sort(key=lambda soul_id: self._frequency.get(soul_id, 0))
+            victims = sample[:overflow]
+
+        for soul_id in victims:
+            del self._hot[soul_id]
+            self._frequency.pop(soul_id, None)
+        self.evictions += len(victims)
+
+        if len(victims) < overflow:
+            # Za dużo brudnych bytów - przyspiesz zapis
+            self._flush_wanted.set()
+
+    @staticmethod
+    def _view(row: Dict[str, Any], essence: Dict[str, Any]) -> Dict[str, Any]:
+        """Byt w postaci zwracanej przez SQLiteRealm: kolumny nadpisane polami essence"""
+        being = dict(row)
+        if isinstance(being['essence'], bytes):
+            # Jak SQLiteRealm._row_to_being - bez surowych bajtów kodeka binarnego
+            del being['essence']
+        being.update(copy.deepcopy(essence))
+        return being
+
+    def _load(self, soul_id: int) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Zwraca wpis z pamięci albo wczytany z SQLite (read-through)"""
+        with self._lock:
+            entry = self._hot.get(soul_id)
+            if entry is not None:
+                self._touch(soul_id)
+                self.hits += 1
+                return entry
+            if self._dirty.get(soul_id) == DELETED:
+                return None
+            self.misses += 1
+
+        with self.backing._reader() as connection:
+            row = connection.execute("SELECT * FROM astral_beings WHERE soul_id = ?", (soul_id,)).fetchone()
+        if row is None:
+            return None
+
+        row = dict(row)
+        try:
+            essence = self.backing.decode_essence(row['essence']) if row['essence'] else {}
+        except ValueError:
+            essence = {}
+
+        with self._lock:
+            # Byt mógł zostać zmieniony lub usunięty w czasie odczytu - pamięć ma pierwszeństwo
+            entry = self._hot.get(soul_id)
+            if entry is not None:
+                return entry
+            if self._dirty.get(soul_id) == DELETED:
+                return None
+            self._admit(soul_id, row, essence)
+            return row, essence
+
+    # Operacje wymiaru
+
+    def _allocate_soul_id(self) -> int:
+        """Nadaje soul_id z bloku zarezerwowanego przez ten proces - po wyczerpaniu rezerwuje kolejny"""
+        with self._lock:
+            if self._next_soul_id >= self._reserved_end:
+                first = self.backing._write(
+                    lambda cursor: SQLiteRealm.reserve_sequence(cursor, self.SEQUENCE_TABLE, self.ID_BLOCK)
+                )
+                self._next_soul_id, self._reserved_end = first, first + self.ID_BLOCK
+
+            soul_id = self._next_soul_id
+            self._next_soul_id += 1
+        return soul_id
+
+    def manifest(self, being_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Manifestuje byt w pamięci - zapis do SQLite w tle"""
+        self._require_connection()
+
+        soul_id = self._allocate_soul_id()
+        params, _ = self.backing._prepare_being(being_data, soul_id)
+        row = dict(zip(('soul_id', 'soul_name', 'essence', 'energy_level', 'realm_affinity', 'manifestation_time'), params))
+        row['last_evolution'] = None
+        essence = copy.deepcopy(being_data)
+
+        with self._lock:
+            # Brudny przed wstawieniem - nowy byt nie może zostać wywłaszczony przed zapisem
+            self._mark_dirty(soul_id, NEW)
+            self._pending_delta += 1
+            self._admit(soul_id, row, essence)
+
+        result = being_data.copy()
+        result['soul_id'] = soul_id
+        result['manifestation_time'] = row['manifestation_time']
+        return result
+
+    def manifest_many(self, beings: Iterable[Dict[str, Any]], batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """Manifestuje wiele bytów - w pamięci, zapis partiami w tle"""
+        return [self.manifest(being_data) for batch in self._batches(beings, batch_size) for being_data in batch]
+
+    def get(self, soul_id: int) -> Optional[Dict[str, Any]]:
+        """Pobiera byt po soul_id - z pamięci lub przez read-through z SQLite"""
+        self._require_connection()
+
+        entry = self._load(int(soul_id))
+        return self._view(*entry) if entry is not None else None
+
+    def _point_soul_id(self, conditions: Dict[str, Any]) -> Optional[int]:
+        """soul_id, gdy to jedyny warunek - zapytanie obsługuje wtedy warstwa pamięci"""
+        soul_id = conditions.get('soul_id')
+        if soul_id is None or isinstance(soul_id, bool) or set(conditions) - {'soul_id', 'limit'}:
+            return None
+        try:
+            return int(soul_id)
+        except (TypeError, ValueError):
+            return None
+
+    def contemplate(self, intention: str, **conditions) -> List[Dict[str, Any]]:
+        """
+        Kontempluje byty - warunek samego soul_id z pamięci, pozostałe przez SQLite
+
+        Przed zapytaniem do SQLite brudne byty są zapisywane, więc wynik jest aktualny.
+        """
+        self._require_connection()
+
+        soul_id = self._point_soul_id(conditions)
+        if soul_id is not None:
+            being = self.get(soul_id)
+            return [being] if being is not None and conditions.get('limit', 1) != 0 else []
+
+        self.flush()
+        return self.backing.contemplate(intention, **conditions)
+
+    def contemplate_iter(self, intention: str, batch_size: int = 500, **conditions) -> Iterator[Dict[str, Any]]:
+        """Strumieniuje wyniki z SQLite po zapisaniu brudnych bytów"""
+        self._require_connection()
+
+        soul_id = self._point_soul_id(conditions)
+        if soul_id is not None:
+            yield from self.contemplate(intention, **conditions)
+            return
+
+        self.flush()
+        yield from self.backing.contemplate_iter(intention, batch_size, **conditions)
+
+    def search(self, text: str, limit: int = 20, prefix: bool = False, raw: bool = False,
+               **conditions) -> List[Dict[str, Any]]:
+        """Wyszukuje pełnotekstowo w SQLite po zapisaniu brudnych bytów"""
+        self._require_connection()
+
+        self.flush()
+        return self.backing.search(text, limit, prefix, raw, **conditions)
+
+    def evolve(self, being_id: int, new_data: Dict[str, Any],
+               return_being: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Ewoluuje byt w pamięci (JSON Merge Patch jak SQLiteRealm.evolve) - zapis w tle
+
+        Returns:
+            Zaktualizowany byt lub None gdy byt nie istnieje
+        """
+        self._require_connection()
+
+        soul_id = int(being_id)
+        last_evolution = datetime.now().isoformat()
+
+        while True:
+            entry = self._load(soul_id)
+            if entry is None:
+                return None
+
+            with self._lock:
+                # Wywłaszczony między odczytem a blokadą - wczytaj ponownie
+                if self._hot.get(soul_id) is not entry:
+                    continue
+
+                row, essence = entry
+                essence = merge_patch(essence, copy.deepcopy(new_data))
+                row = dict(row)
+                row['essence'] = self.backing.encode_essence(essence)
+                row['last_evolution'] = last_evolution
+                for column in SQLiteRealm.EVOLVE_COLUMNS:
+                    if column in new_data:
+                        row[column] = new_data[column]
+
+                self._hot[soul_id] = (row, essence)
+                self._touch(soul_id)
+                self._mark_dirty(soul_id, UPDATED)
+                break
+
+        if not return_being:
+            return {'soul_id': soul_id, 'last_evolution': last_evolution}
+        return self._view(row, essence)
+
+    def transcend(self, being_id: int) -> bool:
+        """Transcenduje byt - usunięcie z SQLite w tle"""
+        self._require_connection()
+
+        soul_id = int(being_id)
+
+        while True:
+            entry = self._load(soul_id)
+            if entry is None:
+                return False
+
+            with self._lock:
+                # Wywłaszczony między odczytem a blokadą - wczytaj ponownie
+                if self._hot.get(soul_id) is not entry:
+                    continue
+
+                del self._hot[soul_id]
+                self._frequency.pop(soul_id, None)
+
+                if self._dirty.get(soul_id) == NEW and soul_id not in self._in_flight:
+                    # Nie dotarł jeszcze do SQLite - nie ma czego usuwać
+                    del self._dirty[soul_id]
+                else:
+                    self._mark_dirty(soul_id, DELETED)
+                self._pending_delta -= 1
+                return True
+
+    def count_beings(self) -> int:
+        """Liczba bytów w SQLite powiększona o niezapisane zmiany warstwy pamięci"""
+        if not self.backing.connection:
+            return self._being_count
+
+        with self._flush_lock:
+            with self._lock:
+                delta = self._pending_delta
+            count = self.backing.count_beings() + delta
+
+        self._being_count = count
+        return count
+
+    def create_essence_index(self, field: str) -> str:
+        return self.backing.create_essence_index(field)
+
+    def drop_essence_index(self, field: str) -> bool:
+        return self.backing.drop_essence_index(field)
+
+    def is_healthy(self) -> bool:
+        return self.is_connected and self.backing.is_healthy()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Liczniki warstwy pamięci i zapisu w tle"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._hot),
+            'cache_size': self.cache_size,
+            'eviction': self.eviction,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'dirty': len(self._dirty),
+            'flushes': self.flushes,
+            'flushed_beings': self.flushed_beings
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status['cache'] = self.get_cache_stats()
+        status['backing'] = self.backing.get_status()
+        return status
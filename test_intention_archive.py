@@ -0,0 +1,129 @@
+"""
+🗄️ Test IntentionArchive - Zimne Archiwum Intencji
+
+Testuje:
+- Stronicowanie scan po (transcended_at, rowid) przy batch_size mniejszym niż liczba wpisów
+- Filtry since / until / final_state
+- Kompresję zlib - zapis odczytany w tej samej postaci (także kodekiem binarnym)
+- Archiwizację przy transcendencji intencji z wymiaru
+"""
+
+import sqlite3
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from luxdb_v2.realms.essence_codec import decode_payload, get_codec
+from luxdb_v2.realms.intention_archive import IntentionArchive
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _record(index: int, state: str) -> dict:
+    return {
+        'essence': {'soul_id': f'intencja-{index}', 'name': f'Intencja {index}'},
+        'state': state,
+        'metainfo': {'wskaznik_sukcesu': index / 100, 'tags': ['a', 'b']},
+        'interactions': [{'type': 'wzmocnij', 'data': {'power': index}}],
+        'memories': [{'opis': 'ż' * 200}]
+    }
+
+
+@pytest.fixture(params=['json', 'pickle'])
+def archive(request, tmp_path):
+    archive = IntentionArchive(str(tmp_path / 'archive.db'), get_codec(request.param),
+                               lambda payload: decode_payload(payload, trusted=True))
+    archive.open()
+    yield archive
+    archive.close()
+
+
+def _fill(archive, count: int = 25) -> list:
+    """Wpisy co minutę, po trzy z tym samym czasem - kolejność w obrębie czasu daje rowid"""
+    expected = []
+    for i in range(count):
+        state = 'completed' if i % 3 == 0 else 'approved'
+        archive.append(_record(i, state), transcended_at=START + timedelta(minutes=i // 3))
+        expected.append((f'intencja-{i}', state, START + timedelta(minutes=i // 3)))
+    return expected
+
+
+def test_scan_pages_in_time_and_rowid_order(archive):
+    """Każdy wpis zwracany raz, w kolejności czasu i dopisania - niezależnie od rozmiaru partii"""
+    expected = _fill(archive)
+    ids = [intention_id for intention_id, _, _ in expected]
+
+    for batch_size in (1, 2, 3, 4, 7, 25, 100):
+        assert [entry['intention_id'] for entry in archive.scan(batch_size=batch_size)] == ids
+
+    with pytest.raises(ValueError):
+        list(archive.scan(batch_size=0))
+
+
+def test_scan_filters(archive):
+    """since włącznie, until wyłącznie (datetime lub ISO) i final_state"""
+    expected = _fill(archive)
+    since, until = START + timedelta(minutes=2), START + timedelta(minutes=5)
+
+    def ids(**filters):
+        return [entry['intention_id'] for entry in archive.scan(batch_size=2, **filters)]
+
+    in_range = [i for i, _, moment in expected if since <= moment < until]
+    assert ids(since=since, until=until) == in_range
+    assert ids(since=since.isoformat(), until=until.isoformat()) == in_range
+    assert ids(since=since) == [i for i, _, moment in expected if moment >= since]
+    assert ids(until=until) == [i for i, _, moment in expected if moment < until]
+    assert ids(final_state='completed') == [i for i, state, _ in expected if state == 'completed']
+    assert ids(since=since, until=until, final_state='completed') == \
+        [i for i, state, moment in expected if since <= moment < until and state == 'completed']
+    assert ids(final_state='transcended') == []
+
+
+def test_get_round_trip(archive):
+    """Zapis skompresowany zlib wraca w tej samej postaci; get zwraca najnowszy wpis intencji"""
+    _fill(archive, 6)
+    entry = archive.get('intencja-4')
+    assert entry == {
+        'intention_id': 'intencja-4',
+        'name': 'Intencja 4',
+        'final_state': 'approved',
+        'success_score': 0.04,
+        'transcended_at': (START + timedelta(minutes=1)).isoformat(),
+        'record': _record(4, 'approved')
+    }
+    assert archive.get('brak') is None
+
+    # Ta sama intencja zarchiwizowana ponownie - get zwraca późniejszy wpis
+    archive.append(_record(4, 'completed'), transcended_at=START + timedelta(days=1))
+    assert archive.get('intencja-4')['final_state'] == 'completed'
+
+    # Plik przechowuje skompresowany zapis
+    with sqlite3.connect(archive.path) as connection:
+        stored = connection.execute("SELECT record FROM archived_intentions WHERE rowid = 1").fetchone()[0]
+    payload = zlib.decompress(stored)
+    assert len(stored) < len(payload)
+    assert decode_payload(payload if archive.codec.tag is not None else payload.decode('utf-8'), trusted=True) == \
+        _record(0, 'completed')
+
+    archive.close()
+    archive.open()
+    assert archive.archived == 7
+
+
+def test_transcend_archives_intention(tmp_path, intention_realm):
+    """Transcendencja zapisuje pełny zapis intencji do archiwum wymiaru"""
+    realm = intention_realm(f"intention://memory?archive={tmp_path / 'archive.db'}")
+    intention = realm.manifest({'duchowa': {'opis_intencji': 'do archiwum'}, 'metainfo': {'tags': ['stara']}})
+    intention_id = intention.essence.soul_id
+    realm.interact_with_intention(intention_id, 'wzmocnij', {'power': 5})
+    before = datetime.now()
+    assert realm.transcend(intention_id)
+
+    entry = realm.get_archived_intention(intention_id)
+    assert entry['final_state'] == 'conceived'
+    assert entry['record']['duchowa']['opis_intencji'] == 'do archiwum'
+    assert len(entry['record']['interactions']) == 1
+    assert [e['intention_id'] for e in realm.iter_archived_intentions(since=before - timedelta(seconds=1))] == \
+        [intention_id]
+    assert realm.get_status()['intention_specific']['archive']['archived'] == 1
@@ -0,0 +1,186 @@
+"""
+🎯 Test IntentionRealm - Indeksy Wymiaru Intencji
+
+Testuje:
+- Spójność indeksów stanu, priorytetu, opiekuna i tagów po evolve, zmianach właściwości i transcendencji
+- Jeden handler zdarzenia 'interact' kierujący interakcję do intencji z intention_id
+- Średnie sukcesu i harmonii z sum bieżących zgodne z pełnym przeliczeniem
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import EngineStub
+from luxdb_v2.beings.intention_being import IntentionState, IntentionPriority
+
+
+class FlowStub:
+    """Minimalny CallbackFlow - namespace'y z handlerami i rejestr emitowanych zdarzeń"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+
+    def create_namespace(self, name: str):
+        flow = self
+        return SimpleNamespace(on=lambda event_type, callback: flow.handlers.setdefault((name, event_type), []).append(callback))
+
+    def emit_event(self, namespace: str, event_type: str, data=None, source: str = 'test'):
+        self.emitted.append((namespace, event_type, data))
+        return [handler(SimpleNamespace(data=data)) for handler in self.handlers.get((namespace, event_type), [])]
+
+
+@pytest.fixture
+def engine():
+    engine = EngineStub()
+    engine.callback_flow = FlowStub()
+    return engine
+
+
+@pytest.fixture(params=['memory', 'store'])
+def realm(request, tmp_path, intention_realm):
+    if request.param == 'store':
+        return intention_realm(f"intention://memory?store={tmp_path / 'intentions.db'}&max_resident=3")
+    return intention_realm('intention://memory')
+
+
+def _manifest(realm, count: int):
+    return [
+        realm.manifest({
+            'duchowa': {'opis_intencji': f'intencja {i}'},
+            'priority': 1 + i % 4,
+            'metainfo': {'opiekun': f'opiekun{i % 3}' if i % 2 else None, 'tags': [f'tag{i % 2}', f'tag{i % 5}']}
+        }).essence.soul_id
+        for i in range(count)
+    ]
+
+
+def _assert_indexes_consistent(realm) -> None:
+    """Indeksy równe przeliczonym od nowa z bieżących pól intencji"""
+    states = {state: set() for state in IntentionState}
+    priorities = {priority: set() for priority in IntentionPriority}
+    opiekuni, tags = {}, {}
+
+    for intention_id in list(realm._categorized):
+        intention = realm.get_intention_by_id(intention_id)
+        states[intention.state].add(intention_id)
+        priorities[intention.priority].add(intention_id)
+        if intention.metainfo.opiekun is not None:
+            opiekuni.setdefault(intention.metainfo.opiekun, set()).add(intention_id)
+        for tag in intention.metainfo.tags:
+            tags.setdefault(tag, set()).add(intention_id)
+
+    assert {state: set(ids) for state, ids in realm.intentions_by_state.items()} == states
+    assert {priority: set(ids) for priority, ids in realm.intentions_by_priority.items()} == priorities
+    # Puste wpisy opiekunów i tagów są usuwane
+    assert {key: set(ids) for key, ids in realm.intentions_by_opiekun.items()} == opiekuni
+    assert {key: set(ids) for key, ids in realm.intentions_by_tag.items()} == tags
+    assert realm.count_beings() == len(realm._categorized)
+
+
+def test_indexes_follow_changes(realm):
+    """evolve, settery state/priority, interakcje i transcendencja utrzymują indeksy"""
+    ids = _manifest(realm, 12)
+    _assert_indexes_consistent(realm)
+
+    realm.evolve(ids[0], {'state': 'approved', 'priority': 4})
+    realm.evolve(ids[1], {'metainfo': {'opiekun': 'nowy', 'tags': ['przeniesiona']}})
+    realm.evolve(ids[2], {'metainfo': {'opiekun': None, 'tags': []}})
+    realm.evolve(ids[3], {'duchowa': {'kontekst': 'bez zmiany kluczy'}})
+    _assert_indexes_consistent(realm)
+
+    # Settery właściwości powiadamiają wymiar same
+    intention = realm.get_intention_by_id(ids[4])
+    intention.state = IntentionState.CONTEMPLATED
+    intention.priority = IntentionPriority.CRITICAL
+    realm.get_intention_by_id(ids[5]).state = IntentionState.MANIFESTING
+    _assert_indexes_consistent(realm)
+
+    # Bezpośrednia zmiana pól wymaga reindex_intention
+    tagged = realm.get_intention_by_id(ids[6])
+    tagged.metainfo.tags = ['ręczna']
+    assert realm.reindex_intention(ids[6])
+    realm.interact_with_intention(ids[7], 'przypisz_opiekuna', {'opiekun_id': 'interakcja'})
+    _assert_indexes_consistent(realm)
+
+    for intention_id in (ids[0], ids[1], ids[6], ids[9]):
+        assert realm.transcend(intention_id)
+    assert not realm.transcend(ids[0])
+    _assert_indexes_consistent(realm)
+
+    assert [i.essence.soul_id for i in realm.contemplate('ręczne', tag='ręczna')] == []
+    assert {i.essence.soul_id for i in realm.contemplate('opiekun', opiekun='interakcja')} == {ids[7]}
+    assert 'nowy' not in realm.intentions_by_opiekun
+
+
+def test_interact_event_routed_by_intention_id(tmp_path, engine, intention_realm):
+    """Jeden handler 'interact' na namespace - interakcja trafia tylko do wskazanej intencji"""
+    flow = engine.callback_flow
+    connection_string = f"intention://memory?store={tmp_path / 'intentions.db'}&max_resident=2"
+    realm = intention_realm(connection_string)
+    ids = _manifest(realm, 5)
+    assert len(flow.handlers[('intentions', 'interact')]) == 1
+
+    # Intencja wywłaszczona z pamięci - handler odtwarza ją z magazynu
+    assert ids[0] not in realm.active_intentions
+    results = flow.emit_event('intentions', 'interact', {
+        'intention_id': ids[0], 'type': 'wzmocnij', 'data': {'power': 5}, 'user_id': 'tester'
+    })
+    assert results[0]['success']
+
+    interactions = {intention_id: realm.get_intention_by_id(intention_id).interactions for intention_id in ids}
+    assert [i['user_id'] for i in interactions[ids[0]]] == ['tester']
+    assert all(not interactions[intention_id] for intention_id in ids[1:])
+
+    missing = flow.emit_event('intentions', 'interact', {'intention_id': 'brak', 'type': 'wzmocnij'})
+    assert missing == [{'success': False, 'message': 'Intencja nie znaleziona'}]
+
+    # Interakcja przez zdarzenie trwała w magazynie; handler rejestrowany raz na wymiar
+    realm.disconnect()
+    restarted = intention_realm(connection_string, name='restarted')
+    assert len(restarted.get_intention_by_id(ids[0]).interactions) == 1
+    assert len(flow.handlers[('intentions', 'interact')]) == 2
+
+
+def _assert_averages_match(realm) -> None:
+    """Średnie get_status równe średnim przeliczonym ze wszystkich intencji"""
+    intentions = [realm.get_intention_by_id(intention_id) for intention_id in list(realm._categorized)]
+    status = realm.get_status()['intention_specific']
+    if not intentions:
+        assert status['average_success_score'] == 0.0
+        assert status['average_harmony'] == 0.0
+        return
+
+    success = sum(i.metainfo.wskaznik_sukcesu for i in intentions) / len(intentions)
+    harmony = sum(i._calculate_harmony() for i in intentions) / len(intentions)
+    assert status['average_success_score'] == pytest.approx(success)
+    assert status['average_harmony'] == pytest.approx(harmony)
+
+
+def test_running_averages_match_recomputation(realm):
+    """Sumy bieżące nadążają za manifestacją, ewolucją, interakcjami i transcendencją"""
+    ids = _manifest(realm, 10)
+    _assert_averages_match(realm)
+
+    realm.evolve(ids[0], {'duchowa': {'emocje': ['radość'], 'kontekst': 'pełny'}})
+    realm.evolve(ids[1], {'materialna': {'zadanie': 'zbuduj', 'wymagania': ['czas']}, 'state': 'contemplated'})
+    realm.evolve(ids[2], {'metainfo': {'wskaznik_sukcesu': 0.9}})
+    _assert_averages_match(realm)
+
+    realm.interact_with_intention(ids[3], 'wzmocnij', {'power': 30})
+    realm.interact_with_intention(ids[1], 'realizuj', {})
+    realm.interact_with_intention(ids[4], 'korektuj', {'duchowa': {'kontekst': 'korekta'}})
+    realm.get_intention_by_id(ids[1]).complete_intention({'success_score': 0.95})
+    _assert_averages_match(realm)
+
+    for intention_id in ids[::2]:
+        assert realm.transcend(intention_id)
+    _assert_averages_match(realm)
+
+    for intention_id in ids[1::2]:
+        assert realm.transcend(intention_id)
+    _assert_averages_match(realm)
+
+    realm.manifest({'duchowa': {'opis_intencji': 'po wszystkim'}})
+    _assert_averages_match(realm)
@@ -0,0 +1,87 @@
+"""
+🎯 Test IntentionRealm ze store= - Trwałość Wymiaru Intencji
+
+Testuje:
+- Restart wymiaru - indeksy, liczniki i pełne zapisy intencji odtworzone z magazynu
+- Zachowanie ewolucji (wraz z pamięcią intention_evolved) i interakcji wywłaszczonych intencji
+- Odczyty (contemplate) bez zapisów do magazynu
+"""
+
+from luxdb_v2.beings.intention_being import IntentionState
+from luxdb_v2.realms.intention_realm import IntentionRealm
+from luxdb_v2.realms.intention_store import IntentionStore
+
+
+def _store(tmp_path, max_resident: int = 3) -> str:
+    return f"intention://memory?store={tmp_path / 'intentions.db'}&max_resident={max_resident}"
+
+
+def _manifest(realm: IntentionRealm, count: int):
+    return [
+        realm.manifest({
+            'duchowa': {'opis_intencji': f'intencja {i}'},
+            'metainfo': {'tags': ['parzysta'] if i % 2 == 0 else []}
+        }).essence.soul_id
+        for i in range(count)
+    ]
+
+
+def test_restart_restores_state(tmp_path, intention_realm):
+    """Po disconnect i ponownym połączeniu wymiar widzi te same intencje"""
+    realm = intention_realm(_store(tmp_path))
+    ids = _manifest(realm, 20)
+
+    realm.evolve(ids[0], {'state': 'approved', 'duchowa': {'opis_intencji': 'nowy opis'}})
+    realm.interact_with_intention(ids[1], 'wzmocnij', {'power': 5})
+    assert realm.transcend(ids[2])
+    assert realm.get_status()['intention_specific']['store']['evictions'] > 0
+    realm.disconnect()
+
+    restarted = intention_realm(_store(tmp_path))
+    assert restarted.count_beings() == 19
+    assert restarted.total_intentions_created == 20
+    assert [i.essence.soul_id for i in restarted.get_intentions_by_state(IntentionState.APPROVED)] == [ids[0]]
+    assert {i.essence.soul_id for i in restarted.contemplate('parzyste', tag='parzysta')} == \
+        {ids[k] for k in range(0, 20, 2) if k != 2}
+
+    evolved = restarted.get_intention_by_id(ids[0])
+    assert evolved.duchowa.opis_intencji == 'nowy opis'
+    assert evolved.recall_memories('intention_evolved')
+
+    assert len(restarted.get_intention_by_id(ids[1]).interactions) == 1
+    assert restarted.get_intention_by_id(ids[2]) is None
+    assert restarted.hydrations > 0
+
+
+def test_change_of_evicted_intention_survives_restart(tmp_path, intention_realm):
+    """Zmiana intencji trzymanej przez wywołującego po jej wywłaszczeniu trafia do magazynu"""
+    realm = intention_realm(_store(tmp_path, max_resident=2))
+    ids = _manifest(realm, 5)
+
+    held = realm.get_intention_by_id(ids[0])
+    for intention_id in ids[1:]:
+        realm.get_intention_by_id(intention_id)
+    assert ids[0] not in realm.active_intentions
+
+    held.metainfo.tags = ['przeniesiona']
+    realm.on_intention_recategorized(held)
+    realm.disconnect()
+
+    restarted = intention_realm(_store(tmp_path, max_resident=2))
+    assert [i.essence.soul_id for i in restarted.contemplate('przeniesione', tag='przeniesiona')] == [ids[0]]
+
+
+def test_contemplate_does_not_write(tmp_path, monkeypatch, intention_realm):
+    """Odczyty hydratują i wywłaszczają intencje bez zapisów do magazynu"""
+    realm = intention_realm(_store(tmp_path))
+    _manifest(realm, 20)
+
+    writes = []
+    save_many = IntentionStore.save_many
+    monkeypatch.setattr(IntentionStore, 'save_many', lambda self, *args, **kwargs: (writes.append(args), save_many(self, *args, **kwargs)))
+
+    assert len(realm.contemplate('wszystkie')) == 20
+    assert len(realm.contemplate('parzyste', tag='parzysta')) == 10
+    assert realm.evictions > 0
+    assert writes == []
+
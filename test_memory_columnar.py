@@ -0,0 +1,53 @@
+"""
+📊 Test MemoryColumnar - Kolumnowy Układ Wymiaru Pamięci
+
+Testuje:
+- Wartości równe w Pythonie, lecz różnych typów (True, 1, 1.0) w kolumnie słownikowej
+- Liczby całkowite spoza ±2**53 w kolumnie liczbowej (bez utraty precyzji)
+"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+BIG = 2 ** 53 + 1
+
+
+def _get(realm, soul_id: int) -> dict:
+    found = realm.contemplate('byt', soul_id=soul_id)
+    assert len(found) == 1
+    return found[0]
+
+
+def test_categorical_keeps_value_types(memory_realm):
+    """True, 1 i 1.0 dostają osobne kody i wracają z własnym typem"""
+    realm = memory_realm('memory://?layout=columnar')
+    values = [True, 1, 1.0, 'jeden']
+    ids = [realm.manifest({'soul_name': f'b{i}', 'realm_affinity': value})['soul_id']
+           for i, value in enumerate(values)]
+
+    for soul_id, value in zip(ids, values):
+        stored = _get(realm, soul_id)['realm_affinity']
+        assert stored == value and type(stored) is type(value)
+
+    # Filtr ma tę samą semantykę co układ wierszowy (równość Pythona)
+    assert {b['soul_id'] for b in realm.contemplate('jedynki', realm_affinity=1)} == set(ids[:3])
+    assert [b['soul_id'] for b in realm.contemplate('napis', realm_affinity='jeden')] == [ids[3]]
+
+
+def test_big_integers_round_trip(memory_realm):
+    """Liczby całkowite niereprezentowalne w float64 trafiają do dodatków wiersza"""
+    realm = memory_realm('memory://?layout=columnar')
+    big = realm.manifest({'soul_name': 'duży', 'energy_level': BIG})['soul_id']
+    negative = realm.manifest({'soul_name': 'ujemny', 'energy_level': -BIG})['soul_id']
+    small = realm.manifest({'soul_name': 'mały', 'energy_level': 2 ** 53})['soul_id']
+
+    assert _get(realm, big)['energy_level'] == BIG
+    assert _get(realm, negative)['energy_level'] == -BIG
+    assert _get(realm, small)['energy_level'] == 2 ** 53
+
+    assert [b['soul_id'] for b in realm.contemplate('dokładny', energy_level=BIG)] == [big]
+    assert [b['soul_id'] for b in realm.contemplate('powyżej', energy_level_min=BIG)] == [big]
+
+    realm.evolve(small, {'energy_level': BIG + 2})
+    assert _get(realm, small)['energy_level'] == BIG + 2
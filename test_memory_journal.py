@@ -0,0 +1,137 @@
+"""
+📜 Test MemoryJournal - Trwałość Wymiaru Pamięci
+
+Testuje:
+- Odtworzenie stanu z dziennika po awarii procesu (os._exit bez disconnect)
+- Odtworzenie z migawki i ogona dziennika
+- Zachowanie typów spoza JSON (krotki, zbiory, daty, klucze liczbowe) po odtworzeniu
+- Politykę fsync=interval - ostatnie zapisy serii synchronizowane bez kolejnego dopisania
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+from luxdb_v2.realms import memory_journal
+from luxdb_v2.realms.memory_journal import MemoryJournal, OP_MANIFEST
+from luxdb_v2.realms.memory_realm import MemoryRealm
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _crash_after(connection_string: str, body: str) -> dict:
+    """Wykonuje operacje w osobnym procesie, zrzuca stan i kończy proces bez zamknięcia dziennika"""
+    script = f"""
+import json, os
+from conftest import EngineStub
+from luxdb_v2.realms.memory_realm import MemoryRealm
+realm = MemoryRealm('crash', {connection_string!r}, EngineStub())
+realm.connect()
+{body}
+state = {{being['soul_id']: being for being in realm.contemplate('all')}}
+print(json.dumps({{'state': state, 'next_soul_id': realm.next_soul_id}}))
+os._exit(0)
+"""
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _state(realm: MemoryRealm) -> dict:
+    return json.loads(json.dumps({being['soul_id']: being for being in realm.contemplate('all')}))
+
+
+def test_replay_after_crash(tmp_path, memory_realm):
+    """Stan po os._exit odtworzony w całości z dziennika"""
+    connection_string = f"memory://?journal={tmp_path / 'beings'}&fsync=always"
+    before = _crash_after(connection_string, """
+for i in range(50):
+    realm.manifest({'soul_name': f'being_{i}', 'value': i})
+for soul_id in range(1, 51, 3):
+    realm.evolve(soul_id, {'value': -soul_id, 'evolved': True})
+for soul_id in range(2, 51, 5):
+    realm.transcend(soul_id)
+""")
+
+    assert len(before['state']) == 40
+
+    realm = memory_realm(connection_string, name='replayed')
+    assert _state(realm) == before['state']
+    assert realm.count_beings() == len(before['state'])
+
+    # Sekwencja soul_id odtworzona - nowy byt nie nadpisze istniejącego
+    assert realm.manifest({'soul_name': 'after'})['soul_id'] >= before['next_soul_id']
+
+
+def test_replay_snapshot_and_tail_after_crash(tmp_path, memory_realm):
+    """Migawka i zapisy po niej odtworzone po awarii"""
+    connection_string = f"memory://?journal={tmp_path / 'beings'}&fsync=always"
+    before = _crash_after(connection_string, """
+for i in range(30):
+    realm.manifest({'soul_name': f'being_{i}', 'value': i})
+realm.snapshot(wait=True)
+for i in range(30, 40):
+    realm.manifest({'soul_name': f'being_{i}', 'value': i})
+realm.evolve(1, {'value': 100})
+realm.transcend(2)
+""")
+
+    realm = memory_realm(connection_string, name='replayed')
+    assert _state(realm) == before['state']
+
+
+def test_replay_keeps_value_types(tmp_path, memory_realm):
+    """Wartości odtworzone z migawki i dziennika mają te same typy co zapisane"""
+    connection_string = f"memory://?journal={tmp_path / 'beings'}&fsync=always"
+    values = {
+        'coords': (1, 2.5, ('a', None)),
+        'born': datetime(2024, 5, 17, 12, 30, 45, 123456),
+        'day': date(2024, 5, 17),
+        'tags': {'x', 'y'},
+        'frozen': frozenset({1, 2}),
+        'by_level': {1: 'jeden', (2, 3): ['dwa']},
+        'lookalike': {'__tuple__': [1, 2]},
+        'raw': b'\x00\xff',
+        'plain': {'list': [1, [2, 3]], 'flag': True}
+    }
+
+    realm = memory_realm(connection_string)
+    first = realm.manifest({'soul_name': 'migawka', **values})['soul_id']
+    realm.snapshot(wait=True)
+    second = realm.manifest({'soul_name': 'dziennik'})['soul_id']
+    realm.evolve(second, values)
+    expected = {being['soul_id']: dict(being) for being in realm.contemplate('all')}
+    realm.disconnect()
+
+    replayed = memory_realm(connection_string, name='replayed')
+    state = {being['soul_id']: dict(being) for being in replayed.contemplate('all')}
+    assert state == expected
+    for soul_id in (first, second):
+        for key, value in values.items():
+            assert type(state[soul_id][key]) is type(value)
+        assert type(state[soul_id]['coords'][2]) is tuple
+        assert set(state[soul_id]['by_level']) == {1, (2, 3)}
+
+
+def test_interval_policy_syncs_trailing_writes(tmp_path, monkeypatch):
+    """fsync=interval: zapisy bez kolejnego dopisania zsynchronizowane przez wątek tła"""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(memory_journal.os, 'fsync', lambda fd: (synced.append(fd), real_fsync(fd)))
+
+    journal = MemoryJournal(str(tmp_path / 'journal'), fsync='interval', fsync_interval=0.05)
+    journal.open(lambda op, payload: None)
+    try:
+        for soul_id in range(5):
+            journal.append(journal.encode(OP_MANIFEST, {'soul_id': soul_id}))
+        synced.clear()
+
+        deadline = time.monotonic() + 2.0
+        while not synced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert synced, "ostatnie zapisy serii nie zostały zsynchronizowane"
+    finally:
+        journal.close()
+
@@ -0,0 +1,126 @@
+"""
+⚡ Test MemoryRealm - Współbieżność Wymiaru Pamięci
+
+Testuje:
+- Równoległe manifestacje, ewolucje i transcendencje na pasach blokad
+- Spójność indeksów i listy kolejności po równoległych zapisach
+- Iterację po indeksie posortowanym przy równoległej ewolucji (bez duplikatów)
+"""
+
+import threading
+
+from luxdb_v2.realms.memory_compact import estimate_size
+
+WORKERS = 8
+BEINGS_PER_WORKER = 300
+
+
+def _run_workers(target) -> None:
+    errors = []
+
+    def guarded(worker: int) -> None:
+        try:
+            target(worker)
+        except Exception as e:  # pragma: no cover - raportowane niżej
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(worker,)) for worker in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def test_concurrent_writers(memory_realm):
+    """Równoległe zapisy nie gubią bytów ani wpisów indeksów"""
+    realm = memory_realm('memory://?lock_stripes=4')
+    realm.create_index('worker')
+    survivors = {}
+
+    def work(worker: int) -> None:
+        kept = []
+        for i in range(BEINGS_PER_WORKER):
+            soul_id = realm.manifest({'soul_name': f'w{worker}_{i}', 'worker': worker, 'step': 0})['soul_id']
+            realm.evolve(soul_id, {'step': 1})
+            if i % 3 == 0:
+                assert realm.transcend(soul_id)
+            else:
+                kept.append(soul_id)
+        survivors[worker] = kept
+
+    _run_workers(work)
+
+    expected = {soul_id for kept in survivors.values() for soul_id in kept}
+    assert realm.count_beings() == len(expected)
+    assert set(realm.beings) == expected
+
+    # Każdy soul_id przydzielony dokładnie raz
+    assert len(realm._order) == len(set(realm._order)) == WORKERS * BEINGS_PER_WORKER
+    assert realm._tombstones == WORKERS * BEINGS_PER_WORKER - len(expected)
+
+    for worker, kept in survivors.items():
+        found = realm.contemplate('by_worker', worker=worker)
+        assert sorted(being['soul_id'] for being in found) == sorted(kept)
+        assert all(being['step'] == 1 for being in found)
+
+
+def test_concurrent_transcend_of_same_being(memory_realm):
+    """Tylko jedna z równoległych transcendencji tego samego bytu się udaje"""
+    realm = memory_realm('memory://')
+    soul_ids = [realm.manifest({'soul_name': f'b{i}'})['soul_id'] for i in range(200)]
+    results = []
+
+    def work(worker: int) -> None:
+        results.extend(realm.transcend(soul_id) for soul_id in soul_ids)
+
+    _run_workers(work)
+
+    assert results.count(True) == len(soul_ids)
+    assert realm.count_beings() == 0
+    assert realm._tombstones == len(realm._order)
+
+
+def test_sorted_iteration_with_concurrent_evolve(memory_realm):
+    """Byt przesunięty ewolucją za bieżącą pozycję nie jest zwracany drugi raz"""
+    realm = memory_realm('memory://')
+    realm.create_index('v', kind='sorted')
+    for i in range(3000):
+        realm.manifest({'soul_name': f'b{i}', 'v': i})
+
+    seen = []
+    for being in realm.contemplate_iter('ordered', order_by='v'):
+        seen.append(being['soul_id'])
+        if len(seen) % 2:
+            # Przesuń bieżący byt na koniec porządku
+            realm.evolve(being['soul_id'], {'v': 10000 + being['v']})
+
+    assert len(seen) == len(set(seen)) == 3000
+
+
+def test_sorted_iteration_desc_with_limit(memory_realm):
+    """order_desc i limit na indeksie posortowanym zgodne z pełnym sortowaniem"""
+    realm = memory_realm('memory://')
+    realm.create_index('v', kind='sorted')
+    values = [(i * 7919) % 1000 for i in range(1000)]
+    for i, value in enumerate(values):
+        realm.manifest({'soul_name': f'b{i}', 'v': value})
+
+    found = list(realm.contemplate_iter('top', order_by='v', order_desc=True, limit=25))
+    assert [being['v'] for being in found] == sorted(values, reverse=True)[:25]
+
+
+def test_memory_stats_estimate_matches_full_measurement(memory_realm):
+    """Szacunek z próbki bliski pomiarowi wszystkich bytów, w obu układach na tej samej próbce"""
+    for layout in ('row', 'compact'):
+        realm = memory_realm(f'memory://?layout={layout}', name=layout)
+        for i in range(5000):
+            realm.manifest({'soul_name': f'being_{i}', 'realm_affinity': f'realm_{i % 4}', 'value': i * 1.5})
+
+        stats = realm.get_memory_stats()
+        estimate = stats['layout_estimate']
+        assert estimate['sample_size'] == realm.MEMORY_SAMPLE
+        assert 0 < estimate['compact_bytes'] < estimate['row_bytes']
+
+        measured = estimate_size(value for item in realm.beings.items() for value in item)
+        assert abs(estimate[f'{layout}_bytes'] - measured) / measured < 0.05
@@ -0,0 +1,98 @@
+"""
+🧩 Test ShardedRealm - Wymiar Dzielony na Pliki SQLite
+
+Testuje:
+- Scalanie wyników shardów z order_by, order_desc i limit zgodne z globalnym sortowaniem
+- Unikalność soul_id przy dwóch instancjach na tych samych plikach
+- Częściowy zapis partii - ShardWriteError z zatwierdzonymi bytami i błędami shardów
+"""
+
+import sqlite3
+
+import pytest
+
+from luxdb_v2.realms.sharded_realm import ShardWriteError
+
+
+def _sharded(tmp_path, shards: int = 3) -> str:
+    return f"sharded://{tmp_path / 'beings.db'}?shards={shards}"
+
+
+def _global_order(beings, descending):
+    """Porządek SQLite: NULL < liczby < tekst, remisy rozstrzyga soul_id"""
+    def key(being):
+        value = being.get('score')
+        rank = (0, 0) if value is None else (1, value) if isinstance(value, (int, float)) else (2, value)
+        return rank + (being['soul_id'],)
+    return [being['soul_id'] for being in sorted(beings, key=key, reverse=descending)]
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_merge_order_with_limit(tmp_path, descending, sharded_realm):
+    """order_by + order_desc + limit na shardach daje ten sam wynik co sortowanie całości"""
+    realm = sharded_realm(_sharded(tmp_path))
+    data = []
+    for i in range(300):
+        if i % 50 == 0:
+            data.append({'soul_name': f'b{i}'})
+        elif i % 40 == 0:
+            data.append({'soul_name': f'b{i}', 'score': f'tekst {i}'})
+        else:
+            data.append({'soul_name': f'b{i}', 'score': (i * 37) % 23})
+    manifested = realm.manifest_many(data, batch_size=64)
+    for being, source in zip(manifested, data):
+        being['score'] = source.get('score')
+
+    expected = _global_order(manifested, descending)
+    for limit in (1, 7, 50, 300):
+        found = realm.contemplate('ranking', order_by='score', order_desc=descending, limit=limit)
+        assert [being['soul_id'] for being in found] == expected[:limit]
+
+        streamed = realm.contemplate_iter('ranking', batch_size=16, order_by='score', order_desc=descending, limit=limit)
+        assert [being['soul_id'] for being in streamed] == expected[:limit]
+
+
+def test_soul_ids_unique_across_instances(tmp_path, sharded_realm):
+    """Dwie instancje na tych samych plikach rezerwują rozłączne zakresy soul_id"""
+    first = sharded_realm(_sharded(tmp_path), name='first')
+    second = sharded_realm(_sharded(tmp_path), name='second')
+    soul_ids = [first.manifest({'owner': 'first'})['soul_id'] for _ in range(5)]
+    soul_ids += [second.manifest({'owner': 'second'})['soul_id'] for _ in range(5)]
+    soul_ids += [being['soul_id'] for being in first.manifest_many([{'owner': 'first'}] * 1500)]
+    soul_ids += [being['soul_id'] for being in second.manifest_many([{'owner': 'second'}] * 1500)]
+
+    assert len(soul_ids) == len(set(soul_ids)) == 3010
+    assert first.count_beings() == 3010
+
+
+def test_sequence_continues_after_existing_data(tmp_path, sharded_realm):
+    """Pliki sprzed shard_sequence - nowe soul_id nie nadpisują istniejących bytów"""
+    realm = sharded_realm(_sharded(tmp_path))
+    existing = [being['soul_id'] for being in realm.manifest_many([{'i': i} for i in range(10)])]
+    realm.disconnect()
+
+    for index in range(3):
+        with sqlite3.connect(str(tmp_path / f'beings.{index}.db')) as connection:
+            connection.execute("DROP TABLE IF EXISTS shard_sequence")
+
+    reopened = sharded_realm(_sharded(tmp_path))
+    assert reopened.manifest({'i': 10})['soul_id'] > max(existing)
+    assert reopened.count_beings() == 11
+
+
+def test_partial_batch_failure(tmp_path, sharded_realm):
+    """Błąd jednego shardu - ShardWriteError z bytami zapisanymi w pozostałych"""
+    realm = sharded_realm(_sharded(tmp_path))
+    def failing(*args, **kwargs):
+        raise sqlite3.OperationalError("database or disk is full")
+    realm.shards[1].manifest_many = failing
+
+    with pytest.raises(ShardWriteError) as raised:
+        realm.manifest_many([{'i': i} for i in range(9)])
+
+    error = raised.value
+    assert list(error.errors) == [1]
+    assert len(error.manifested) == 6
+    assert all(being['soul_id'] % 3 != 1 for being in error.manifested)
+    assert realm.count_beings() == 6
+
@@ -0,0 +1,121 @@
+"""
+🕯️ Test SoulRealm - Intencje i Wspomnienia w Tabelach Dusz
+
+Testuje:
+- Migrację dusz zapisanych przed soul_intents/soul_memories (intencje i listy wspomnień w wierszu)
+- Przycinanie wspomnień do memory_retention osobno dla każdego typu
+- find_souls(has_intent=...) przez indeks soul_intents
+"""
+
+import json
+import sqlite3
+
+
+def _connection_string(path, **options) -> str:
+    query = '&'.join(f'{key}={value}' for key, value in options.items())
+    return f"sqlite://{path}" + (f"?{query}" if query else '')
+
+
+def test_migrates_embedded_intents_and_memory(tmp_path, soul_realm):
+    """Intencje i listy wspomnień z wiersza souls trafiają do tabel, reszta pamięci zostaje w wierszu"""
+    path = tmp_path / 'souls.db'
+    memory = {
+        'experiences': [
+            {'timestamp': '2024-01-01T10:00:00', 'data': {'event': 'narodziny'}},
+            {'timestamp': '2024-01-02T10:00:00', 'data': 'drugie'}
+        ],
+        'notes': ['wpis bez kształtu', {'free': 'form'}],
+        'mood': 'spokojny',
+        'empty': []
+    }
+    with sqlite3.connect(str(path)) as connection:
+        connection.execute("""
+            CREATE TABLE souls (
+                id TEXT PRIMARY KEY, type TEXT NOT NULL, role TEXT, intents TEXT, memory TEXT, sockets TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'dormant', energy_level REAL DEFAULT 100.0
+            )
+        """)
+        connection.execute(
+            "INSERT INTO souls (id, type, role, intents, memory, sockets) VALUES (?, ?, ?, ?, ?, ?)",
+            ('stara', 'guardian', 'strażnik', json.dumps(['chroń', 'ucz', 'chroń']), json.dumps(memory), json.dumps({}))
+        )
+
+    realm = soul_realm(_connection_string(path))
+    soul = realm.get_soul('stara')
+    assert soul['intents'] == ['chroń', 'ucz']
+    assert soul['memory']['experiences'] == memory['experiences']
+    assert soul['memory']['notes'] == memory['notes']
+    assert soul['memory']['mood'] == 'spokojny'
+    assert soul['memory']['empty'] == []
+
+    row = realm.connection.execute("SELECT intents, memory FROM souls WHERE id = 'stara'").fetchone()
+    assert row['intents'] is None
+    assert json.loads(row['memory']) == {'mood': 'spokojny', 'empty': []}
+    assert realm.get_soul_memories('stara', 'experiences', limit=1) == memory['experiences'][-1:]
+
+    # Ponowne połączenie nie migruje drugi raz
+    realm.disconnect()
+    again = soul_realm(_connection_string(path))
+    assert again.get_soul('stara')['memory']['experiences'] == memory['experiences']
+
+
+def test_memory_retention_per_type(tmp_path, soul_realm):
+    """Dopisywanie przycina każdy typ do ostatnich memory_retention wpisów"""
+    realm = soul_realm(_connection_string(tmp_path / 'souls.db', memory_retention=5))
+    realm.manifest_soul({'id': 'pamiętliwa', 'type': 'sage', 'memory': {'seeded': list(range(8))}})
+
+    for i in range(40):
+        assert realm.add_memory_to_soul('pamiętliwa', 'events', {'n': i})
+        if i % 10 == 0:
+            assert realm.add_memory_to_soul('pamiętliwa', 'rare', i)
+
+    events = realm.get_soul_memories('pamiętliwa', 'events')
+    assert [entry['data']['n'] for entry in events] == list(range(35, 40))
+    assert [entry['data'] for entry in realm.get_soul_memories('pamiętliwa', 'rare')] == [0, 10, 20, 30]
+
+    # Pamięć zapisana w całości nie jest przycinana, dopiero kolejne dopisanie
+    assert realm.get_soul('pamiętliwa')['memory']['seeded'] == list(range(8))
+    realm.add_memory_to_soul('pamiętliwa', 'seeded', 8)
+    seeded = realm.get_soul_memories('pamiętliwa', 'seeded')
+    assert seeded[:4] == [4, 5, 6, 7]
+    assert seeded[4]['data'] == 8
+
+    counts = dict(realm.connection.execute(
+        "SELECT memory_type, COUNT(*) FROM soul_memories WHERE soul_id = 'pamiętliwa' GROUP BY memory_type"
+    ).fetchall())
+    assert counts == {'events': 5, 'rare': 4, 'seeded': 5}
+
+    assert not realm.add_memory_to_soul('nieistniejąca', 'events', {})
+
+
+def test_find_souls_by_intent(tmp_path, soul_realm):
+    """has_intent czyta soul_intents przez indeks i widzi dodane oraz usunięte intencje"""
+    realm = soul_realm(_connection_string(tmp_path / 'souls.db'))
+    realm.manifest_soul({'id': 'a', 'type': 'guardian', 'intents': ['chroń', 'ucz']})
+    realm.manifest_soul({'id': 'b', 'type': 'guardian', 'intents': ['ucz']})
+    realm.manifest_soul({'id': 'c', 'type': 'sage', 'intents': []})
+
+    def found(**criteria):
+        return {soul['id'] for soul in realm.find_souls(**criteria)}
+
+    assert found(has_intent='ucz') == {'a', 'b'}
+    assert found(has_intent='chroń') == {'a'}
+    assert found(has_intent='ucz', soul_type='sage') == set()
+
+    assert realm.add_intent_to_soul('c', 'ucz')
+    assert not realm.add_intent_to_soul('c', 'ucz')
+    assert realm.remove_intent_from_soul('a', 'ucz')
+    assert found(has_intent='ucz') == {'b', 'c'}
+    assert realm.get_soul('c')['intents'] == ['ucz']
+
+    # Manifestacja od nowa zastępuje intencje
+    realm.manifest_soul({'id': 'b', 'type': 'guardian', 'intents': ['śpij']})
+    assert found(has_intent='ucz') == {'c'}
+    assert found(has_intent='śpij') == {'b'}
+
+    plan = ' '.join(row[-1] for row in realm.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM souls WHERE id IN (SELECT soul_id FROM soul_intents WHERE intent = ?)",
+        ('ucz',)
+    ))
+    assert 'idx_soul_intents_intent' in plan
@@ -0,0 +1,110 @@
+"""
+✍️ Test SQLiteGroupWriter - Grupowe Zatwierdzanie Zapisów
+
+Testuje:
+- Izolację błędu - nieudana operacja partii wycofuje tylko własne zmiany
+- Zatwierdzanie całej partii jednym commit
+- Równoległe manifestacje SQLiteRealm w trybie group_commit=1
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from luxdb_v2.realms.sqlite_writer import SQLiteGroupWriter
+
+
+def _writer(path):
+    connection = sqlite3.connect(str(path), check_same_thread=False)
+    connection.execute("CREATE TABLE items (name TEXT PRIMARY KEY)")
+    connection.commit()
+    # Długie okno - wszystkie operacje testu trafiają do jednej partii
+    return connection, SQLiteGroupWriter(connection, threading.Lock(), window=0.5)
+
+
+def _insert(*names):
+    def operation(cursor):
+        cursor.executemany("INSERT INTO items (name) VALUES (?)", [(name,) for name in names])
+        return len(names)
+    return operation
+
+
+def _names(path):
+    with sqlite3.connect(str(path)) as connection:
+        return {row[0] for row in connection.execute("SELECT name FROM items")}
+
+
+def test_failing_operation_rolls_back_alone(tmp_path):
+    """Błąd w środku partii wycofuje tylko zmiany nieudanej operacji"""
+    path = tmp_path / 'group.db'
+    connection, writer = _writer(path)
+
+    def failing(cursor):
+        cursor.execute("INSERT INTO items (name) VALUES ('partial')")
+        raise ValueError("operacja przerwana")
+
+    try:
+        before = writer.submit(_insert('a', 'b'))
+        broken = writer.submit(failing)
+        conflict = writer.submit(_insert('c', 'a'))
+        after = writer.submit(_insert('d'))
+
+        assert before.result(timeout=5) == 2
+        with pytest.raises(ValueError):
+            broken.result(timeout=5)
+        with pytest.raises(sqlite3.IntegrityError):
+            conflict.result(timeout=5)
+        assert after.result(timeout=5) == 1
+
+        stats = writer.get_stats()
+        assert stats['batches'] == 1
+        assert stats['operations'] == 4
+    finally:
+        writer.close()
+        connection.close()
+
+    # Trwałe są tylko udane operacje - bez 'partial' i bez 'c' z konfliktu
+    assert _names(path) == {'a', 'b', 'd'}
+
+
+def test_submit_after_close_is_rejected(tmp_path):
+    """Zamknięty pisarz zatwierdza oczekujące zapisy i odrzuca nowe"""
+    path = tmp_path / 'group.db'
+    connection, writer = _writer(path)
+    pending = writer.submit(_insert('x'))
+    writer.close()
+
+    assert pending.result(timeout=5) == 1
+    with pytest.raises(RuntimeError):
+        writer.submit(_insert('y'))
+    connection.close()
+    assert _names(path) == {'x'}
+
+
+def test_realm_concurrent_manifest(tmp_path, sqlite_realm):
+    """Równoległe manifestacje w trybie group_commit - unikalne soul_id, wszystko trwałe"""
+    connection_string = f"sqlite://{tmp_path / 'realm.db'}?group_commit=1&group_commit_window=20"
+    realm = sqlite_realm(connection_string)
+
+    soul_ids = []
+    lock = threading.Lock()
+
+    def work(worker):
+        for i in range(50):
+            being = realm.manifest({'soul_name': f'w{worker}_{i}'})
+            with lock:
+                soul_ids.append(being['soul_id'])
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(soul_ids) == len(set(soul_ids)) == 400
+    assert realm._writer.get_stats()['batches'] < 400
+    realm.disconnect()
+
+    assert sqlite_realm(connection_string).count_beings() == 400
+
@@ -0,0 +1,181 @@
+"""
+💎 Test SQLiteRealm - Ewolucja i Statystyki Bytów
+
+Testuje:
+- Scalanie essence w evolve według JSON Merge Patch (RFC 7396)
+- Ścieżki zastępcze: bez RETURNING (SQLite < 3.35) i bez json_patch (JSON1) oraz kodek binarny
+- Liczniki i histogramy utrzymywane przez triggery zgodne z COUNT(*) - także po przerwanym bulk_load
+"""
+
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+FEATURES = {
+    'native': {},
+    'no_returning': {'_returning': False},
+    'no_json1': {'_json_patch': False},
+    'no_features': {'_returning': False, '_json_patch': False},
+}
+
+
+def _being(realm, soul_id: int) -> dict:
+    found = realm.contemplate('byt', soul_id=soul_id)
+    assert len(found) == 1
+    return found[0]
+
+
+@pytest.fixture(params=[(codec, features) for codec in ('json', 'pickle') for features in FEATURES],
+                ids=lambda param: f'{param[0]}-{param[1]}')
+def realm(request, tmp_path, sqlite_realm):
+    codec, features = request.param
+    realm = sqlite_realm(f"sqlite://{tmp_path / 'beings.db'}?codec={codec}")
+    for attribute, value in FEATURES[features].items():
+        setattr(realm, attribute, value)
+    return realm
+
+
+def test_evolve_merge_patch(realm):
+    """None usuwa pole, zagnieżdżone obiekty są scalane, listy i wartości proste zastępowane"""
+    soul_id = realm.manifest({
+        'soul_name': 'scalany',
+        'energy_level': 10,
+        'mood': 'spokojny',
+        'profile': {'color': 'złoty', 'size': 3, 'deep': {'a': 1, 'b': 2}},
+        'tags': ['x', 'y']
+    })['soul_id']
+
+    evolved = realm.evolve(soul_id, {
+        'energy_level': 20,
+        'mood': None,
+        'profile': {'size': None, 'shape': 'kula', 'deep': {'b': 3}},
+        'tags': ['z']
+    })
+
+    assert evolved['energy_level'] == 20
+    assert 'mood' not in evolved
+    assert evolved['profile'] == {'color': 'złoty', 'shape': 'kula', 'deep': {'a': 1, 'b': 3}}
+    assert evolved['tags'] == ['z']
+    assert evolved['last_evolution']
+
+    stored = _being(realm, soul_id)
+    assert stored['energy_level'] == 20
+    assert 'mood' not in stored
+    assert stored['profile'] == evolved['profile']
+    assert stored['tags'] == ['z']
+
+
+def test_evolve_without_returning_being(realm):
+    """return_being=False zwraca tylko soul_id i last_evolution, zmiana zapisana"""
+    soul_id = realm.manifest({'soul_name': 'cichy', 'note': 'a'})['soul_id']
+
+    result = realm.evolve(soul_id, {'note': 'b', 'soul_name': 'cichszy'}, return_being=False)
+    assert set(result) == {'soul_id', 'last_evolution'}
+    assert result['soul_id'] == soul_id
+
+    stored = _being(realm, soul_id)
+    assert stored['note'] == 'b'
+    assert stored['soul_name'] == 'cichszy'
+    assert stored['last_evolution'] == result['last_evolution']
+
+
+def test_evolve_missing_being(realm):
+    """Ewolucja nieistniejącego bytu zwraca None w każdej ścieżce"""
+    assert realm.evolve(999, {'note': 'x'}) is None
+    assert realm.evolve(999, {'note': 'x'}, return_being=False) is None
+
+
+def _counted(path) -> dict:
+    """Liczność i histogramy przeliczone pełnym skanem tabeli bytów"""
+    with sqlite3.connect(str(path)) as connection:
+        rows = connection.execute("SELECT realm_affinity, energy_level FROM astral_beings").fetchall()
+    width = 10
+    return {
+        'total': len(rows),
+        'realm_affinity': dict(Counter(affinity for affinity, _ in rows)),
+        'energy_buckets': dict(Counter(
+            None if energy is None else math.floor(energy / width) * width for _, energy in rows
+        )),
+        'energy_bucket_width': width
+    }
+
+
+def _assert_stats_match(realm, path) -> None:
+    expected = _counted(path)
+    assert realm.count_beings() == expected['total']
+    assert realm.get_histograms() == expected
+
+
+def test_stats_follow_writes(tmp_path, sqlite_realm):
+    """Triggery statystyk nadążają za manifestacją, ewolucją i transcendencją"""
+    path = tmp_path / 'stats.db'
+    realm = sqlite_realm(f"sqlite://{path}")
+    affinities = ('ogień', 'woda', None)
+    ids = [
+        realm.manifest({'soul_name': f'b{i}', 'energy_level': i * 7.5 - 40, 'realm_affinity': affinities[i % 3]})['soul_id']
+        for i in range(60)
+    ]
+    _assert_stats_match(realm, path)
+
+    for soul_id in ids[::4]:
+        realm.evolve(soul_id, {'energy_level': -soul_id})
+    for soul_id in ids[1::5]:
+        realm.evolve(soul_id, {'realm_affinity': 'ziemia'})
+    for soul_id in ids[2::6]:
+        realm.evolve(soul_id, {'energy_level': None, 'realm_affinity': 'powietrze'})
+    for soul_id in ids[3::7]:
+        realm.evolve(soul_id, {'note': 'bez zmiany kolumn'})
+    _assert_stats_match(realm, path)
+
+    for soul_id in ids[::3]:
+        assert realm.transcend(soul_id)
+    _assert_stats_match(realm, path)
+
+
+def test_stats_after_failed_bulk_load(tmp_path, sqlite_realm):
+    """Wyjątek w bulk_load - statystyki przeliczone przy wyjściu z bloku"""
+    path = tmp_path / 'stats.db'
+    realm = sqlite_realm(f"sqlite://{path}")
+    realm.manifest({'soul_name': 'przed', 'energy_level': 5})
+
+    with pytest.raises(RuntimeError):
+        with realm.bulk_load():
+            realm.manifest_many({'soul_name': f'b{i}', 'energy_level': i} for i in range(100))
+            assert realm.count_beings() == 101
+            raise RuntimeError("przerwane ładowanie")
+
+    _assert_stats_match(realm, path)
+    realm.manifest({'soul_name': 'po', 'realm_affinity': 'woda', 'energy_level': 55})
+    _assert_stats_match(realm, path)
+
+
+def test_stats_after_killed_bulk_load(tmp_path, sqlite_realm):
+    """Proces zabity w trakcie bulk_load - następne połączenie przelicza statystyki"""
+    path = tmp_path / 'stats.db'
+    script = f"""
+import os
+from conftest import EngineStub
+from luxdb_v2.realms.sqlite_realm import SQLiteRealm
+realm = SQLiteRealm('killed', {f"sqlite://{path}"!r}, EngineStub())
+realm.manifest({{'soul_name': 'przed', 'energy_level': 5}})
+with realm.bulk_load():
+    realm.manifest_many({{'soul_name': f'b{{i}}', 'energy_level': i * 3}} for i in range(100))
+    realm.connection.commit()
+    os._exit(0)
+"""
+    subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True)
+
+    realm = sqlite_realm(f"sqlite://{path}")
+    _assert_stats_match(realm, path)
+    assert realm.count_beings() == 101
+
+    realm.evolve(1, {'energy_level': 99})
+    realm.transcend(2)
+    _assert_stats_match(realm, path)
@@ -0,0 +1,149 @@
+"""
+🔥 Test TieredRealm - Warstwa Pamięci przed SQLite
+
+Testuje:
+- Transcendencję nowego, jeszcze niezapisanego bytu (nigdy nie trafia do SQLite)
+- Transcendencję i ewolucję bytu w trakcie zapisu partii (in-flight)
+- Zgodność count_beings z zawartością SQLite po zapisie i po restarcie
+- Rezerwację bloków soul_id w pliku - bez ponownego nadania po restarcie i kolizji między procesami
+"""
+
+import sqlite3
+import threading
+
+from luxdb_v2.realms.tiered_realm import TieredRealm
+
+
+def _tiered(tmp_path) -> str:
+    # Długi flush_interval - zapis tylko przez jawne flush() w teście
+    return f"tiered://{tmp_path / 'beings.db'}?flush_interval=3600&flush_batch=100000"
+
+
+def _stored(tmp_path) -> dict:
+    """Zawartość SQLite: soul_id -> soul_name"""
+    with sqlite3.connect(str(tmp_path / 'beings.db')) as connection:
+        return dict(connection.execute("SELECT soul_id, soul_name FROM astral_beings"))
+
+
+def _during_write_back(realm: TieredRealm, action) -> None:
+    """Wykonuje akcję z innego wątku, gdy partia jest zapisywana do SQLite"""
+    write_back = realm.backing.write_back
+
+    def wrapped(rows, deleted=()):
+        worker = threading.Thread(target=action)
+        worker.start()
+        worker.join()
+        realm.backing.write_back = write_back
+        return write_back(rows, deleted)
+
+    realm.backing.write_back = wrapped
+
+
+def test_transcend_new_dirty_being(tmp_path, tiered_realm):
+    """Nowy byt usunięty przed zapisem nie dociera do SQLite"""
+    realm = tiered_realm(_tiered(tmp_path))
+    soul_ids = [realm.manifest({'soul_name': f'b{i}'})['soul_id'] for i in range(5)]
+    assert realm.transcend(soul_ids[1])
+    assert realm.get(soul_ids[1]) is None
+    assert realm.count_beings() == 4
+
+    assert realm.flush() == 4
+    assert set(_stored(tmp_path)) == set(soul_ids) - {soul_ids[1]}
+    assert realm.count_beings() == 4
+
+
+def test_transcend_in_flight_being(tmp_path, tiered_realm):
+    """Byt usunięty w trakcie zapisu partii zostaje usunięty z SQLite kolejnym zapisem"""
+    realm = tiered_realm(_tiered(tmp_path))
+    soul_ids = [realm.manifest({'soul_name': f'b{i}'})['soul_id'] for i in range(5)]
+    removed = []
+    _during_write_back(realm, lambda: removed.append(realm.transcend(soul_ids[2])))
+
+    realm.flush()
+    assert removed == [True]
+    assert realm.get(soul_ids[2]) is None
+    assert realm.count_beings() == 4
+
+    realm.flush()
+    assert set(_stored(tmp_path)) == set(soul_ids) - {soul_ids[2]}
+    assert realm.count_beings() == 4
+
+
+def test_evolve_in_flight_being(tmp_path, tiered_realm):
+    """Zmiana w trakcie zapisu partii nie ginie - byt zostaje brudny do następnego zapisu"""
+    realm = tiered_realm(_tiered(tmp_path))
+    soul_id = realm.manifest({'soul_name': 'przed'})['soul_id']
+    _during_write_back(realm, lambda: realm.evolve(soul_id, {'soul_name': 'po'}))
+
+    realm.flush()
+    assert realm.get(soul_id)['soul_name'] == 'po'
+    assert _stored(tmp_path) == {soul_id: 'przed'}
+
+    realm.flush()
+    assert _stored(tmp_path) == {soul_id: 'po'}
+    assert realm.count_beings() == 1
+
+
+def test_restart_after_dirty_transcend(tmp_path, tiered_realm):
+    """disconnect zapisuje brudne byty - po restarcie licznik zgodny z SQLite"""
+    realm = tiered_realm(_tiered(tmp_path))
+    soul_ids = [realm.manifest({'soul_name': f'b{i}'})['soul_id'] for i in range(10)]
+    realm.flush()
+    realm.transcend(soul_ids[0])
+    realm.transcend(realm.manifest({'soul_name': 'ulotny'})['soul_id'])
+    realm.disconnect()
+
+    reopened = tiered_realm(_tiered(tmp_path))
+    assert reopened.count_beings() == 9 == len(_stored(tmp_path))
+    assert reopened.manifest({'soul_name': 'nowy'})['soul_id'] > max(soul_ids)
+
+
+
+def test_soul_id_of_unflushed_being_not_reused(tmp_path, tiered_realm):
+    """soul_id bytu usuniętego przed zapisem nie wraca po restarcie"""
+    realm = tiered_realm(_tiered(tmp_path))
+    kept = realm.manifest({'soul_name': 'trwały'})['soul_id']
+    realm.flush()
+    issued = [realm.manifest({'soul_name': f'ulotny{i}'})['soul_id'] for i in range(3)]
+    for soul_id in issued:
+        assert realm.transcend(soul_id)
+    realm.disconnect()
+    assert _stored(tmp_path) == {kept: 'trwały'}
+
+    reopened = tiered_realm(_tiered(tmp_path))
+    fresh = [reopened.manifest({'soul_name': f'nowy{i}'})['soul_id'] for i in range(5)]
+    assert min(fresh) > max(issued + [kept])
+
+
+def test_two_writers_on_one_file(tmp_path, tiered_realm):
+    """Dwa wymiary na tym samym pliku (jak dwa procesy) nadają rozłączne soul_id"""
+    first = tiered_realm(_tiered(tmp_path), name='first')
+    second = tiered_realm(_tiered(tmp_path), name='second')
+    first.ID_BLOCK = second.ID_BLOCK = 7
+
+    ids = {'first': [], 'second': []}
+    for i in range(30):
+        ids['first'].append(first.manifest({'soul_name': f'first{i}'})['soul_id'])
+        ids['second'].append(second.manifest({'soul_name': f'second{i}'})['soul_id'])
+    first.flush()
+    second.flush()
+
+    assert not set(ids['first']) & set(ids['second'])
+    stored = _stored(tmp_path)
+    assert len(stored) == 60
+    assert all(stored[soul_id] == f'first{i}' for i, soul_id in enumerate(ids['first']))
+    assert all(stored[soul_id] == f'second{i}' for i, soul_id in enumerate(ids['second']))
+
+
+def test_sequence_seeded_from_existing_file(tmp_path, tiered_realm):
+    """Plik sprzed tiered_sequence - nowe soul_id za największym istniejącym"""
+    realm = tiered_realm(_tiered(tmp_path))
+    existing = [realm.manifest({'soul_name': f'b{i}'})['soul_id'] for i in range(5)]
+    realm.disconnect()
+    with sqlite3.connect(str(tmp_path / 'beings.db')) as connection:
+        connection.execute("DROP TABLE tiered_sequence")
+        connection.execute("UPDATE sqlite_sequence SET seq = 5000 WHERE name = 'astral_beings'")
+
+    reopened = tiered_realm(_tiered(tmp_path))
+    assert reopened.manifest({'soul_name': 'nowy'})['soul_id'] > 5000
+    assert reopened.count_beings() == len(existing) + 1